@@ -0,0 +1,95 @@
+import json
+import random
+from pathlib import Path
+
+import pytest
+from twyn.trusted_packages.managers.base import TrustedPackagesProtocol
+from twyn.trusted_packages.managers.trusted_dockerhub_packages_manager import TrustedDockerHubPackageManager
+from twyn.trusted_packages.managers.trusted_npm_packages_manager import TrustedNpmPackageManager
+from twyn.trusted_packages.managers.trusted_pypi_packages_manager import TrustedPackages
+from twyn.trusted_packages.references.base import AbstractPackageReference, NormalizedPackages
+from twyn.trusted_packages.references.top_dockerhub_reference import TopDockerHubReference
+from twyn.trusted_packages.references.top_npm_reference import TopNpmReference
+from twyn.trusted_packages.references.top_pypi_reference import TopPyPiReference
+
+DEPENDENCIES_DIR = Path(__file__).parent.parent / "dependencies"
+
+ECOSYSTEMS = ("pypi", "npm", "dockerhub")
+
+ECOSYSTEM_REFERENCES: dict[str, type[AbstractPackageReference]] = {
+    "pypi": TopPyPiReference,
+    "npm": TopNpmReference,
+    "dockerhub": TopDockerHubReference,
+}
+
+ECOSYSTEM_MANAGERS: dict[str, type[TrustedPackagesProtocol]] = {
+    "pypi": TrustedPackages,
+    "npm": TrustedNpmPackageManager,
+    "dockerhub": TrustedDockerHubPackageManager,
+}
+
+QUERIES_PER_BATCH = 25
+"""Number of typosquatted names checked on every round of the matching benchmarks."""
+
+RANDOM_SEED = 1234
+"""Fixed seed, so that every run (and every commit) measures the very same inputs."""
+
+
+def load_reference_names(ecosystem: str) -> list[str]:
+    """Return the package names stored in `dependencies/<ecosystem>.json`."""
+    data = json.loads((DEPENDENCIES_DIR / f"{ecosystem}.json").read_text())
+    return [package if isinstance(package, str) else package["name"] for package in data["packages"]]
+
+
+def make_typos(names: list[str], count: int, seed: int = RANDOM_SEED) -> list[str]:
+    """Return `count` names derived from `names` with a single edit each (swap, deletion or duplication).
+
+    Only the first path component is mutated, which is the one compared for DockerHub namespaces.
+    Its first character is never touched, so every selector can handle the result.
+    """
+    rng = random.Random(seed)
+    typos = []
+    for name in rng.sample(names, count):
+        first, separator, rest = name.partition("/")
+        if len(first) < 3:  # noqa: PLR2004
+            typos.append(name)
+            continue
+        position = rng.randrange(1, len(first) - 1)
+        edit = rng.choice(("swap", "delete", "duplicate"))
+        if edit == "swap":
+            first = first[:position] + first[position + 1] + first[position] + first[position + 2 :]
+        elif edit == "delete":
+            first = first[:position] + first[position + 1 :]
+        else:
+            first = first[:position] + first[position] + first[position:]
+        typos.append(f"{first}{separator}{rest}")
+    return typos
+
+
+def make_unique_names(names: list[str], size: int) -> list[str]:
+    """Return `size` distinct names, cycling over `names` and suffixing them once they run out."""
+    unique_names = []
+    for index in range(size):
+        cycle, position = divmod(index, len(names))
+        unique_names.append(names[position] if cycle == 0 else f"{names[position]}-{cycle}")
+    return unique_names
+
+
+@pytest.fixture(scope="session", params=ECOSYSTEMS)
+def ecosystem(request: pytest.FixtureRequest) -> str:
+    return str(request.param)
+
+
+@pytest.fixture(scope="session")
+def reference_names(ecosystem: str) -> list[str]:
+    return load_reference_names(ecosystem)
+
+
+@pytest.fixture(scope="session")
+def normalized_reference(ecosystem: str, reference_names: list[str]) -> NormalizedPackages:
+    return ECOSYSTEM_REFERENCES[ecosystem].normalize_packages(set(reference_names))
+
+
+@pytest.fixture(scope="session")
+def typosquat_queries(reference_names: list[str]) -> list[str]:
+    return make_typos(reference_names, QUERIES_PER_BATCH)
@@ -0,0 +1,93 @@
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+from twyn.base.constants import SELECTOR_METHOD_MAPPING
+from twyn.similarity.algorithm import EditDistance, SimilarityThreshold
+from twyn.trusted_packages.combosquats import CombosquatDetector
+from twyn.trusted_packages.constants import ADJACENCY_MATRIX
+from twyn.trusted_packages.deletion_index import DeletionIndex
+from twyn.trusted_packages.qgram_index import QGramIndex
+from twyn.trusted_packages.references.base import NormalizedPackages
+
+from benchmarks.conftest import ECOSYSTEM_MANAGERS, ECOSYSTEM_REFERENCES
+
+
+@pytest.mark.parametrize("selector_method", sorted(SELECTOR_METHOD_MAPPING))
+def test_get_typosquat(
+    benchmark: BenchmarkFixture,
+    ecosystem: str,
+    normalized_reference: NormalizedPackages,
+    typosquat_queries: list[str],
+    selector_method: str,
+) -> None:
+    # The only selector that cannot handle every name: it only knows the first letters in the keyboard layout.
+    if selector_method == "nearby-letter" and (
+        unsupported_letters := sorted({query[0] for query in typosquat_queries} - ADJACENCY_MATRIX.keys())
+    ):
+        pytest.skip(f"`nearby-letter` does not support names starting with {unsupported_letters}")
+
+    manager = ECOSYSTEM_MANAGERS[ecosystem](
+        names=normalized_reference,
+        algorithm=EditDistance(),
+        selector=SELECTOR_METHOD_MAPPING[selector_method](),
+        threshold_class=SimilarityThreshold,
+    )
+    # Warm up: selectors may build their lookup structures lazily on the first call,
+    # which is measured separately by the index benchmarks.
+    manager.get_typosquat(typosquat_queries[0])
+
+    def check_queries() -> None:
+        for query in typosquat_queries:
+            manager.get_typosquat(query)
+
+    benchmark.pedantic(check_queries, rounds=3, iterations=1)
+
+
+@pytest.mark.parametrize("source", ["raw", "normalized"])
+def test_create_names_dictionary(
+    benchmark: BenchmarkFixture,
+    ecosystem: str,
+    reference_names: list[str],
+    normalized_reference: NormalizedPackages,
+    source: str,
+) -> None:
+    manager = ECOSYSTEM_MANAGERS[ecosystem](
+        names=normalized_reference,
+        algorithm=EditDistance(),
+        selector=SELECTOR_METHOD_MAPPING["all"](),
+        threshold_class=SimilarityThreshold,
+    )
+    names = normalized_reference if source == "normalized" else reference_names
+
+    benchmark(manager._create_names_dictionary, names)
+
+
+def test_normalize_packages(benchmark: BenchmarkFixture, ecosystem: str, reference_names: list[str]) -> None:
+    packages = set(reference_names)
+
+    benchmark(ECOSYSTEM_REFERENCES[ecosystem].normalize_packages, packages)
+
+
+def test_build_deletion_index(benchmark: BenchmarkFixture, reference_names: list[str]) -> None:
+    # Measures a cold build, as done the first time a reference is seen without a cache.
+    benchmark.pedantic(DeletionIndex.from_names, args=(reference_names,), rounds=1, iterations=1)
+
+
+def test_build_qgram_index(benchmark: BenchmarkFixture, reference_names: list[str]) -> None:
+    benchmark.pedantic(QGramIndex.from_names, args=(reference_names,), rounds=1, iterations=1)
+
+
+def test_build_combosquat_detector(benchmark: BenchmarkFixture, reference_names: list[str]) -> None:
+    benchmark.pedantic(CombosquatDetector.from_names, args=(reference_names,), rounds=1, iterations=1)
+
+
+def test_find_combosquats(
+    benchmark: BenchmarkFixture, reference_names: list[str], typosquat_queries: list[str]
+) -> None:
+    detector = CombosquatDetector.from_names(reference_names)
+    queries = [f"{query}-toolkit" for query in typosquat_queries]
+
+    def find_combosquats() -> None:
+        for query in queries:
+            detector.find(query)
+
+    benchmark(find_combosquats)
@@ -0,0 +1,147 @@
+import json
+from collections.abc import Callable
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+import yaml
+from pytest_benchmark.fixture import BenchmarkFixture
+from twyn.base import json_codec
+from twyn.dependency_parser.parsers.abstract_parser import AbstractParser
+from twyn.dependency_parser.parsers.docker_compose_parser import DockerComposeParser
+from twyn.dependency_parser.parsers.dockerfile_parser import DockerfileParser
+from twyn.dependency_parser.parsers.lock_parser import PoetryLockParser, UvLockParser
+from twyn.dependency_parser.parsers.package_lock_json import PackageLockJsonParser
+from twyn.dependency_parser.parsers.pnpm_lock_parser import PnpmLockParser
+from twyn.dependency_parser.parsers.requirements_txt_parser import RequirementsTxtParser
+from twyn.dependency_parser.parsers.yarn_lock_parser import YarnLockParser
+
+from benchmarks.conftest import load_reference_names, make_unique_names
+
+LOCKFILE_SIZES = {"1k": 1_000, "10k": 10_000, "100k": 100_000}
+
+ROUNDS = {"1k": 3, "10k": 3, "100k": 1}
+"""The slowest parsers need close to a minute for the largest files, so these are only parsed once."""
+
+LARGE_PACKAGE_LOCK_JSON_NAMES = 1_700_000
+"""Number of dependencies of the large `package-lock.json` files, which take about 100 MB."""
+
+
+def render_requirements_txt(names: list[str]) -> str:
+    return "".join(f"{name}==1.0.0\n" for name in names)
+
+
+def render_poetry_lock(names: list[str]) -> str:
+    return "".join(
+        f'[[package]]\nname = "{name}"\nversion = "1.0.0"\ndescription = ""\noptional = false\n'
+        'python-versions = ">=3.10"\n\n'
+        for name in names
+    )
+
+
+def render_uv_lock(names: list[str]) -> str:
+    return 'version = 1\nrequires-python = ">=3.10"\n\n' + "".join(
+        f'[[package]]\nname = "{name}"\nversion = "1.0.0"\nsource = {{ registry = "https://pypi.org/simple" }}\n\n'
+        for name in names
+    )
+
+
+def render_package_lock_json_v1(names: list[str]) -> str:
+    return json.dumps(
+        {
+            "name": "benchmark",
+            "lockfileVersion": 1,
+            "dependencies": {name: {"version": "1.0.0", "requires": {}} for name in names},
+        }
+    )
+
+
+def render_package_lock_json_v3(names: list[str]) -> str:
+    packages: dict[str, dict[str, str]] = {"": {"name": "benchmark", "version": "1.0.0"}}
+    packages.update({f"node_modules/{name}": {"version": "1.0.0"} for name in names})
+    return json.dumps({"name": "benchmark", "lockfileVersion": 3, "packages": packages})
+
+
+def render_pnpm_lock_yaml(names: list[str]) -> str:
+    return yaml.safe_dump(
+        {
+            "lockfileVersion": "9.0",
+            "importers": {".": {"dependencies": {name: {"specifier": "^1.0.0", "version": "1.0.0"} for name in names}}},
+            "packages": {f"{name}@1.0.0": {"resolution": {"integrity": "sha512-0"}} for name in names},
+        }
+    )
+
+
+def render_yarn_lock_v1(names: list[str]) -> str:
+    return "# yarn lockfile v1\n\n" + "".join(
+        f'"{name}@^1.0.0":\n  version "1.0.0"\n  integrity sha512-0\n\n' for name in names
+    )
+
+
+def render_yarn_lock_v2(names: list[str]) -> str:
+    # Same layout as the one in the parser tests: the metadata header is consumed before loading the YAML body.
+    return "__metadata:\nversion: 6\ncacheKey: 8\n\n" + "".join(
+        f'"{name}@npm:^1.0.0":\n  version: 1.0.0\n  resolution: "{name}@npm:1.0.0"\n\n' for name in names
+    )
+
+
+def render_dockerfile(names: list[str]) -> str:
+    return "".join(f"FROM {name}:1.0 AS stage{index}\n" for index, name in enumerate(names))
+
+
+def render_docker_compose_yml(names: list[str]) -> str:
+    return yaml.safe_dump(
+        {"services": {f"service{index}": {"image": f"{name}:1.0"} for index, name in enumerate(names)}}
+    )
+
+
+PARSERS: dict[str, tuple[type[AbstractParser], str, str, Callable[[list[str]], str]]] = {
+    "requirements.txt": (RequirementsTxtParser, "pypi", "requirements.txt", render_requirements_txt),
+    "poetry.lock": (PoetryLockParser, "pypi", "poetry.lock", render_poetry_lock),
+    "uv.lock": (UvLockParser, "pypi", "uv.lock", render_uv_lock),
+    "package-lock.json-v1": (PackageLockJsonParser, "npm", "package-lock.json", render_package_lock_json_v1),
+    "package-lock.json-v3": (PackageLockJsonParser, "npm", "package-lock.json", render_package_lock_json_v3),
+    "pnpm-lock.yaml": (PnpmLockParser, "npm", "pnpm-lock.yaml", render_pnpm_lock_yaml),
+    "yarn.lock-v1": (YarnLockParser, "npm", "yarn.lock", render_yarn_lock_v1),
+    "yarn.lock-v2": (YarnLockParser, "npm", "yarn.lock", render_yarn_lock_v2),
+    "Dockerfile": (DockerfileParser, "dockerhub", "Dockerfile", render_dockerfile),
+    "docker-compose.yml": (DockerComposeParser, "dockerhub", "docker-compose.yml", render_docker_compose_yml),
+}
+
+
+@pytest.mark.parametrize("size", LOCKFILE_SIZES)
+@pytest.mark.parametrize("lockfile", PARSERS)
+def test_parse(benchmark: BenchmarkFixture, tmp_path_factory: pytest.TempPathFactory, lockfile: str, size: str) -> None:
+    parser_class, ecosystem, file_name, render = PARSERS[lockfile]
+    names = make_unique_names(load_reference_names(ecosystem), LOCKFILE_SIZES[size])
+    file_path = tmp_path_factory.mktemp(f"{lockfile}-{size}") / file_name
+    file_path.write_text(render(names))
+    parser = parser_class(str(file_path))
+
+    parsed = benchmark.pedantic(parser.parse, rounds=ROUNDS[size], iterations=1)
+
+    assert parsed
+
+
+@pytest.fixture(scope="module", params=["package-lock.json-v1", "package-lock.json-v3"])
+def large_package_lock_json(request: pytest.FixtureRequest, tmp_path_factory: pytest.TempPathFactory) -> Path:
+    _, ecosystem, file_name, render = PARSERS[request.param]
+    names = make_unique_names(load_reference_names(ecosystem), LARGE_PACKAGE_LOCK_JSON_NAMES)
+    file_path = tmp_path_factory.mktemp(f"{request.param}-large") / file_name
+    file_path.write_text(render(names))
+    return file_path
+
+
+@pytest.mark.parametrize("orjson_installed", [True, False], ids=["orjson", "stdlib"])
+def test_parse_large_package_lock_json(
+    benchmark: BenchmarkFixture, large_package_lock_json: Path, orjson_installed: bool
+) -> None:
+    """Compare both JSON backends on a `package-lock.json` file of a large monorepo."""
+    if orjson_installed and not json_codec.ORJSON_INSTALLED:
+        pytest.skip("orjson is not installed")
+    parser = PackageLockJsonParser(str(large_package_lock_json))
+
+    with patch("twyn.base.json_codec.ORJSON_INSTALLED", orjson_installed):
+        parsed = benchmark.pedantic(parser.parse, rounds=1, iterations=1)
+
+    assert parsed
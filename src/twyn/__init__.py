@@ -1,3 +1,4 @@
-from twyn.main import check_dependencies
+from twyn.engine import TwynEngine
+from twyn.main import check_dependencies, check_dependencies_async
 
-__all__ = ["check_dependencies"]
+__all__ = ["TwynEngine", "check_dependencies", "check_dependencies_async"]
@@ -3,6 +3,9 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, Literal, TypeAlias
 
 from twyn import dependency_parser
+from twyn.similarity.algorithm import AbstractSimilarityAlgorithm, EditDistance
+from twyn.similarity.confusables import ConfusableEditDistance
+from twyn.similarity.keyboard_distance import KeyboardEditDistance
 from twyn.trusted_packages import selectors
 
 if TYPE_CHECKING:
@@ -16,15 +19,31 @@ SELECTOR_METHOD_MAPPING: dict[str, type[selectors.AbstractSelector]] = {
     "first-letter": selectors.FirstLetterExact,
     "nearby-letter": selectors.FirstLetterNearbyInKeyboard,
     "all": selectors.AllSimilar,
+    "deletion-index": selectors.DeletionNeighbourhood,
+    "trie": selectors.TrieNeighbourhood,
+    "q-gram": selectors.QGramNeighbourhood,
 }
 """Mapping of selector method names to their corresponding classes."""
 
 SELECTOR_METHOD_KEYS = set(SELECTOR_METHOD_MAPPING.keys())
 """Set of available selector method names."""
 
-SelectorMethod = Literal["first-letter", "nearby-letter", "all"]
+SelectorMethod = Literal["first-letter", "nearby-letter", "all", "deletion-index", "trie", "q-gram"]
 """Type alias for valid selector method strings."""
 
+SIMILARITY_ALGORITHM_MAPPING: dict[str, type[AbstractSimilarityAlgorithm]] = {
+    "edit-distance": EditDistance,
+    "keyboard-distance": KeyboardEditDistance,
+    "confusable-distance": ConfusableEditDistance,
+}
+"""Mapping of similarity algorithm names to their corresponding classes."""
+
+SIMILARITY_ALGORITHM_KEYS = set(SIMILARITY_ALGORITHM_MAPPING.keys())
+"""Set of available similarity algorithm names."""
+
+SimilarityAlgorithmName = Literal["edit-distance", "keyboard-distance", "confusable-distance"]
+"""Type alias for valid similarity algorithm strings."""
+
 DEPENDENCY_FILE_MAPPING: dict[str, type[AbstractParser]] = {
     "requirements.txt": dependency_parser.RequirementsTxtParser,
     "poetry.lock": dependency_parser.PoetryLockParser,
@@ -44,6 +63,9 @@ DEPENDENCY_FILE_MAPPING: dict[str, type[AbstractParser]] = {
 DEFAULT_SELECTOR_METHOD = "all"
 """Default method for selecting similar packages."""
 
+DEFAULT_SIMILARITY_ALGORITHM = "edit-distance"
+"""Default algorithm for computing the distance between package names."""
+
 DEFAULT_PROJECT_TOML_FILE = "pyproject.toml"
 """Default filename for project configuration."""
 
@@ -56,6 +78,15 @@ DEFAULT_USE_CACHE = True
 DEFAULT_RECURSIVE = False
 """Default setting for recursive processing."""
 
+DEFAULT_JOBS = 1
+"""Default number of processes used to analyze dependencies."""
+
+DEFAULT_DETECT_COMBOSQUATS = False
+"""Default setting for reporting dependencies that embed the name of a trusted package."""
+
+DEFAULT_DETECT_TOKEN_VARIANTS = False
+"""Default setting for reporting dependencies made of the same tokens as a trusted package."""
+
 
-PackageEcosystems: TypeAlias = Literal["pypi", "npm"]
+PackageEcosystems: TypeAlias = Literal["pypi", "npm", "dockerhub"]
 """Type alias for supported package ecosystems."""
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING, Any, TypeVar
+
+try:
+    import orjson
+except ModuleNotFoundError:  # pragma: no cover
+    ORJSON_INSTALLED = False
+else:
+    ORJSON_INSTALLED = True
+
+if TYPE_CHECKING:
+    from pydantic import BaseModel
+
+ModelT = TypeVar("ModelT", bound="BaseModel")
+
+JSONDecodeError = json.JSONDecodeError
+"""Raised when decoding invalid JSON. The one raised by orjson is a subclass of it."""
+
+
+def loads(data: str | bytes | bytearray | memoryview) -> Any:
+    """Decode a JSON document, given as text or UTF-8 encoded bytes.
+
+    It is decoded with orjson when it is installed (`pip install twyn[fast]`), and with the standard library
+    otherwise. Bytes are decoded as they are, without turning them into text first.
+    """
+    if ORJSON_INSTALLED:
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+
+def loads_model(model_class: type[ModelT], data: str | bytes | bytearray) -> ModelT:
+    """Decode a JSON document into a pydantic model, validating it.
+
+    Pydantic parses and validates the document at once in Rust, which is faster than validating what orjson decoded.
+    Invalid documents raise a `pydantic.ValidationError`.
+    """
+    return model_class.model_validate_json(data)
+
+
+def dumps_model(model: BaseModel, *, indent: int | None = None, exclude_none: bool = False) -> str:
+    """Encode a pydantic model as a JSON document.
+
+    Pydantic serializes models in Rust, which is faster than dumping them to Python objects for orjson to encode.
+    """
+    return model.model_dump_json(indent=indent, exclude_none=exclude_none)
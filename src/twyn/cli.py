@@ -1,19 +1,24 @@
+import cProfile
 import logging
 import sys
+from collections.abc import Iterator
+from contextlib import contextmanager
 from typing import NoReturn
 
 from twyn.__version__ import __version__
+from twyn.base import json_codec
 from twyn.base.constants import (
     DEFAULT_PROJECT_TOML_FILE,
     DEPENDENCY_FILE_MAPPING,
     SELECTOR_METHOD_MAPPING,
+    SIMILARITY_ALGORITHM_MAPPING,
 )
 from twyn.base.exceptions import TwynError
 from twyn.config.config_handler import ConfigHandler
 from twyn.file_handler.file_handler import FileHandler
+from twyn.instrumentation.models import ProfilingReport
 from twyn.main import check_dependencies
 from twyn.trusted_packages.cache_handler import CacheHandler
-from twyn.trusted_packages.constants import CACHE_DIR
 
 try:
     import click
@@ -69,7 +74,20 @@ def entry_point() -> None:
         "`first-letter` only compares dependencies that share the first letter, "
         "while `nearby-letter` compares against dependencies whose first letter "
         "is nearby in an English keyboard. `all` compares the given dependencies "
-        "against all of those in the reference."
+        "against all of those in the reference. `deletion-index` finds the same typosquats as `all` "
+        "with a precomputed index, only comparing against names that are at most two edits away. "
+        "`trie` also finds the same typosquats as `all`, walking a trie of the trusted names. "
+        "`q-gram` finds them too, only comparing against names that share enough substrings."
+    ),
+)
+@click.option(
+    "--similarity-algorithm",
+    type=click.Choice(list(SIMILARITY_ALGORITHM_MAPPING.keys())),
+    help=(
+        "How twyn should measure the distance between names. `edit-distance` counts every typo the same, "
+        "while `keyboard-distance` considers that hitting a key next to the intended one in an English keyboard "
+        "is a smaller typo. `keyboard-distance` requires `pip install twyn[keyboard]`. `confusable-distance` also "
+        "reports names that look alike (e.g. `rn` for `m`, or `1` for `l`), however many edits apart they are."
     ),
 )
 @click.option(
@@ -134,6 +152,50 @@ def entry_point() -> None:
     type=str,
     help="Alternative DockerHub source URL to use for fetching trusted packages.",
 )
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    help="Number of processes used to analyze the dependencies. Defaults to 1.",
+)
+@click.option(
+    "--detect-combosquats",
+    is_flag=True,
+    default=None,
+    help=(
+        "Also report dependencies that embed the name of a trusted package as a whole token, "
+        "such as `requests-toolkit`, however many edits apart they are."
+    ),
+)
+@click.option(
+    "--detect-token-variants",
+    is_flag=True,
+    default=None,
+    help=(
+        "Also report dependencies made of the same tokens as a trusted package, reordered or with other "
+        "separators, such as `dateutil-python` or `pythondateutil`."
+    ),
+)
+@click.option(
+    "--cache-dir",
+    type=str,
+    help="Directory where trusted packages are cached. Defaults to `$XDG_CACHE_HOME/twyn` (or `~/.cache/twyn`).",
+)
+@click.option(
+    "--profile",
+    is_flag=True,
+    default=False,
+    help=(
+        "Show the time spent on each stage of the check (discovery, parsing, fetching the trusted packages, "
+        "normalization, index build and matching), together with some counters. "
+        "With --json, they are included in the output instead."
+    ),
+)
+@click.option(
+    "--profile-output",
+    type=click.Path(dir_okay=False, writable=True),
+    help="Write the cProfile statistics of the check to the given file, to be inspected with `pstats`.",
+)
 def run(  # noqa: C901, PLR0912
     config: str,
     dependency_file: tuple[str],
@@ -150,6 +212,13 @@ def run(  # noqa: C901, PLR0912
     pypi_source: str | None,
     npm_source: str | None,
     dockerhub_source: str | None,
+    cache_dir: str | None,
+    similarity_algorithm: str | None,
+    jobs: int | None,
+    detect_combosquats: bool | None,
+    detect_token_variants: bool | None,
+    profile: bool,
+    profile_output: str | None,
 ) -> NoReturn:
     if vv:
         logger.setLevel(logging.DEBUG)
@@ -169,27 +238,34 @@ def run(  # noqa: C901, PLR0912
             raise click.UsageError(f"Dependency file name {dep_file} not supported.", ctx=click.get_current_context())
 
     try:
-        possible_typos = check_dependencies(
-            selector_method=selector_method,
-            dependencies=set(dependency) or None,
-            config_file=config,
-            dependency_files=set(dependency_file) or None,
-            use_cache=not no_cache if no_cache is not None else no_cache,
-            show_progress_bar=False if (json or table) else not no_track,
-            load_config_from_file=True,
-            package_ecosystem=package_ecosystem,
-            recursive=recursive,
-            pypi_source=pypi_source,
-            npm_source=npm_source,
-            dockerhub_source=dockerhub_source,
-        )
+        with _cprofile_if_requested(profile_output):
+            possible_typos = check_dependencies(
+                selector_method=selector_method,
+                dependencies=set(dependency) or None,
+                config_file=config,
+                dependency_files=set(dependency_file) or None,
+                use_cache=not no_cache if no_cache is not None else no_cache,
+                show_progress_bar=False if (json or table) else not no_track,
+                load_config_from_file=True,
+                package_ecosystem=package_ecosystem,
+                recursive=recursive,
+                pypi_source=pypi_source,
+                npm_source=npm_source,
+                dockerhub_source=dockerhub_source,
+                cache_dir=cache_dir,
+                similarity_algorithm=similarity_algorithm,
+                jobs=jobs,
+                detect_combosquats=detect_combosquats,
+                detect_token_variants=detect_token_variants,
+                profile=profile,
+            )
     except TwynError as e:
         raise CliError(str(e)) from e
     except Exception as e:
         raise CliError("Unhandled exception occured.") from e
     else:
         if json:
-            click.echo(possible_typos.model_dump_json(indent=2))
+            click.echo(json_codec.dumps_model(possible_typos, indent=2, exclude_none=True))
         elif not possible_typos:
             click.echo("✅ No typosquats detected")
         elif table:
@@ -198,24 +274,78 @@ def run(  # noqa: C901, PLR0912
             table_obj.add_column("Source")
             table_obj.add_column("Dependency")
             table_obj.add_column("Similar trusted packages")
+            table_obj.add_column("Embedded trusted packages")
 
             for possible_typosquats in possible_typos.results:
                 for error in possible_typosquats.errors:
-                    table_obj.add_row(str(possible_typosquats.source), error.dependency, ", ".join(error.similars))
+                    table_obj.add_row(
+                        str(possible_typosquats.source),
+                        error.dependency,
+                        ", ".join(error.similars),
+                        ", ".join(error.combosquats),
+                    )
 
             console.print(table_obj)
         elif possible_typos:
             for possible_typosquats in possible_typos.results:
                 for error in possible_typosquats.errors:
-                    click.echo(
-                        click.style("Possible typosquat detected: ", fg="red") + f"`{error.dependency}`, "
-                        f"did you mean any of [{', '.join(error.similars)}]?",
-                        color=True,
-                    )
+                    if error.similars:
+                        click.echo(
+                            click.style("Possible typosquat detected: ", fg="red") + f"`{error.dependency}`, "
+                            f"did you mean any of [{', '.join(error.similars)}]?",
+                            color=True,
+                        )
+                    if error.combosquats:
+                        click.echo(
+                            click.style("Possible combosquat detected: ", fg="red") + f"`{error.dependency}`, "
+                            f"it contains the name of [{', '.join(error.combosquats)}].",
+                            color=True,
+                        )
+
+        if possible_typos.profile and not json:
+            _print_profiling_report(possible_typos.profile)
 
         sys.exit(int(bool(possible_typos)))
 
 
+@contextmanager
+def _cprofile_if_requested(output_file: str | None) -> Iterator[None]:
+    """Run the wrapped block under cProfile and dump its statistics to `output_file`, if given."""
+    if not output_file:
+        yield
+        return
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(output_file)
+        logger.info("cProfile statistics written to %s", output_file)
+
+
+def _print_profiling_report(report: ProfilingReport) -> None:
+    """Print the time spent on each stage and the collected counters to stderr."""
+    stages_table = Table(title=f"Stages ({report.total_seconds:.3f}s in total)")
+    stages_table.add_column("Stage")
+    stages_table.add_column("Time (s)", justify="right")
+    stages_table.add_column("%", justify="right")
+    for stage_name, seconds in sorted(report.stages.items(), key=lambda item: item[1], reverse=True):
+        share = 100 * seconds / report.total_seconds if report.total_seconds else 0.0
+        stages_table.add_row(stage_name, f"{seconds:.3f}", f"{share:.1f}")
+
+    counters_table = Table(title="Counters")
+    counters_table.add_column("Counter")
+    counters_table.add_column("Value", justify="right")
+    for counter, value in sorted(report.counters.items()):
+        counters_table.add_row(counter, str(value))
+
+    console = Console(stderr=True)
+    console.print(stages_table)
+    console.print(counters_table)
+
+
 @entry_point.group()
 def allowlist() -> None:
     """Manage package allowlist configuration."""
@@ -247,13 +377,51 @@ def cache() -> None:
 
 
 @cache.command()
-def clear() -> None:
+@click.option("--config", type=click.STRING)
+@click.option("--cache-dir", type=str, help="Cache directory to clear. Defaults to the configured one.")
+def clear(config: str | None, cache_dir: str | None) -> None:
     """Clear cached trusted packages data."""
-    cache_handler = CacheHandler(CACHE_DIR)
+    cache_handler = _get_cache_handler(config, cache_dir)
 
     cache_handler.clear_all()
     click.echo(click.style("All cache cleared", fg="green"))
 
 
+@cache.command()
+@click.option("--config", type=click.STRING)
+@click.option("--cache-dir", type=str, help="Cache directory to inspect. Defaults to the configured one.")
+def stats(config: str | None, cache_dir: str | None) -> None:
+    """Show the cached entries, together with their age and size."""
+    cache_stats = _get_cache_handler(config, cache_dir).get_stats()
+
+    table_obj = Table(title=f"Cache directory: {cache_stats.cache_dir}")
+    table_obj.add_column("Source")
+    table_obj.add_column("Saved date")
+    table_obj.add_column("Age (days)", justify="right")
+    table_obj.add_column("Size (bytes)", justify="right")
+    table_obj.add_column("Status")
+    for entry in cache_stats.entries:
+        table_obj.add_row(
+            entry.source or entry.file_path,
+            entry.saved_date or "-",
+            str(entry.age_days) if entry.age_days is not None else "-",
+            str(entry.size),
+            "outdated" if entry.is_outdated else "valid",
+        )
+
+    Console().print(table_obj)
+    click.echo(f"{len(cache_stats.entries)} entries, {cache_stats.total_size} bytes in total.")
+
+
+def _get_cache_handler(config: str | None, cache_dir: str | None) -> CacheHandler:
+    """Return a cache handler for the cache directory set in the CLI, the config file or the default one."""
+    try:
+        fh = FileHandler(config or ConfigHandler.get_default_config_file_path())
+        resolved_config = ConfigHandler(fh).resolve_config(cache_dir=cache_dir)
+    except TwynError as e:
+        raise CliError(str(e)) from e
+    return CacheHandler(resolved_config.cache_dir)
+
+
 if __name__ == "__main__":
     entry_point()
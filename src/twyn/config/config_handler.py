@@ -7,19 +7,26 @@ from typing import Any
 from tomlkit import TOMLDocument, dumps, load, table
 
 from twyn.base.constants import (
+    DEFAULT_DETECT_COMBOSQUATS,
+    DEFAULT_DETECT_TOKEN_VARIANTS,
+    DEFAULT_JOBS,
     DEFAULT_PROJECT_TOML_FILE,
     DEFAULT_RECURSIVE,
     DEFAULT_SELECTOR_METHOD,
+    DEFAULT_SIMILARITY_ALGORITHM,
     DEFAULT_TWYN_TOML_FILE,
     DEFAULT_USE_CACHE,
     SELECTOR_METHOD_KEYS,
+    SIMILARITY_ALGORITHM_KEYS,
     PackageEcosystems,
 )
 from twyn.config.exceptions import (
     AllowlistPackageAlreadyExistsError,
     AllowlistPackageDoesNotExistError,
     ConfigFileNotConfiguredError,
+    InvalidJobsError,
     InvalidSelectorMethodError,
+    InvalidSimilarityAlgorithmError,
     TOMLError,
 )
 from twyn.file_handler.exceptions import PathNotFoundError
@@ -50,6 +57,16 @@ class TwynConfiguration:
     """Target package ecosystem for analysis."""
     recursive: bool | None
     """Whether to recursively search for dependency files."""
+    cache_dir: str | None
+    """Directory where trusted packages are cached. If not set, the user cache directory is used."""
+    similarity_algorithm: str
+    """Algorithm used to compute the distance between package names."""
+    jobs: int
+    """Number of processes used to analyze dependencies."""
+    detect_combosquats: bool
+    """Whether to report dependencies that embed the name of a trusted package."""
+    detect_token_variants: bool
+    """Whether to report dependencies made of the same tokens as a trusted package."""
 
 
 @dataclass
@@ -74,6 +91,16 @@ class ReadTwynConfiguration:
     """Optional target package ecosystem for analysis."""
     recursive: bool | None = None
     """Optional setting for recursive dependency file search."""
+    cache_dir: str | None = None
+    """Optional directory where trusted packages are cached."""
+    similarity_algorithm: str | None = None
+    """Optional algorithm used to compute the distance between package names."""
+    jobs: int | None = None
+    """Optional number of processes used to analyze dependencies."""
+    detect_combosquats: bool | None = None
+    """Optional setting for reporting dependencies that embed the name of a trusted package."""
+    detect_token_variants: bool | None = None
+    """Optional setting for reporting dependencies made of the same tokens as a trusted package."""
 
 
 class ConfigHandler:
@@ -82,7 +109,7 @@ class ConfigHandler:
     def __init__(self, file_handler: FileHandler | None = None) -> None:
         self.file_handler = file_handler
 
-    def resolve_config(  # noqa: C901, PLR0912
+    def resolve_config(  # noqa: C901, PLR0912, PLR0915
         self,
         selector_method: str | None = None,
         dependency_files: set[str] | None = None,
@@ -92,6 +119,11 @@ class ConfigHandler:
         pypi_source: str | None = None,
         npm_source: str | None = None,
         dockerhub_source: str | None = None,
+        cache_dir: str | None = None,
+        similarity_algorithm: str | None = None,
+        jobs: int | None = None,
+        detect_combosquats: bool | None = None,
+        detect_token_variants: bool | None = None,
     ) -> TwynConfiguration:
         """Resolve the configuration for Twyn.
 
@@ -116,6 +148,17 @@ class ConfigHandler:
             raise InvalidSelectorMethodError(
                 f"Invalid selector_method '{final_selector_method}'. Must be one of: {valid_methods}"
             )
+
+        # Determine final similarity algorithm from CLI, config file, or default
+        final_similarity_algorithm = (
+            similarity_algorithm or read_config.similarity_algorithm or DEFAULT_SIMILARITY_ALGORITHM
+        )
+        if final_similarity_algorithm not in SIMILARITY_ALGORITHM_KEYS:
+            valid_algorithms = ", ".join(sorted(SIMILARITY_ALGORITHM_KEYS))
+            raise InvalidSimilarityAlgorithmError(
+                f"Invalid similarity_algorithm '{final_similarity_algorithm}'. Must be one of: {valid_algorithms}"
+            )
+
         if use_cache is not None:
             final_use_cache = use_cache
         elif read_config.use_cache is not None:
@@ -154,6 +197,41 @@ class ConfigHandler:
         else:
             final_dockerhub_source = None
 
+        # Determine final cache_dir from CLI, config file, or default
+        if cache_dir is not None:
+            final_cache_dir = cache_dir
+        elif read_config.cache_dir is not None:
+            final_cache_dir = read_config.cache_dir
+        else:
+            final_cache_dir = None
+
+        # Determine final jobs from CLI, config file, or default
+        if jobs is not None:
+            final_jobs = jobs
+        elif read_config.jobs is not None:
+            final_jobs = read_config.jobs
+        else:
+            final_jobs = DEFAULT_JOBS
+
+        if not isinstance(final_jobs, int) or isinstance(final_jobs, bool) or final_jobs < 1:
+            raise InvalidJobsError(f"Invalid jobs '{final_jobs}'. Must be a positive integer.")
+
+        # Determine final detect_combosquats from CLI, config file, or default
+        if detect_combosquats is not None:
+            final_detect_combosquats = detect_combosquats
+        elif read_config.detect_combosquats is not None:
+            final_detect_combosquats = read_config.detect_combosquats
+        else:
+            final_detect_combosquats = DEFAULT_DETECT_COMBOSQUATS
+
+        # Determine final detect_token_variants from CLI, config file, or default
+        if detect_token_variants is not None:
+            final_detect_token_variants = detect_token_variants
+        elif read_config.detect_token_variants is not None:
+            final_detect_token_variants = read_config.detect_token_variants
+        else:
+            final_detect_token_variants = DEFAULT_DETECT_TOKEN_VARIANTS
+
         return TwynConfiguration(
             dependency_files=dependency_files or read_config.dependency_files or set(),
             selector_method=final_selector_method,
@@ -164,6 +242,11 @@ class ConfigHandler:
             use_cache=final_use_cache,
             package_ecosystem=package_ecosystem or read_config.package_ecosystem,
             recursive=final_recursive,
+            cache_dir=final_cache_dir,
+            similarity_algorithm=final_similarity_algorithm,
+            jobs=final_jobs,
+            detect_combosquats=final_detect_combosquats,
+            detect_token_variants=final_detect_token_variants,
         )
 
     def add_package_to_allowlist(self, package_name: str) -> None:
@@ -214,6 +297,11 @@ class ConfigHandler:
             use_cache=twyn_config_data.get("use_cache"),
             package_ecosystem=twyn_config_data.get("package_ecosystem"),
             recursive=twyn_config_data.get("recursive"),
+            cache_dir=twyn_config_data.get("cache_dir"),
+            similarity_algorithm=twyn_config_data.get("similarity_algorithm"),
+            jobs=twyn_config_data.get("jobs"),
+            detect_combosquats=twyn_config_data.get("detect_combosquats"),
+            detect_token_variants=twyn_config_data.get("detect_token_variants"),
         )
 
     def _write_config(self, toml: TOMLDocument, config: ReadTwynConfiguration) -> None:
@@ -38,6 +38,18 @@ class InvalidSelectorMethodError(TwynError):
     message = "Invalid `Selector` was provided."
 
 
+class InvalidSimilarityAlgorithmError(TwynError):
+    """Exception for when an invalid similarity algorithm has been specified."""
+
+    message = "Invalid similarity algorithm was provided."
+
+
+class InvalidJobsError(TwynError):
+    """Exception for when an invalid number of jobs has been specified."""
+
+    message = "The number of jobs must be a positive integer."
+
+
 class ConfigFileNotConfiguredError(TwynError):
     """Exception for when a read/write operation has been attempted but no config file was configured."""
 
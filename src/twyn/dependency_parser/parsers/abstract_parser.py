@@ -2,11 +2,16 @@ import logging
 import os
 from abc import ABC, abstractmethod
 from pathlib import Path
+from typing import IO, TypeAlias
 
+from twyn.dependency_parser.parsers.exceptions import InvalidFileFormatError
 from twyn.file_handler.file_handler import FileHandler
 
 logger = logging.getLogger("twyn")
 
+DependencyContent: TypeAlias = str | bytes | bytearray | memoryview | IO[str] | IO[bytes]
+"""Content of a dependency file: text, UTF-8 encoded bytes or a file-like object opened in text or binary mode."""
+
 
 class AbstractParser(ABC):
     """
@@ -27,12 +32,34 @@ class AbstractParser(ABC):
         """Check if dependency file exists."""
         return self.file_handler.exists()
 
-    @abstractmethod
     def parse(self) -> set[str]:
+        """Read the dependency file and parse its contents into a set of dependency names."""
+        return self.parse_content(self.file_handler.read())
+
+    @abstractmethod
+    def parse_content(self, content: DependencyContent) -> set[str]:
         """
         Parse text into dependencies set.
 
-        Parse the file's contents into a set of dependency names (type: str).
+        Parse the contents of a dependency file, such as an upload that was never written to disk, into a set of
+        dependency names (type: str).
         All data other than the dependency names (e.g. whether a dependency is
         a dev dependency or main dependency; version constraints) is omitted.
         """
+
+    @staticmethod
+    def _read_text(content: DependencyContent) -> str:
+        """Return the given content as text, decoding it if needed.
+
+        Content that is not valid UTF-8 raises `InvalidFileFormatError`, like any other file that cannot be parsed.
+        """
+        if isinstance(content, str):
+            return content
+        try:
+            if isinstance(content, (bytes, bytearray, memoryview)):
+                # Decodes straight from the buffer, so slices of a larger upload are not copied first.
+                return str(content, "utf-8")
+            data = content.read()
+            return data if isinstance(data, str) else data.decode("utf-8")
+        except UnicodeDecodeError as e:
+            raise InvalidFileFormatError("File is not valid UTF-8 text.") from e
@@ -4,7 +4,7 @@ import re
 import yaml
 from typing_extensions import override
 
-from twyn.dependency_parser.parsers.abstract_parser import AbstractParser
+from twyn.dependency_parser.parsers.abstract_parser import AbstractParser, DependencyContent
 from twyn.dependency_parser.parsers.constants import DOCKER_COMPOSE_YML
 
 logger = logging.getLogger("twyn")
@@ -23,17 +23,16 @@ class DockerComposeParser(AbstractParser):
         super().__init__(file_path)
 
     @override
-    def parse(self) -> set[str]:
+    def parse_content(self, content: DependencyContent) -> set[str]:
         """Parse docker-compose.yml and return image names from services.
 
         Extracts images from service definitions and handles variable substitution.
         """
-        with self.file_handler.open("r") as fp:
-            try:
-                compose_data = yaml.safe_load(fp)
-            except yaml.YAMLError as e:
-                logger.warning("Failed to parse docker-compose file: %s", e)
-                return set()
+        try:
+            compose_data = yaml.safe_load(self._read_text(content))
+        except yaml.YAMLError as e:
+            logger.warning("Failed to parse docker-compose file: %s", e)
+            return set()
 
         if not compose_data:
             return set()
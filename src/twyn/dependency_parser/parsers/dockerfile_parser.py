@@ -3,7 +3,7 @@ import re
 
 from typing_extensions import override
 
-from twyn.dependency_parser.parsers.abstract_parser import AbstractParser
+from twyn.dependency_parser.parsers.abstract_parser import AbstractParser, DependencyContent
 from twyn.dependency_parser.parsers.constants import DOCKERFILE
 
 logger = logging.getLogger("twyn")
@@ -21,13 +21,12 @@ class DockerfileParser(AbstractParser):
         super().__init__(file_path)
 
     @override
-    def parse(self) -> set[str]:
+    def parse_content(self, content: DependencyContent) -> set[str]:
         """Parse Dockerfile and return base image names from FROM instructions.
 
         Handles variable substitution and excludes stage names from previous FROM instructions.
         """
-        with self.file_handler.open("r") as fp:
-            lines = fp.readlines()
+        lines = self._read_text(content).splitlines()
 
         # Handle line continuations (\)
         raw_instructions = self._handle_line_continuations(lines)
@@ -1,7 +1,7 @@
 import tomlkit
 import tomlkit.exceptions
 
-from twyn.dependency_parser.parsers.abstract_parser import AbstractParser
+from twyn.dependency_parser.parsers.abstract_parser import AbstractParser, DependencyContent
 from twyn.dependency_parser.parsers.constants import POETRY_LOCK, UV_LOCK
 from twyn.dependency_parser.parsers.exceptions import InvalidFileFormatError
 
@@ -9,10 +9,10 @@ from twyn.dependency_parser.parsers.exceptions import InvalidFileFormatError
 class TomlLockParser(AbstractParser):
     """Parser for TOML-based lock files."""
 
-    def parse(self) -> set[str]:
+    def parse_content(self, content: DependencyContent) -> set[str]:
         """Parse dependencies names and map them to a set."""
         try:
-            data = tomlkit.parse(self.file_handler.read())
+            data = tomlkit.parse(self._read_text(content))
         except tomlkit.exceptions.ParseError as e:
             raise InvalidFileFormatError("Invalid YAML format.") from e
 
@@ -1,7 +1,7 @@
-import json
 from typing import Any
 
-from twyn.dependency_parser.parsers.abstract_parser import AbstractParser
+from twyn.base import json_codec
+from twyn.dependency_parser.parsers.abstract_parser import AbstractParser, DependencyContent
 from twyn.dependency_parser.parsers.constants import PACKAGE_LOCK_JSON
 from twyn.dependency_parser.parsers.exceptions import InvalidFileFormatError
 
@@ -10,14 +10,16 @@ class PackageLockJsonParser(AbstractParser):
     def __init__(self, file_path: str = PACKAGE_LOCK_JSON) -> None:
         super().__init__(file_path)
 
-    def parse(self) -> set[str]:
+    def parse_content(self, content: DependencyContent) -> set[str]:
         """Recursively gets all the packages from a `package-lock.json` file.
 
         It supports v1, v2 and v3.
         """
+        # Encoded contents are decoded by the JSON parser itself, which is faster than decoding them to text first.
+        raw_content = content if isinstance(content, (str, bytes, bytearray, memoryview)) else content.read()
         try:
-            data = json.loads(self.file_handler.read())
-        except json.JSONDecodeError as e:
+            data = json_codec.loads(raw_content)
+        except (json_codec.JSONDecodeError, UnicodeDecodeError) as e:
             raise InvalidFileFormatError("Invalid JSON format.") from e
 
         result: set[str] = set()
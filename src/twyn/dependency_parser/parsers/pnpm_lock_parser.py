@@ -4,8 +4,9 @@ from typing import Any
 import yaml
 from typing_extensions import override
 
-from twyn.dependency_parser.parsers.abstract_parser import AbstractParser
+from twyn.dependency_parser.parsers.abstract_parser import AbstractParser, DependencyContent
 from twyn.dependency_parser.parsers.constants import PNPM_LOCK_YAML
+from twyn.dependency_parser.parsers.exceptions import InvalidFileFormatError
 
 
 class PnpmLockParser(AbstractParser):
@@ -19,13 +20,12 @@ class PnpmLockParser(AbstractParser):
         super().__init__(file_path)
 
     @override
-    def parse(self) -> set[str]:
+    def parse_content(self, content: DependencyContent) -> set[str]:
         """Parse pnpm-lock.yaml file and extract package names."""
-        content = self.file_handler.read()
         try:
-            data = yaml.safe_load(content)
+            data = yaml.safe_load(self._read_text(content))
         except yaml.YAMLError as e:
-            raise ValueError(f"Invalid YAML in pnpm-lock.yaml: {e}") from e
+            raise InvalidFileFormatError("Invalid YAML format.") from e
 
         if not isinstance(data, dict):
             return set()
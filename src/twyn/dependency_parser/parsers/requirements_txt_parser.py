@@ -1,12 +1,17 @@
 """Parser for requirements.txt dependencies."""
 
+import logging
 import re
 from pathlib import Path
 
 from typing_extensions import override
 
-from twyn.dependency_parser.parsers.abstract_parser import AbstractParser
+from twyn.dependency_parser.parsers.abstract_parser import AbstractParser, DependencyContent
 from twyn.dependency_parser.parsers.constants import REQUIREMENTS_TXT
+from twyn.file_handler.exceptions import EmptyFileError, PathIsNotFileError, PathNotFoundError
+from twyn.file_handler.file_handler import FileHandler
+
+logger = logging.getLogger("twyn")
 
 
 class RequirementsTxtParser(AbstractParser):
@@ -30,49 +35,73 @@ class RequirementsTxtParser(AbstractParser):
 
     @override
     def parse(self) -> set[str]:
+        """Read the requirements file and return a set of package names.
+
+        It will recursively resolve other files included with -r, relative to the directory of `file_path`.
+        """
+        return self._parse_internal(self.file_handler.read(), self.file_path, seen_files={self.file_path.resolve()})
+
+    @override
+    def parse_content(self, content: DependencyContent) -> set[str]:
         """Return a set of package names.
 
-        It will recursively resolve other files included with -r.
+        The content may not come from a file on this host, such as an upload, so files included with -r are skipped
+        with a warning instead of being read from the filesystem.
         """
-        return self._parse_internal(self.file_path, seen_files=set())
+        return self._parse_internal(self._read_text(content), self.file_path, seen_files=None)
+
+    def _parse_internal(self, text: str, source: Path, seen_files: set[Path] | None) -> set[str]:
+        """Parse requirements file and handle includes recursively.
 
-    def _parse_internal(self, source: str | Path, seen_files: set[Path]) -> set[str]:
-        """Parse requirements file and handle includes recursively."""
+        `seen_files` holds the files read so far, or is `None` when `text` was not read from a file.
+        """
         packages: set[str] = set()
-        base_dir = Path(source).parent if isinstance(source, Path) else Path(".")
-
-        with self.file_handler.open("r") as fp:
-            for raw_line in fp:
-                line = raw_line.strip()
-
-                if not self._is_valid_line(line):
-                    continue
-
-                if line.startswith("-r "):
-                    ref = line[3:].strip()
-                    ref_path = (base_dir / ref).resolve()
-                    if ref_path not in seen_files:
-                        seen_files.add(ref_path)
-                        packages.update(self._parse_internal(ref_path, seen_files))
-                    continue
-
-                if line.startswith("-e "):
-                    egg_match = re.search(r"#egg=([A-Za-z0-9_.-]+)", line)
-                    if egg_match:
-                        packages.add(egg_match.group(1))
-                    continue
-
-                if "://" in line and "#egg=" in line:
-                    egg_match = re.search(r"#egg=([A-Za-z0-9_.-]+)", line)
-                    if egg_match:
-                        packages.add(egg_match.group(1))
-                    continue
-                match = self.SPEC_PATTERN.match(line)
-                if match:
-                    packages.add(match.group("name"))
+
+        for raw_line in text.splitlines():
+            line = raw_line.strip()
+
+            if not self._is_valid_line(line):
+                continue
+
+            if line.startswith("-r "):
+                packages.update(self._parse_included_file(line[3:].strip(), source, seen_files))
+                continue
+
+            if line.startswith("-e "):
+                egg_match = re.search(r"#egg=([A-Za-z0-9_.-]+)", line)
+                if egg_match:
+                    packages.add(egg_match.group(1))
+                continue
+
+            if "://" in line and "#egg=" in line:
+                egg_match = re.search(r"#egg=([A-Za-z0-9_.-]+)", line)
+                if egg_match:
+                    packages.add(egg_match.group(1))
+                continue
+            match = self.SPEC_PATTERN.match(line)
+            if match:
+                packages.add(match.group("name"))
 
         return packages
 
+    def _parse_included_file(self, included: str, source: Path, seen_files: set[Path] | None) -> set[str]:
+        """Read and parse a file included with -r, skipping it if it cannot be read or was already read."""
+        if seen_files is None:
+            logger.warning("Not reading %s, included from content that was not read from a file. Skipping...", included)
+            return set()
+
+        ref_path = (source.parent / included).resolve()
+        if ref_path in seen_files:
+            return set()
+        seen_files.add(ref_path)
+
+        try:
+            text = FileHandler(str(ref_path)).read()
+        except (PathNotFoundError, PathIsNotFileError, EmptyFileError):
+            logger.warning("Could not read %s, included from %s. Skipping...", ref_path, source)
+            return set()
+        return self._parse_internal(text, ref_path, seen_files)
+
     @staticmethod
     def _is_valid_line(line: str) -> bool:
         """Check if line is valid for parsing."""
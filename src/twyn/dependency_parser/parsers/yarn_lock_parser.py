@@ -1,9 +1,10 @@
+import io
 import re
 from typing import TextIO
 
 import yaml
 
-from twyn.dependency_parser.parsers.abstract_parser import AbstractParser
+from twyn.dependency_parser.parsers.abstract_parser import AbstractParser, DependencyContent
 from twyn.dependency_parser.parsers.constants import YARN_LOCK
 from twyn.dependency_parser.parsers.exceptions import InvalidFileFormatError
 
@@ -12,21 +13,21 @@ class YarnLockParser(AbstractParser):
     def __init__(self, file_path: str = YARN_LOCK) -> None:
         super().__init__(file_path)
 
-    def parse(self) -> set[str]:
+    def parse_content(self, content: DependencyContent) -> set[str]:
         """Parse yarn lock file and return package names."""
-        with self.file_handler.open() as fp:
-            # We want to find out if it's a v1 or v2 file.
-            # we will check maximum on the first 20 lines in order to guess
-            for _ in range(20):
-                line = fp.readline().strip()
-                if not line:
-                    continue
+        fp = io.StringIO(self._read_text(content))
+        # We want to find out if it's a v1 or v2 file.
+        # we will check maximum on the first 20 lines in order to guess
+        for _ in range(20):
+            line = fp.readline().strip()
+            if not line:
+                continue
 
-                if "# yarn lockfile v1" in line:
-                    return self._parse_v1(fp)
+            if "# yarn lockfile v1" in line:
+                return self._parse_v1(fp)
 
-                if "__metadata:" in line:
-                    return self._parse_v2(fp)
+            if "__metadata:" in line:
+                return self._parse_v2(fp)
         raise InvalidFileFormatError("Unkown file format.")
 
     def _parse_v1(self, fp: TextIO) -> set[str]:
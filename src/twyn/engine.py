@@ -0,0 +1,266 @@
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from twyn.base.constants import (
+    DEPENDENCY_FILE_MAPPING,
+    MANUAL_INPUT_SOURCE,
+    PackageEcosystems,
+    SelectorMethod,
+    SimilarityAlgorithmName,
+)
+from twyn.dependency_managers.managers import (
+    PACKAGE_ECOSYSTEMS,
+    get_dependency_manager_from_file,
+    get_dependency_manager_from_name,
+)
+from twyn.dependency_parser.exceptions import NoMatchingParserError
+from twyn.dependency_parser.parsers.exceptions import InvalidFileFormatError
+from twyn.instrumentation.profiler import increment, stage
+from twyn.main import (
+    _analyze_dependencies,
+    _analyze_parsers,
+    _get_config,
+    _get_dependency_managers_and_parsers_mapping,
+    _get_selector_method,
+    _get_similarity_algorithm,
+)
+from twyn.similarity.algorithm import SimilarityThreshold
+from twyn.trusted_packages.cache_handler import CacheHandler
+from twyn.trusted_packages.exceptions import InvalidArgumentsError
+from twyn.trusted_packages.models import TyposquatCheckResultFromSource, TyposquatCheckResults
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+
+    from twyn.dependency_parser.parsers.abstract_parser import DependencyContent
+    from twyn.trusted_packages.managers.base import TrustedPackagesProtocol
+    from twyn.trusted_packages.references.base import AbstractPackageReference
+
+logger = logging.getLogger("twyn")
+
+
+@dataclass(frozen=True)
+class LoadedEcosystem:
+    """Trusted packages of an ecosystem, ready to check dependencies against them."""
+
+    reference: AbstractPackageReference
+    """Reference the trusted packages were loaded from."""
+    trusted_packages: TrustedPackagesProtocol
+    """Manager holding the trusted packages."""
+    loaded_at: float
+    """Value of `time.monotonic()` when they were loaded."""
+
+
+class TwynEngine:
+    """Check dependencies against trusted packages that are loaded once and kept in memory.
+
+    Unlike `check_dependencies`, which resolves the configuration and loads the trusted packages on every call, an
+    engine does it once: the configuration when it is created, and the trusted packages of each ecosystem the first
+    time they are needed. It is meant for long-lived processes, such as services or the MCP server.
+
+    Checks can run concurrently from several threads, or from an event loop with their `_async` variants. Once the
+    trusted packages of an ecosystem are older than `refresh_interval`, they are reloaded in a background thread while
+    checks keep using the previous ones. Reloading goes through the cache, so the trusted packages are only downloaded
+    again once the cache entry has expired.
+    """
+
+    REFRESH_INTERVAL: float = 24 * 60 * 60
+    """Default number of seconds after which the trusted packages of an ecosystem are reloaded."""
+
+    def __init__(
+        self,
+        selector_method: SelectorMethod | None = None,
+        similarity_algorithm: SimilarityAlgorithmName | None = None,
+        config_file: str | None = None,
+        load_config_from_file: bool = False,
+        use_cache: bool | None = True,
+        pypi_source: str | None = None,
+        npm_source: str | None = None,
+        dockerhub_source: str | None = None,
+        cache_dir: str | None = None,
+        refresh_interval: float | None = None,
+        detect_combosquats: bool | None = None,
+        detect_token_variants: bool | None = None,
+    ) -> None:
+        self.config = _get_config(
+            load_config_from_file=load_config_from_file,
+            config_file=config_file,
+            selector_method=selector_method,
+            dependency_files=None,
+            use_cache=use_cache,
+            package_ecosystem=None,
+            recursive=None,
+            pypi_source=pypi_source,
+            npm_source=npm_source,
+            dockerhub_source=dockerhub_source,
+            cache_dir=cache_dir,
+            similarity_algorithm=similarity_algorithm,
+            jobs=None,
+            detect_combosquats=detect_combosquats,
+            detect_token_variants=detect_token_variants,
+        )
+        self.refresh_interval = self.REFRESH_INTERVAL if refresh_interval is None else refresh_interval
+        self.cache_handler = CacheHandler(self.config.cache_dir) if self.config.use_cache else None
+        self.selector_method = _get_selector_method(self.config.selector_method, self.cache_handler)
+        self.similarity_algorithm = _get_similarity_algorithm(self.config.similarity_algorithm)
+
+        self._ecosystems: dict[str, LoadedEcosystem] = {}
+        self._load_locks = {ecosystem: threading.Lock() for ecosystem in PACKAGE_ECOSYSTEMS}
+        self._refresh_lock = threading.Lock()
+        self._refresh_threads: dict[str, threading.Thread] = {}
+
+    def check(self, names: Iterable[str], ecosystem: PackageEcosystems) -> TyposquatCheckResults:
+        """Check the given dependency names, which belong to `ecosystem`.
+
+        Results have `manual_input` as source, like the ones of dependencies passed to `check_dependencies`.
+        """
+        if ecosystem not in PACKAGE_ECOSYSTEMS:
+            raise InvalidArgumentsError("Not a valid `package_ecosystem`.")
+
+        loaded = self.get_ecosystem(ecosystem)
+        possible_typos = _analyze_dependencies(
+            loaded.reference, loaded.trusted_packages, set(names), self.config.allowlist, show_progress_bar=False
+        )
+        if possible_typos:
+            return TyposquatCheckResults(
+                results=[TyposquatCheckResultFromSource(errors=possible_typos, source=MANUAL_INPUT_SOURCE)]
+            )
+        return TyposquatCheckResults()
+
+    def check_files(self, paths: Iterable[str]) -> TyposquatCheckResults:
+        """Parse the given dependency files and check their dependencies, grouping the results by file."""
+        with stage("discovery"):
+            dependency_managers = _get_dependency_managers_and_parsers_mapping(set(paths))
+        increment("files_found", sum(len(parsers) for parsers in dependency_managers.values()))
+
+        typos_by_file = TyposquatCheckResults()
+        for ecosystem, parsers in dependency_managers.items():
+            loaded = self.get_ecosystem(ecosystem)
+            typos_by_file.results += _analyze_parsers(
+                loaded.reference, loaded.trusted_packages, parsers, self.config.allowlist, show_progress_bar=False
+            )
+        return typos_by_file
+
+    def check_file_contents(self, contents: Mapping[str, DependencyContent]) -> TyposquatCheckResults:
+        """Check the dependencies of files given by their name and content, such as uploads or remote files.
+
+        The name of each file picks its parser, like in `check_files`, and is used as the source of its results.
+        The contents are parsed in memory, without writing them to disk, and the files they include (such as with `-r`
+        in a `requirements.txt`) are not read from this host.
+        """
+        typos_by_file = TyposquatCheckResults()
+        for file_name, content in contents.items():
+            parser_class = DEPENDENCY_FILE_MAPPING.get(Path(file_name).name)
+            if parser_class is None:
+                raise NoMatchingParserError
+
+            try:
+                with stage("parse", file=file_name):
+                    parsed_content = parser_class().parse_content(content)
+            except InvalidFileFormatError as e:
+                logger.warning("Could not parse %s. %s", file_name, e)
+                continue
+            increment("names_parsed", len(parsed_content))
+
+            loaded = self.get_ecosystem(get_dependency_manager_from_file(file_name).name)
+            possible_typos = _analyze_dependencies(
+                loaded.reference,
+                loaded.trusted_packages,
+                parsed_content,
+                self.config.allowlist,
+                show_progress_bar=False,
+            )
+            if possible_typos:
+                typos_by_file.results.append(TyposquatCheckResultFromSource(errors=possible_typos, source=file_name))
+        return typos_by_file
+
+    async def check_async(self, names: Iterable[str], ecosystem: PackageEcosystems) -> TyposquatCheckResults:
+        """Asynchronous version of `check`, which runs in a worker thread so the event loop is not blocked."""
+        return await asyncio.to_thread(self.check, set(names), ecosystem)
+
+    async def check_files_async(self, paths: Iterable[str]) -> TyposquatCheckResults:
+        """Asynchronous version of `check_files`, which runs in a worker thread so the event loop is not blocked."""
+        return await asyncio.to_thread(self.check_files, list(paths))
+
+    async def check_file_contents_async(self, contents: Mapping[str, DependencyContent]) -> TyposquatCheckResults:
+        """Asynchronous version of `check_file_contents`, which runs in a worker thread."""
+        return await asyncio.to_thread(self.check_file_contents, dict(contents))
+
+    def load(self, *ecosystems: str) -> None:
+        """Load the trusted packages of the given ecosystems (all of them by default) if they are not loaded yet."""
+        for ecosystem in ecosystems or sorted(PACKAGE_ECOSYSTEMS):
+            self.get_ecosystem(ecosystem)
+
+    def refresh(self, *ecosystems: str) -> None:
+        """Reload the trusted packages of the given ecosystems (the loaded ones by default) right away.
+
+        The indexes built for the previous trusted packages are freed along with them, once no check is using them.
+        """
+        for ecosystem in ecosystems or list(self._ecosystems):
+            with self._load_locks[ecosystem]:
+                self._ecosystems[ecosystem] = self._load(ecosystem)
+
+    def get_ecosystem(self, ecosystem: str) -> LoadedEcosystem:
+        """Return the trusted packages of an ecosystem, loading them the first time.
+
+        If they are older than the refresh interval, they are returned as they are and reloaded in the background.
+        """
+        loaded = self._ecosystems.get(ecosystem)
+        if loaded is None:
+            with self._load_locks[ecosystem]:
+                loaded = self._ecosystems.get(ecosystem)
+                if loaded is None:
+                    loaded = self._ecosystems[ecosystem] = self._load(ecosystem)
+        elif time.monotonic() - loaded.loaded_at >= self.refresh_interval:
+            self._refresh_in_background(ecosystem)
+        return loaded
+
+    def _load(self, ecosystem: str) -> LoadedEcosystem:
+        """Load the trusted packages of an ecosystem from the cache or its source."""
+        manager = get_dependency_manager_from_name(ecosystem)
+        source = manager.get_alternative_source(
+            {"pypi": self.config.pypi_source, "npm": self.config.npm_source, "dockerhub": self.config.dockerhub_source}
+        )
+        reference = manager.trusted_packages_source(source, self.cache_handler)
+        packages = reference.get_packages()
+        with stage("build_index"):
+            trusted_packages = manager.trusted_packages_manager(
+                names=packages,
+                algorithm=self.similarity_algorithm,
+                selector=self.selector_method,
+                threshold_class=SimilarityThreshold,
+                detect_combosquats=self.config.detect_combosquats,
+                detect_token_variants=self.config.detect_token_variants,
+            )
+        logger.debug("Loaded trusted packages for %s", ecosystem)
+        return LoadedEcosystem(reference=reference, trusted_packages=trusted_packages, loaded_at=time.monotonic())
+
+    def _refresh_in_background(self, ecosystem: str) -> None:
+        """Start reloading the trusted packages of an ecosystem in a thread, unless it is already being reloaded."""
+        with self._refresh_lock:
+            running_thread = self._refresh_threads.get(ecosystem)
+            if running_thread and running_thread.is_alive():
+                return
+            thread = threading.Thread(
+                target=self._refresh_ecosystem, args=(ecosystem,), name=f"twyn-refresh-{ecosystem}", daemon=True
+            )
+            self._refresh_threads[ecosystem] = thread
+            thread.start()
+
+    def _refresh_ecosystem(self, ecosystem: str) -> None:
+        """Reload the trusted packages of an ecosystem, keeping the previous ones if it fails."""
+        try:
+            loaded = self._load(ecosystem)
+        except Exception:
+            logger.exception("Could not refresh the trusted packages for %s, the previous ones will be used", ecosystem)
+            # Wait for a whole interval before trying again, instead of retrying on every check.
+            loaded = dataclasses.replace(self._ecosystems[ecosystem], loaded_at=time.monotonic())
+        self._ecosystems[ecosystem] = loaded
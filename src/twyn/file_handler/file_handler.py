@@ -1,7 +1,11 @@
 import logging
 import os
+import stat
+import sys
+import tempfile
 from collections.abc import Iterator
 from contextlib import contextmanager
+from functools import cached_property
 from pathlib import Path
 from typing import TextIO
 
@@ -9,12 +13,42 @@ from twyn.file_handler.exceptions import EmptyFileError, PathIsNotFileError, Pat
 
 logger = logging.getLogger("twyn")
 
+if sys.platform == "win32":  # pragma: no cover
+    import msvcrt
+
+    def _lock_file(fd: int) -> None:
+        while True:
+            try:
+                msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+            except OSError:
+                # `LK_LOCK` gives up after 10 attempts, keep waiting until the lock is released.
+                continue
+            return
+
+    def _unlock_file(fd: int) -> None:
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+else:
+    import fcntl
+
+    def _lock_file(fd: int) -> None:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+
+    def _unlock_file(fd: int) -> None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
 
 class FileHandler:
-    """Handle file operations for reading and writing."""
+    """Handle file operations for reading and writing.
+
+    The status of the file is checked with a single `os.stat` call and its content is read only once. Both are kept
+    until the file is modified through this handler, so handlers should not be kept around while other processes
+    modify the file.
+    """
 
     def __init__(self, file_path: str) -> None:
         self.file_path = self._get_file_path(file_path)
+        self._content: str | None = None
 
     def is_handler_of_file(self, name: str) -> bool:
         """Check if this handler manages the specified file."""
@@ -22,20 +56,25 @@ class FileHandler:
 
     def read(self) -> str:
         """Read file content as string."""
-        self._raise_for_file_exists()
+        if self._content is None:
+            self._raise_for_file_exists()
 
-        content = self.file_path.read_text()
-        logger.debug("Successfully read content from local dependencies file")
+            self._content = self.file_path.read_text()
+            logger.debug("Successfully read content from local dependencies file")
 
-        return content
+        return self._content
 
     @contextmanager
     def open(self, mode="r") -> Iterator[TextIO]:
         """Open file with context manager."""
         self._raise_for_file_exists()
 
-        with self.file_path.open(mode) as fp:
-            yield fp
+        try:
+            with self.file_path.open(mode) as fp:
+                yield fp
+        finally:
+            if "r" not in mode or "+" in mode:
+                self._forget_file_state()
         logger.debug("Successfully read content from local dependencies file")
 
     def exists(self) -> bool:
@@ -48,18 +87,65 @@ class FileHandler:
 
     def _raise_for_file_exists(self) -> None:
         """Raise appropriate exception if file doesn't exist or isn't a file."""
-        if not self.file_path.exists():
+        stat_result = self._stat_result
+        if stat_result is None:
             raise PathNotFoundError
 
-        if not self.file_path.is_file():
+        if not stat.S_ISREG(stat_result.st_mode):
             raise PathIsNotFileError
 
-        if self.file_path.stat().st_size == 0:
+        if stat_result.st_size == 0:
             raise EmptyFileError
 
-    def write(self, data: str) -> None:
-        """Write data to file."""
-        self.file_path.write_text(data)
+    @cached_property
+    def _stat_result(self) -> os.stat_result | None:
+        """Status of the file, or `None` if it does not exist."""
+        try:
+            return os.stat(self.file_path)
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+
+    def _forget_file_state(self) -> None:
+        """Drop the status and content of the file, after it has been modified."""
+        self.__dict__.pop("_stat_result", None)
+        self._content = None
+
+    def write(self, data: str, atomic: bool = False) -> None:
+        """Write data to file.
+
+        If `atomic` is set, data is first written to a temporary file that then replaces the target one,
+        so concurrent readers never see a partially written file.
+        """
+        self._forget_file_state()
+        if not atomic:
+            self.file_path.write_text(data)
+            return
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.file_path.parent, prefix=f".{self.file_path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as fp:
+                fp.write(data)
+            os.replace(tmp_path, self.file_path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+    @contextmanager
+    def lock(self) -> Iterator[None]:
+        """Hold an exclusive advisory lock on the file.
+
+        The file is created if it does not exist. Other processes locking the same file will wait until it is released.
+        """
+        self.file_path.parent.mkdir(parents=True, exist_ok=True)
+        self._forget_file_state()
+        with self.file_path.open("a+b") as fp:
+            fp.seek(0)
+            _lock_file(fp.fileno())
+            logger.debug("Acquired lock on %s", self.file_path)
+            try:
+                yield
+            finally:
+                _unlock_file(fp.fileno())
 
     def delete(self, delete_parent_dir: bool = False) -> None:
         """Delete file and optionally its parent directory."""
@@ -68,6 +154,7 @@ class FileHandler:
             return
 
         self.file_path.unlink()
+        self._forget_file_state()
         logger.info("Deleted file: %s", self.file_path)
 
         if delete_parent_dir:
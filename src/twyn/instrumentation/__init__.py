@@ -0,0 +1,12 @@
+from twyn.instrumentation.hooks import InstrumentationHook, register_hook, unregister_hook, use_hook
+from twyn.instrumentation.models import ProfilingReport
+from twyn.instrumentation.profiler import Profiler
+
+__all__ = [
+    "InstrumentationHook",
+    "Profiler",
+    "ProfilingReport",
+    "register_hook",
+    "unregister_hook",
+    "use_hook",
+]
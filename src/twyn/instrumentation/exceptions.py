@@ -0,0 +1,8 @@
+from twyn.base.exceptions import TwynError
+
+
+class InstrumentationDependencyNotInstalledError(TwynError):
+    """Exception raised when an instrumentation adapter needs an optional dependency that is not installed."""
+
+    message = "The OpenTelemetry adapter needs extra dependencies. Install them with `pip install twyn[opentelemetry]`."
+    """Default error message for missing instrumentation dependencies."""
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from contextlib import AbstractContextManager
+
+    from twyn.instrumentation.profiler import CounterName, StageName
+
+
+class InstrumentationHook(ABC):
+    """Receive a span for every stage a check goes through, together with the counters collected while running it.
+
+    Hooks are registered globally with `register_hook`, so they observe every check run afterwards, from any thread.
+    """
+
+    @abstractmethod
+    def span(self, name: StageName, attributes: dict[str, Any]) -> AbstractContextManager[None]:
+        """Return a context manager that wraps the given stage.
+
+        Exceptions raised within the stage are propagated through it.
+        """
+
+    def add(self, counter: CounterName, amount: int) -> None:  # noqa: B027
+        """Record that `counter` increased by `amount`. Hooks only interested in spans can leave it as is."""
+
+
+_hooks: tuple[InstrumentationHook, ...] = ()
+"""Registered hooks. It is replaced rather than modified, so it can be read without locking."""
+_hooks_lock = threading.Lock()
+
+
+def register_hook(hook: InstrumentationHook) -> None:
+    """Start sending the spans and counters of every check to `hook`."""
+    global _hooks  # noqa: PLW0603
+    with _hooks_lock:
+        if hook not in _hooks:
+            _hooks = (*_hooks, hook)
+
+
+def unregister_hook(hook: InstrumentationHook) -> None:
+    """Stop sending spans and counters to `hook`. Unknown hooks are ignored."""
+    global _hooks  # noqa: PLW0603
+    with _hooks_lock:
+        _hooks = tuple(registered_hook for registered_hook in _hooks if registered_hook is not hook)
+
+
+def clear_hooks() -> None:
+    """Unregister all hooks."""
+    global _hooks  # noqa: PLW0603
+    with _hooks_lock:
+        _hooks = ()
+
+
+def get_hooks() -> tuple[InstrumentationHook, ...]:
+    """Return the registered hooks."""
+    return _hooks
+
+
+@contextmanager
+def use_hook(hook: InstrumentationHook) -> Iterator[InstrumentationHook]:
+    """Register `hook` only for the duration of the block."""
+    register_hook(hook)
+    try:
+        yield hook
+    finally:
+        unregister_hook(hook)
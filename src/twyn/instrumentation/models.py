@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+
+
+class ProfilingReport(BaseModel):
+    """Time spent on each stage of a check, together with the counters collected while running it."""
+
+    total_seconds: float = 0.0
+    """Wall time of the whole check."""
+    stages: dict[str, float] = {}
+    """Seconds spent on each stage. Time spent on a nested stage is only accounted to the innermost one."""
+    counters: dict[str, int] = {}
+    """Counters collected during the check, such as the number of parsed names or cache hits."""
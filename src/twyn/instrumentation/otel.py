@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from twyn.__version__ import __version__
+from twyn.instrumentation.exceptions import InstrumentationDependencyNotInstalledError
+from twyn.instrumentation.hooks import InstrumentationHook
+
+try:
+    from opentelemetry import metrics, trace
+except ModuleNotFoundError:  # pragma: no cover
+    OPENTELEMETRY_INSTALLED = False
+else:
+    OPENTELEMETRY_INSTALLED = True
+
+if TYPE_CHECKING:
+    from contextlib import AbstractContextManager
+
+    from opentelemetry.metrics import Counter, MeterProvider
+    from opentelemetry.trace import TracerProvider
+
+    from twyn.instrumentation.profiler import CounterName, StageName
+
+
+class OpenTelemetryHook(InstrumentationHook):
+    """Report the stages of every check as OpenTelemetry spans and its counters as OpenTelemetry counters.
+
+    Spans are named `twyn.<stage>` and started as children of the current span, so a check run within a span of the
+    caller shows up nested in it. Counters are named `twyn.<counter>`.
+    Uses the global tracer and meter providers, unless others are given.
+    """
+
+    NAME_PREFIX = "twyn."
+    """Prefix of the name of every span and counter."""
+
+    def __init__(
+        self, tracer_provider: TracerProvider | None = None, meter_provider: MeterProvider | None = None
+    ) -> None:
+        if not OPENTELEMETRY_INSTALLED:
+            raise InstrumentationDependencyNotInstalledError
+        self.tracer = trace.get_tracer("twyn", __version__, tracer_provider)
+        self.meter = metrics.get_meter("twyn", __version__, meter_provider)
+        self._counters: dict[str, Counter] = {}
+
+    def span(self, name: StageName, attributes: dict[str, Any]) -> AbstractContextManager[Any]:
+        """Start a span for the given stage, recording any exception raised within it."""
+        return self.tracer.start_as_current_span(f"{self.NAME_PREFIX}{name}", attributes=attributes)
+
+    def add(self, counter: CounterName, amount: int) -> None:
+        """Add `amount` to the OpenTelemetry counter, creating it the first time it is used."""
+        if counter not in self._counters:
+            self._counters[counter] = self.meter.create_counter(f"{self.NAME_PREFIX}{counter}")
+        self._counters[counter].add(amount)
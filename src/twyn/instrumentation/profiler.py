@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any, Literal
+
+from twyn.instrumentation.hooks import get_hooks
+from twyn.instrumentation.models import ProfilingReport
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+StageName = Literal["discovery", "parse", "fetch", "normalize", "build_index", "match"]
+"""Stages a check goes through."""
+
+CounterName = Literal[
+    "files_found",
+    "names_parsed",
+    "dependencies_checked",
+    "distance_computations",
+    "cache_hits",
+    "cache_misses",
+]
+"""Counters collected during a check."""
+
+
+class Profiler:
+    """Collect the time spent on each stage and the counters of a check.
+
+    Stages can be nested: the time of the inner stage is subtracted from the outer one, so the stages always add up
+    to the time spent within them.
+    """
+
+    def __init__(self) -> None:
+        self.stages: dict[str, float] = {}
+        self.counters: dict[str, int] = {}
+        self._started_at = time.perf_counter()
+        self._nested_time: list[float] = []
+
+    @contextmanager
+    def stage(self, name: StageName) -> Iterator[None]:
+        """Time the wrapped block as part of the given stage."""
+        self._nested_time.append(0.0)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            nested_time = self._nested_time.pop()
+            self.stages[name] = self.stages.get(name, 0.0) + elapsed - nested_time
+            if self._nested_time:
+                self._nested_time[-1] += elapsed
+
+    def increment(self, counter: CounterName, amount: int = 1) -> None:
+        """Add `amount` to the given counter."""
+        self.counters[counter] = self.counters.get(counter, 0) + amount
+
+    def to_report(self) -> ProfilingReport:
+        """Return the collected timings and counters."""
+        return ProfilingReport(
+            total_seconds=time.perf_counter() - self._started_at,
+            stages=dict(self.stages),
+            counters=dict(self.counters),
+        )
+
+
+_active_profiler: ContextVar[Profiler | None] = ContextVar("twyn_active_profiler", default=None)
+"""Profiler collecting the timings of the check running in the current context, if any."""
+
+
+@contextmanager
+def profiling(profiler: Profiler | None) -> Iterator[Profiler | None]:
+    """Make `profiler` collect the timings and counters of everything run within the block.
+
+    Passing `None` disables profiling, so callers do not need a separate code path when it is not requested.
+    """
+    token = _active_profiler.set(profiler)
+    try:
+        yield profiler
+    finally:
+        _active_profiler.reset(token)
+
+
+def get_active_profiler() -> Profiler | None:
+    """Return the profiler of the current context, if profiling is enabled."""
+    return _active_profiler.get()
+
+
+@contextmanager
+def stage(name: StageName, **attributes: Any) -> Iterator[None]:
+    """Time the wrapped block as part of the given stage and wrap it in a span of every registered hook.
+
+    The attributes describe the stage (e.g. the file being parsed) and are only passed to the hooks.
+    Nothing is done when profiling is disabled and no hook is registered.
+    """
+    profiler = _active_profiler.get()
+    hooks = get_hooks()
+    if profiler is None and not hooks:
+        yield
+        return
+
+    with ExitStack() as stack:
+        if profiler is not None:
+            stack.enter_context(profiler.stage(name))
+        for hook in hooks:
+            stack.enter_context(hook.span(name, attributes))
+        yield
+
+
+def increment(counter: CounterName, amount: int = 1) -> None:
+    """Add `amount` to the given counter of the active profiler and of every registered hook."""
+    profiler = _active_profiler.get()
+    if profiler is not None:
+        profiler.increment(counter, amount)
+    for hook in get_hooks():
+        hook.add(counter, amount)
@@ -1,14 +1,22 @@
+import asyncio
+import functools
 import logging
-from collections.abc import Iterable
+import math
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import TypeVar
 
 from twyn.base.constants import (
     MANUAL_INPUT_SOURCE,
     SELECTOR_METHOD_MAPPING,
+    SIMILARITY_ALGORITHM_MAPPING,
     PackageEcosystems,
     SelectorMethod,
+    SimilarityAlgorithmName,
 )
 from twyn.config.config_handler import ConfigHandler, TwynConfiguration
-from twyn.config.exceptions import InvalidSelectorMethodError
+from twyn.config.exceptions import InvalidSelectorMethodError, InvalidSimilarityAlgorithmError
 from twyn.dependency_managers.managers import (
     PACKAGE_ECOSYSTEMS,
     get_dependency_manager_from_file,
@@ -19,7 +27,9 @@ from twyn.dependency_parser.parsers.abstract_parser import AbstractParser
 from twyn.dependency_parser.parsers.exceptions import InvalidFileFormatError
 from twyn.file_handler.exceptions import EmptyFileError
 from twyn.file_handler.file_handler import FileHandler
-from twyn.similarity.algorithm import EditDistance, SimilarityThreshold
+from twyn.instrumentation.hooks import clear_hooks, get_hooks
+from twyn.instrumentation.profiler import Profiler, get_active_profiler, increment, profiling, stage
+from twyn.similarity.algorithm import AbstractSimilarityAlgorithm, SimilarityThreshold
 from twyn.trusted_packages.cache_handler import CacheHandler
 from twyn.trusted_packages.exceptions import InvalidArgumentsError
 from twyn.trusted_packages.managers.base import TrustedPackagesProtocol
@@ -27,12 +37,15 @@ from twyn.trusted_packages.models import (
     TyposquatCheckResultEntry,
     TyposquatCheckResultFromSource,
     TyposquatCheckResults,
+    TyposquatFinding,
 )
 from twyn.trusted_packages.references.base import AbstractPackageReference
 
 logger = logging.getLogger("twyn")
 logger.addHandler(logging.NullHandler())
 
+T = TypeVar("T")
+
 
 def check_dependencies(
     selector_method: SelectorMethod | None = None,
@@ -47,6 +60,12 @@ def check_dependencies(
     pypi_source: str | None = None,
     npm_source: str | None = None,
     dockerhub_source: str | None = None,
+    cache_dir: str | None = None,
+    similarity_algorithm: SimilarityAlgorithmName | None = None,
+    jobs: int | None = None,
+    detect_combosquats: bool | None = None,
+    detect_token_variants: bool | None = None,
+    profile: bool = False,
 ) -> TyposquatCheckResults:
     """
     Check if the provided dependencies are potential typosquats of trusted packages.
@@ -64,6 +83,15 @@ def check_dependencies(
         show_progress_bar: Whether to display a progress bar during processing. Defaults to False.
         load_config_from_file: Whether to load configuration from the specified config_file. Defaults to False.
         package_ecosystems: The package ecosystem to use
+        cache_dir: Directory where trusted packages are cached. Defaults to the user cache directory.
+        similarity_algorithm: The algorithm used to compute the distance between package names. Defaults to `edit-distance`.
+        jobs: Number of processes used to analyze the dependencies. Defaults to 1.
+        detect_combosquats: Whether to also report the trusted packages whose name is embedded in a dependency
+            name, such as `requests` in `requests-toolkit`. Defaults to False.
+        detect_token_variants: Whether to also report the trusted packages made of the same tokens as a dependency,
+            reordered or with other separators, such as `python-dateutil` for `dateutil-python`. Defaults to False.
+        profile: Whether to record the time spent on each stage of the check, together with some counters.
+            They are returned in the `profile` attribute of the results. Defaults to False.
     Returns:
         TyposquatCheckResultList: A list of results indicating which dependencies, if any, are suspected typosquats.
     """
@@ -78,13 +106,84 @@ def check_dependencies(
         pypi_source=pypi_source,
         npm_source=npm_source,
         dockerhub_source=dockerhub_source,
+        cache_dir=cache_dir,
+        similarity_algorithm=similarity_algorithm,
+        jobs=jobs,
+        detect_combosquats=detect_combosquats,
+        detect_token_variants=detect_token_variants,
+    )
+    profiler = Profiler() if profile else None
+    with profiling(profiler):
+        results = _check_dependencies(config, dependencies, dockerhub_source, show_progress_bar)
+
+    if profiler:
+        results.profile = profiler.to_report()
+    return results
+
+
+async def check_dependencies_async(
+    selector_method: SelectorMethod | None = None,
+    config_file: str | None = None,
+    dependency_files: set[str] | None = None,
+    dependencies: set[str] | None = None,
+    use_cache: bool | None = True,
+    load_config_from_file: bool = False,
+    package_ecosystem: PackageEcosystems | None = None,
+    recursive: bool | None = None,
+    pypi_source: str | None = None,
+    npm_source: str | None = None,
+    dockerhub_source: str | None = None,
+    cache_dir: str | None = None,
+    similarity_algorithm: SimilarityAlgorithmName | None = None,
+    jobs: int | None = None,
+    detect_combosquats: bool | None = None,
+    detect_token_variants: bool | None = None,
+    profile: bool = False,
+) -> TyposquatCheckResults:
+    """Asynchronous version of `check_dependencies`, taking the same arguments except for the progress bar.
+
+    The check runs in a worker thread, so the event loop is not blocked while the trusted packages are downloaded
+    or the dependencies are matched, and several checks can run concurrently.
+    """
+    return await asyncio.to_thread(
+        functools.partial(
+            check_dependencies,
+            selector_method=selector_method,
+            config_file=config_file,
+            dependency_files=dependency_files,
+            dependencies=dependencies,
+            use_cache=use_cache,
+            load_config_from_file=load_config_from_file,
+            package_ecosystem=package_ecosystem,
+            recursive=recursive,
+            pypi_source=pypi_source,
+            npm_source=npm_source,
+            dockerhub_source=dockerhub_source,
+            cache_dir=cache_dir,
+            similarity_algorithm=similarity_algorithm,
+            jobs=jobs,
+            detect_combosquats=detect_combosquats,
+            detect_token_variants=detect_token_variants,
+            profile=profile,
+        )
     )
-    maybe_cache_handler = CacheHandler() if config.use_cache else None
-    selector_method_obj = _get_selector_method(config.selector_method)
+
+
+def _check_dependencies(
+    config: TwynConfiguration,
+    dependencies: set[str] | None,
+    dockerhub_source: str | None,
+    show_progress_bar: bool,
+) -> TyposquatCheckResults:
+    """Run the check with the resolved configuration."""
+    maybe_cache_handler = CacheHandler(config.cache_dir) if config.use_cache else None
+    selector_method_obj = _get_selector_method(config.selector_method, maybe_cache_handler)
+    similarity_algorithm_obj = _get_similarity_algorithm(config.similarity_algorithm)
 
     if dependencies:  # Dependencies where input manually, will not read dependency files.
         return _analyze_dependencies_from_input(
             selector_method=selector_method_obj,
+            similarity_algorithm=similarity_algorithm_obj,
             pypi_source=config.pypi_source,
             npm_source=config.npm_source,
             dockerhub_source=dockerhub_source,
@@ -93,6 +192,9 @@ def check_dependencies(
             show_progress_bar=show_progress_bar,
             package_ecosystem=config.package_ecosystem,
             dependencies=dependencies,
+            jobs=config.jobs,
+            detect_combosquats=config.detect_combosquats,
+            detect_token_variants=config.detect_token_variants,
         )
 
     # The following checks do not result in an error to avoid inconsistencies.
@@ -108,6 +210,7 @@ def check_dependencies(
 
     return _analyze_dependencies_from_source(
         selector_method=selector_method_obj,
+        similarity_algorithm=similarity_algorithm_obj,
         pypi_source=config.pypi_source,
         npm_source=config.npm_source,
         maybe_cache_handler=maybe_cache_handler,
@@ -115,12 +218,16 @@ def check_dependencies(
         show_progress_bar=show_progress_bar,
         dependency_files=config.dependency_files,
         dockerhub_source=dockerhub_source,
+        jobs=config.jobs,
+        detect_combosquats=config.detect_combosquats,
+        detect_token_variants=config.detect_token_variants,
     )
 
 
 def _analyze_dependencies_from_input(
     package_ecosystem: PackageEcosystems | None,
     selector_method: SelectorMethod,
+    similarity_algorithm: AbstractSimilarityAlgorithm,
     pypi_source: str | None,
     npm_source: str | None,
     dockerhub_source: str | None,
@@ -128,6 +235,9 @@ def _analyze_dependencies_from_input(
     dependencies: set[str],
     allowlist: set[str],
     show_progress_bar: bool,
+    jobs: int = 1,
+    detect_combosquats: bool = False,
+    detect_token_variants: bool = False,
 ) -> TyposquatCheckResults:
     """Analyze dependencies when they are passed as an argument to the main method.
 
@@ -143,15 +253,26 @@ def _analyze_dependencies_from_input(
         {"pypi": pypi_source, "npm": npm_source, "dockerhub": dockerhub_source}
     )
     top_package_reference = dependency_manager.trusted_packages_source(source, maybe_cache_handler)
-    trusted_packages = dependency_manager.trusted_packages_manager(
-        names=top_package_reference.get_packages(),
-        algorithm=EditDistance(),
-        selector=selector_method,
-        threshold_class=SimilarityThreshold,
-    )
-    possible_typos = _analyze_dependencies(
-        top_package_reference, trusted_packages, dependencies, allowlist, show_progress_bar
-    )
+    packages_from_source = top_package_reference.get_packages()
+    with stage("build_index"):
+        trusted_packages = dependency_manager.trusted_packages_manager(
+            names=packages_from_source,
+            algorithm=similarity_algorithm,
+            selector=selector_method,
+            threshold_class=SimilarityThreshold,
+            detect_combosquats=detect_combosquats,
+            detect_token_variants=detect_token_variants,
+        )
+    with _worker_pool(trusted_packages, min(jobs, len(dependencies))) as executor:
+        possible_typos = _analyze_dependencies(
+            top_package_reference,
+            trusted_packages,
+            dependencies,
+            allowlist,
+            show_progress_bar,
+            jobs=jobs,
+            executor=executor,
+        )
     if possible_typos:
         return TyposquatCheckResults(
             results=[
@@ -167,12 +288,16 @@ def _analyze_dependencies_from_input(
 def _analyze_dependencies_from_source(
     allowlist: set[str],
     selector_method: SelectorMethod,
+    similarity_algorithm: AbstractSimilarityAlgorithm,
     show_progress_bar: bool,
     dependency_files: set[str] | None,
     pypi_source: str | None,
     npm_source: str | None,
     dockerhub_source: str | None,
     maybe_cache_handler: CacheHandler | None,
+    jobs: int = 1,
+    detect_combosquats: bool = False,
+    detect_token_variants: bool = False,
 ) -> TyposquatCheckResults:
     """Analyze dependencies from a dependencies file.
 
@@ -180,49 +305,85 @@ def _analyze_dependencies_from_source(
     """
     typos_by_file = TyposquatCheckResults()
 
-    dependency_managers = _get_dependency_managers_and_parsers_mapping(dependency_files)
+    with stage("discovery"):
+        dependency_managers = _get_dependency_managers_and_parsers_mapping(dependency_files)
+    increment("files_found", sum(len(parsers) for parsers in dependency_managers.values()))
+
     for ecosystem_name, parsers in dependency_managers.items():
         manager = get_dependency_manager_from_name(ecosystem_name)
         source = manager.get_alternative_source({"pypi": pypi_source, "npm": npm_source, "dockerhub": dockerhub_source})
         top_package_reference = manager.trusted_packages_source(source, maybe_cache_handler)
 
         packages_from_source = top_package_reference.get_packages()
-        trusted_packages = manager.trusted_packages_manager(
-            names=packages_from_source,
-            algorithm=EditDistance(),
-            selector=selector_method,
-            threshold_class=SimilarityThreshold,
-        )
-        results: list[TyposquatCheckResultFromSource] = []
-        for parser in parsers:
-            try:
-                parsed_content = parser.parse()
-            except (InvalidFileFormatError, EmptyFileError) as e:
-                logger.warning("Could not parse %s. %s", parser.file_path, e)
-                continue
-
-            if not parsed_content:
-                logger.warning("No packages found in %s. Skipping...", parser.file_path)
-                continue
-
-            analyzed_dependencies = _analyze_dependencies(
+        with stage("build_index"):
+            trusted_packages = manager.trusted_packages_manager(
+                names=packages_from_source,
+                algorithm=similarity_algorithm,
+                selector=selector_method,
+                threshold_class=SimilarityThreshold,
+                detect_combosquats=detect_combosquats,
+                detect_token_variants=detect_token_variants,
+            )
+        # A single pool for all the files of the ecosystem, so the trusted packages are sent and indexed only once.
+        with _worker_pool(trusted_packages, jobs) as executor:
+            typos_by_file.results += _analyze_parsers(
                 top_package_reference,
                 trusted_packages,
-                parsed_content,
+                parsers,
                 allowlist,
                 show_progress_bar,
-                parser.file_path,
+                jobs=jobs,
+                executor=executor,
             )
 
-            if analyzed_dependencies:
-                results.append(
-                    TyposquatCheckResultFromSource(source=str(parser.file_path), errors=analyzed_dependencies)
-                )
-        typos_by_file.results += results
-
     return typos_by_file
 
 
+def _analyze_parsers(
+    top_package_reference: AbstractPackageReference,
+    trusted_packages: TrustedPackagesProtocol,
+    parsers: list[AbstractParser],
+    allowlist: set[str],
+    show_progress_bar: bool,
+    jobs: int = 1,
+    executor: ProcessPoolExecutor | None = None,
+) -> list[TyposquatCheckResultFromSource]:
+    """Parse every dependency file of an ecosystem and analyze its dependencies.
+
+    Files that cannot be parsed or have no dependencies are skipped. Only files with possible typos are returned.
+    Their dependencies are analyzed in the `executor`, if given (see `_worker_pool`).
+    """
+    results: list[TyposquatCheckResultFromSource] = []
+    for parser in parsers:
+        try:
+            with stage("parse", file=str(parser.file_path)):
+                parsed_content = parser.parse()
+        except (InvalidFileFormatError, EmptyFileError) as e:
+            logger.warning("Could not parse %s. %s", parser.file_path, e)
+            continue
+
+        increment("names_parsed", len(parsed_content))
+
+        if not parsed_content:
+            logger.warning("No packages found in %s. Skipping...", parser.file_path)
+            continue
+
+        analyzed_dependencies = _analyze_dependencies(
+            top_package_reference,
+            trusted_packages,
+            parsed_content,
+            allowlist,
+            show_progress_bar,
+            str(parser.file_path),
+            jobs=jobs,
+            executor=executor,
+        )
+
+        if analyzed_dependencies:
+            results.append(TyposquatCheckResultFromSource(source=str(parser.file_path), errors=analyzed_dependencies))
+    return results
+
+
 def _analyze_dependencies(
     top_package_reference: AbstractPackageReference,
     trusted_packages: TrustedPackagesProtocol,
@@ -230,30 +391,130 @@ def _analyze_dependencies(
     allowlist: set[str],
     show_progress_bar: bool,
     dependency_file: str | None = None,
+    jobs: int = 1,
+    executor: ProcessPoolExecutor | None = None,
 ) -> list[TyposquatCheckResultEntry]:
     """Analyze the set of given dependencies against the trusted packages' golden set.
 
     Each possible typo is returned in a `TyposquatCheckResultEntry`. A list of possible typos will be returned.
+    Dependencies are analyzed in the `executor` if one is given, which must be a pool of `jobs` worker processes
+    holding the same trusted packages (see `_worker_pool`).
     """
-    normalized_allowlist_packages = top_package_reference.normalize_packages(allowlist)
-    normalized_dependencies = top_package_reference.normalize_packages(packages)
+    with stage("normalize"):
+        normalized_allowlist_packages = top_package_reference.normalize_packages(allowlist)
+        normalized_dependencies = top_package_reference.normalize_packages(packages)
 
-    errors = []
-    for dependency in _get_dependencies_list(normalized_dependencies, show_progress_bar, dependency_file):
+    dependencies = []
+    for dependency in sorted(normalized_dependencies):
         if dependency in normalized_allowlist_packages:
             logger.info("Dependency %s is in the allowlist", dependency)
-            continue
+        else:
+            dependencies.append(dependency)
 
-        logger.info("Analyzing `%s`", dependency)
-        if dependency not in trusted_packages and (typosquat_results := trusted_packages.get_typosquat(dependency)):
-            errors.append(typosquat_results)
+    if executor is not None:
+        with stage("match", dependencies=len(dependencies), jobs=jobs):
+            return _analyze_dependencies_in_parallel(executor, dependencies, show_progress_bar, dependency_file, jobs)
+
+    errors = []
+    with stage("match", dependencies=len(dependencies)):
+        for dependency in _get_dependencies_list(dependencies, show_progress_bar, dependency_file):
+            logger.info("Analyzing `%s`", dependency)
+            increment("dependencies_checked")
+            if dependency not in trusted_packages and (finding := trusted_packages.get_typosquat(dependency)):
+                errors.append(finding.to_result_entry())
 
     return errors
 
 
+_worker_trusted_packages: TrustedPackagesProtocol | None = None
+"""Trusted packages of the current worker process, set once by `_init_worker`."""
+_worker_collect_counters: bool = False
+"""Whether the current worker process should collect counters for the profiler or hooks of the parent process."""
+
+
+@contextmanager
+def _worker_pool(trusted_packages: TrustedPackagesProtocol, jobs: int) -> Iterator[ProcessPoolExecutor | None]:
+    """Start a pool of `jobs` worker processes holding the trusted packages, or none if `jobs` is 1.
+
+    The pool is meant to be shared by all the dependencies checked against the same trusted packages, so that they
+    are only sent to each worker, and indexed by it, once.
+    """
+    if jobs <= 1:
+        yield None
+        return
+
+    collect_counters = get_active_profiler() is not None or bool(get_hooks())
+    with ProcessPoolExecutor(
+        max_workers=jobs, initializer=_init_worker, initargs=(trusted_packages, collect_counters)
+    ) as executor:
+        yield executor
+
+
+def _init_worker(trusted_packages: TrustedPackagesProtocol, collect_counters: bool = False) -> None:
+    """Keep the trusted packages in the worker process, so that they are only transferred once per worker.
+
+    The index of their selector is built right away, once per worker instead of on its first check.
+    Hooks inherited from the parent process are dropped, as the counters are reported back to the parent instead.
+    """
+    global _worker_trusted_packages, _worker_collect_counters  # noqa: PLW0603
+    _worker_trusted_packages = trusted_packages
+    _worker_collect_counters = collect_counters
+    clear_hooks()
+    trusted_packages.prepare()
+
+
+def _get_typosquat_in_worker(dependency: str) -> tuple[TyposquatFinding | None, dict[str, int]]:
+    """Check a single dependency against the trusted packages of the worker process.
+
+    The counters collected while checking it are returned along the result when the parent process needs them,
+    as its profiler and hooks do not live in the worker.
+    """
+    if _worker_trusted_packages is None:
+        raise RuntimeError("Worker process was not initialized")
+
+    logger.info("Analyzing `%s`", dependency)
+    with profiling(Profiler() if _worker_collect_counters else None) as profiler:
+        increment("dependencies_checked")
+        finding = None if dependency in _worker_trusted_packages else _worker_trusted_packages.get_typosquat(dependency)
+    # Empty findings are not sent back, they would only be discarded by the parent process.
+    return finding or None, profiler.counters if profiler else {}
+
+
+def _analyze_dependencies_in_parallel(
+    executor: ProcessPoolExecutor,
+    dependencies: list[str],
+    show_progress_bar: bool,
+    dependency_file: str | None,
+    jobs: int,
+) -> list[TyposquatCheckResultEntry]:
+    """Analyze the dependencies in a pool of `jobs` processes, started by `_worker_pool`.
+
+    Dependencies are split in contiguous shards, a few per worker so that the work stays balanced. Results are
+    returned in the same order as the given dependencies, regardless of which worker finished first.
+    """
+    if not dependencies:
+        return []
+
+    workers = min(jobs, len(dependencies))
+    chunksize = max(1, math.ceil(len(dependencies) / (workers * 4)))
+    results = executor.map(_get_typosquat_in_worker, dependencies, chunksize=chunksize)
+    errors = []
+    for finding, counters in _get_dependencies_list(
+        results, show_progress_bar, dependency_file, total=len(dependencies)
+    ):
+        for counter, amount in counters.items():
+            increment(counter, amount)
+        if finding:
+            errors.append(finding.to_result_entry())
+    return errors
+
+
 def _get_dependencies_list(
-    normalized_dependencies: set[str], show_progress_bar: bool, dependency_file: str | None = None
-) -> Iterable[str]:
+    normalized_dependencies: Iterable[T],
+    show_progress_bar: bool,
+    dependency_file: str | None = None,
+    total: int | None = None,
+) -> Iterable[T]:
     """Return an iterable of dependencies, optionally with progress tracking."""
     if not show_progress_bar:
         return normalized_dependencies
@@ -266,7 +527,7 @@ def _get_dependencies_list(
 
             echo(style(f"Reading file {dependency_file}", fg="green"), color=True)
 
-        return track(normalized_dependencies, description="Processing...")
+        return track(normalized_dependencies, description="Processing...", total=total)
 
     except ModuleNotFoundError as e:
         raise InvalidArgumentsError(
@@ -276,12 +537,20 @@ def _get_dependencies_list(
         ) from e
 
 
-def _get_selector_method(selector_method: str) -> SelectorMethod:
+def _get_selector_method(selector_method: str, cache_handler: CacheHandler | None = None) -> SelectorMethod:
     """Return the selector_method from set of available ones."""
     if selector_method not in SELECTOR_METHOD_MAPPING:
         raise InvalidSelectorMethodError("Invalid selector method")
 
-    return SELECTOR_METHOD_MAPPING[selector_method]()
+    return SELECTOR_METHOD_MAPPING[selector_method](cache_handler)
+
+
+def _get_similarity_algorithm(similarity_algorithm: str) -> AbstractSimilarityAlgorithm:
+    """Return the similarity algorithm from set of available ones."""
+    if similarity_algorithm not in SIMILARITY_ALGORITHM_MAPPING:
+        raise InvalidSimilarityAlgorithmError("Invalid similarity algorithm")
+
+    return SIMILARITY_ALGORITHM_MAPPING[similarity_algorithm]()
 
 
 def _get_dependency_managers_and_parsers_mapping(
@@ -314,6 +583,11 @@ def _get_config(
     pypi_source: str | None,
     npm_source: str | None,
     dockerhub_source: str | None,
+    cache_dir: str | None,
+    similarity_algorithm: str | None,
+    jobs: int | None,
+    detect_combosquats: bool | None,
+    detect_token_variants: bool | None,
 ) -> TwynConfiguration:
     """Given the arguments passed to the main function and the configuration loaded from the config file (if any), return a config object."""
     if load_config_from_file:
@@ -329,4 +603,9 @@ def _get_config(
         pypi_source=pypi_source,
         npm_source=npm_source,
         dockerhub_source=dockerhub_source,
+        cache_dir=cache_dir,
+        similarity_algorithm=similarity_algorithm,
+        jobs=jobs,
+        detect_combosquats=detect_combosquats,
+        detect_token_variants=detect_token_variants,
     )
@@ -6,13 +6,57 @@ except ImportError:
     ) from None
 
 
-from twyn.base.constants import PackageEcosystems, SelectorMethod
-from twyn.main import check_dependencies
+import asyncio
+from collections import OrderedDict
+
+from twyn.base.constants import MANUAL_INPUT_SOURCE, PackageEcosystems, SelectorMethod
+from twyn.engine import TwynEngine
+from twyn.mcp.models import BatchCheckResults, DependencyFileContent, DependencyGroup, DependencyGroupResult
+from twyn.trusted_packages.exceptions import InvalidArgumentsError
 from twyn.trusted_packages.models import TyposquatCheckResults
 
 mcp = FastMCP("Check for possible typos in your dependencies' names.")
 
 
+MAX_ENGINES = 4
+"""Maximum number of engines kept at the same time. The least recently used one is dropped to make room for a new one."""
+
+_engines: OrderedDict[tuple[str | None, ...], TwynEngine] = OrderedDict()
+"""Engines created so far, by the settings they were created with, from the least to the most recently used."""
+
+
+def _get_engine(
+    config_file: str | None,
+    selector_method: SelectorMethod | None,
+    pypi_source: str | None,
+    npm_source: str | None,
+    dockerhub_source: str | None,
+) -> TwynEngine:
+    """Return the engine for the given settings, creating it the first time.
+
+    Engines are kept while they are among the `MAX_ENGINES` most recently used, so the trusted packages of each
+    ecosystem are only loaded by the first tool call that needs them. They are reloaded in the background once they are
+    older than `TwynEngine.REFRESH_INTERVAL`, or right away with the `twyn_refresh` tool.
+    The settings in `config_file`, if given, are used for anything not passed explicitly.
+    """
+    settings = (config_file, selector_method, pypi_source, npm_source, dockerhub_source)
+    if settings in _engines:
+        _engines.move_to_end(settings)
+        return _engines[settings]
+
+    if len(_engines) >= MAX_ENGINES:
+        _engines.popitem(last=False)
+    _engines[settings] = TwynEngine(
+        config_file=config_file,
+        load_config_from_file=config_file is not None,
+        selector_method=selector_method,
+        pypi_source=pypi_source,
+        npm_source=npm_source,
+        dockerhub_source=dockerhub_source,
+    )
+    return _engines[settings]
+
+
 @mcp.tool(
     name="twyn",
     title="Check possible typosquats",
@@ -23,23 +67,89 @@ mcp = FastMCP("Check for possible typos in your dependencies' names.")
         "openWorldHint": True,
     },
 )
-def check_possible_typosquat(
+async def check_possible_typosquat(
     dependencies: set[str] | None = None,
     package_ecosystem: PackageEcosystems | None = None,
     pypi_source: str | None = None,
     npm_source: str | None = None,
+    dockerhub_source: str | None = None,
     config_file: str | None = None,
     selector_method: SelectorMethod | None = None,
 ) -> TyposquatCheckResults:
     """Scan dependencies for typosquats using Twyn."""
-    return check_dependencies(
-        dependencies=dependencies,
-        package_ecosystem=package_ecosystem,
-        pypi_source=pypi_source,
-        npm_source=npm_source,
-        config_file=config_file,
-        selector_method=selector_method,
-    )
+    engine = _get_engine(config_file, selector_method, pypi_source, npm_source, dockerhub_source)
+    if not dependencies:
+        return await engine.check_files_async(engine.config.dependency_files)
+
+    package_ecosystem = package_ecosystem or engine.config.package_ecosystem
+    if not package_ecosystem:
+        raise InvalidArgumentsError("`package_ecosystem` is required when using `dependencies`.")
+    return await engine.check_async(dependencies, package_ecosystem)
+
+
+@mcp.tool(
+    name="twyn_batch",
+    title="Check possible typosquats in a batch",
+    description=(
+        "Check the possible typosquats of several groups of dependencies, each from a given ecosystem, "
+        "and of several dependency files given by their name and content, all in a single call."
+    ),
+    annotations={
+        "readOnlyHint": True,
+        "destructiveHint": False,
+        "openWorldHint": True,
+    },
+)
+async def check_possible_typosquats_batch(
+    groups: list[DependencyGroup] | None = None,
+    files: list[DependencyFileContent] | None = None,
+    pypi_source: str | None = None,
+    npm_source: str | None = None,
+    dockerhub_source: str | None = None,
+    config_file: str | None = None,
+    selector_method: SelectorMethod | None = None,
+) -> BatchCheckResults:
+    """Scan several groups of dependencies and dependency files for typosquats concurrently using Twyn.
+
+    Every group gets a result with its ecosystem, in the same order as the groups, while files only get one when
+    something is found in them, with the name of the file as source.
+    """
+    engine = _get_engine(config_file, selector_method, pypi_source, npm_source, dockerhub_source)
+    groups = groups or []
+    checks = [engine.check_async(group.dependencies, group.package_ecosystem) for group in groups]
+    if files:
+        checks.append(engine.check_file_contents_async({file.file_name: file.content for file in files}))
+    results = await asyncio.gather(*checks)
+
+    batch_results = BatchCheckResults()
+    for group, group_results in zip(groups, results[: len(groups)], strict=True):
+        manual_input_results = group_results.get_results_from_source(MANUAL_INPUT_SOURCE)
+        batch_results.groups.append(
+            DependencyGroupResult(
+                package_ecosystem=group.package_ecosystem,
+                errors=manual_input_results.errors if manual_input_results else [],
+            )
+        )
+    if files:
+        batch_results.files = results[-1].results
+    return batch_results
+
+
+@mcp.tool(
+    name="twyn_refresh",
+    title="Refresh trusted packages",
+    description="Reload the trusted packages used to check for typosquats, instead of waiting for them to expire.",
+    annotations={
+        "readOnlyHint": False,
+        "destructiveHint": False,
+        "idempotentHint": True,
+        "openWorldHint": True,
+    },
+)
+async def refresh_trusted_packages(package_ecosystem: PackageEcosystems | None = None) -> None:
+    """Reload the trusted packages of the given ecosystem, or of every loaded one, in all the engines in use."""
+    ecosystems = (package_ecosystem,) if package_ecosystem else ()
+    await asyncio.gather(*(asyncio.to_thread(engine.refresh, *ecosystems) for engine in list(_engines.values())))
 
 
 def cli() -> None:
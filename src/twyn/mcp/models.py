@@ -0,0 +1,40 @@
+from pydantic import BaseModel
+
+from twyn.base.constants import PackageEcosystems
+from twyn.trusted_packages.models import TyposquatCheckResultEntry, TyposquatCheckResultFromSource
+
+
+class DependencyGroup(BaseModel):
+    """Dependencies of a single ecosystem to check in a batch."""
+
+    package_ecosystem: PackageEcosystems
+    """Ecosystem the dependencies belong to."""
+    dependencies: set[str]
+    """Names of the dependencies to check."""
+
+
+class DependencyFileContent(BaseModel):
+    """Dependency file to check in a batch, given by its content."""
+
+    file_name: str
+    """Name of the file, such as `poetry.lock` or `frontend/package-lock.json`. It picks the parser for the file."""
+    content: str
+    """Content of the file."""
+
+
+class DependencyGroupResult(BaseModel):
+    """Typosquats found in one of the groups of dependencies of a batch."""
+
+    package_ecosystem: PackageEcosystems
+    """Ecosystem of the group."""
+    errors: list[TyposquatCheckResultEntry] = []
+    """Dependencies of the group that may be typosquats."""
+
+
+class BatchCheckResults(BaseModel):
+    """Typosquats found in a batch, by group of dependencies and by file."""
+
+    groups: list[DependencyGroupResult] = []
+    """Results of each group of dependencies, in the same order as the groups were given."""
+    files: list[TyposquatCheckResultFromSource] = []
+    """Results of the files with possible typosquats, with the name of each file as source."""
@@ -1,12 +1,18 @@
 from __future__ import annotations
 
 import logging
+import math
 from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING
 
 from rapidfuzz.distance import DamerauLevenshtein
 
+from twyn.instrumentation.profiler import increment
 from twyn.similarity.exceptions import DistanceAlgorithmError, ThresholdError
 
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
 logger = logging.getLogger("twyn")
 
 
@@ -15,13 +21,20 @@ class SimilarityThreshold:
 
     LENGTH_CUTOFF = 5
     """Length threshold for determining word categorization."""
-    MIN_VALUE = 1.0
-    """Minimum similarity threshold value."""
+    MIN_VALUE = 0.5
+    """Minimum similarity threshold value.
+
+    Identical names have a distance of 0. Algorithms with weighted edits can report distances below 1,
+    down to the cost of their cheapest edit (i.e. an adjacent key substitution in `KeyboardEditDistance`).
+    """
     MAX_FOR_SHORT_WORDS = 1.0
     """Maximum similarity threshold for short words."""
     MAX_FOR_LONG_WORDS = 2.0
     """Maximum similarity threshold for long words."""
 
+    _thresholds_by_length: tuple[SimilarityThreshold, ...]
+    """Threshold for every name length, see `from_length`."""
+
     def __init__(self, max: float) -> None:
         self.min = self.MIN_VALUE
         self.max = max
@@ -31,14 +44,38 @@ class SimilarityThreshold:
 
     @classmethod
     def from_name(cls, name: str) -> SimilarityThreshold:
-        """Create threshold based on name length."""
-        name_length = len(name)
-        if name_length <= cls.LENGTH_CUTOFF:
-            logger.debug("max length of %s selected for %s", cls.MAX_FOR_SHORT_WORDS, name)
-            return cls(max=cls.MAX_FOR_SHORT_WORDS)
+        """Return the threshold for a name, based on its length."""
+        return cls.from_length(len(name))
 
-        logger.debug("max length of %d selected for %s", cls.MAX_FOR_LONG_WORDS, name)
-        return cls(max=cls.MAX_FOR_LONG_WORDS)  # we allow more typos if the name is longer
+    @classmethod
+    def from_length(cls, length: int) -> SimilarityThreshold:
+        """Return the threshold for names of the given length.
+
+        Thresholds only depend on the length, so they are computed once for every length up to `LENGTH_CUTOFF + 1`
+        and shared by all the names. Longer names share the threshold of that last length.
+        """
+        # Looked up in the class itself, so that subclasses with other values do not share the table of their parent.
+        thresholds_by_length = cls.__dict__.get("_thresholds_by_length")
+        if thresholds_by_length is None:
+            thresholds_by_length = cls._build_thresholds_by_length()
+            cls._thresholds_by_length = thresholds_by_length
+        return thresholds_by_length[min(length, cls.LENGTH_CUTOFF + 1)]
+
+    @classmethod
+    def _build_thresholds_by_length(cls) -> tuple[SimilarityThreshold, ...]:
+        """Compute the threshold for every length up to `LENGTH_CUTOFF + 1`."""
+        thresholds_by_length = tuple(
+            # We allow more typos if the name is longer.
+            cls(max=cls.MAX_FOR_SHORT_WORDS if length <= cls.LENGTH_CUTOFF else cls.MAX_FOR_LONG_WORDS)
+            for length in range(cls.LENGTH_CUTOFF + 2)
+        )
+        logger.debug(
+            "Max distance of %s selected for names up to %d characters, %s for longer ones",
+            cls.MAX_FOR_SHORT_WORDS,
+            cls.LENGTH_CUTOFF,
+            cls.MAX_FOR_LONG_WORDS,
+        )
+        return thresholds_by_length
 
     def is_inside_threshold(self, value: float) -> bool:
         """Check if value is within threshold bounds."""
@@ -46,27 +83,71 @@ class SimilarityThreshold:
 
 
 class AbstractSimilarityAlgorithm(ABC):
-    """Algorithm that can compare sequences based of a particular similarity measure."""
+    """Algorithm that can compare sequences based of a particular similarity measure.
+
+    When a `max_distance` is given, algorithms may stop computing a distance as soon as it is known to be above it.
+    The distance returned is then any value above `max_distance`, instead of the exact one.
+    """
+
+    DETECTS_LOOKALIKES = False
+    """Whether names that look alike (see `twyn.similarity.confusables`) are similar, whatever their distance.
 
-    def get_distance(self, first_sequence: str, second_sequence: str) -> float | int:
+    When enabled, the trusted packages managers find them with a lookup before computing any distance.
+    """
+    MIN_EDIT_COST = 1.0
+    """Cost of the cheapest edit, which bounds the number of edits between names within a given distance."""
+
+    def get_distance(self, first_sequence: str, second_sequence: str, max_distance: float | None = None) -> float | int:
         """
         Perform the alignment between sequences and return the computed distance.
 
         Will raise DistanceAlgorithmError if an exception occurs.
         """
         try:
-            return self._run_algorithm(first_sequence, second_sequence)
+            return self._run_algorithm(first_sequence, second_sequence, max_distance)
         except Exception as exc:
             raise DistanceAlgorithmError from exc
 
+    def get_max_edits(self, max_distance: float) -> int:
+        """Return the maximum number of edits between names that are within `max_distance` of each other.
+
+        Selectors that prune the candidates by their edit distance use it, so weighted edits are not missed.
+        """
+        return math.floor(max_distance / self.MIN_EDIT_COST)
+
+    def get_distances(
+        self, first_sequence: str, sequences: Sequence[str], max_distance: float | None = None
+    ) -> Sequence[float | int]:
+        """
+        Compute the distance between a sequence and each one of the given sequences, in the same order.
+
+        Will raise DistanceAlgorithmError if an exception occurs.
+        """
+        increment("distance_computations", len(sequences))
+        try:
+            return self._run_batch_algorithm(first_sequence, sequences, max_distance)
+        except Exception as exc:
+            raise DistanceAlgorithmError from exc
+
+    def _run_batch_algorithm(
+        self, first_sequence: str, sequences: Sequence[str], max_distance: float | None
+    ) -> Sequence[float | int]:
+        """Compute the distances one pair at a time. Algorithms that can process all the sequences at once should override it."""
+        return [self._run_algorithm(first_sequence, sequence, max_distance) for sequence in sequences]
+
     @abstractmethod
-    def _run_algorithm(self, first_sequence: str, second_sequence: str) -> float | int:
+    def _run_algorithm(self, first_sequence: str, second_sequence: str, max_distance: float | None) -> float | int:
         """Abstract method that runs the selected algorithm for computing the distance between two words."""
 
 
 class EditDistance(AbstractSimilarityAlgorithm):
     """Levenshtein algorithm that computes the edit distance between words."""
 
-    def _run_algorithm(self, first_sequence: str, second_sequence: str) -> int:
-        """Compute Damerau-Levenshtein distance between sequences."""
-        return DamerauLevenshtein.distance(s1=first_sequence, s2=second_sequence)
+    def _run_algorithm(self, first_sequence: str, second_sequence: str, max_distance: float | None) -> int:
+        """Compute Damerau-Levenshtein distance between sequences.
+
+        The maximum distance is passed to rapidfuzz as `score_cutoff`, which stops as soon as it is exceeded and
+        returns `score_cutoff + 1`.
+        """
+        score_cutoff = None if max_distance is None else math.floor(max_distance)
+        return DamerauLevenshtein.distance(s1=first_sequence, s2=second_sequence, score_cutoff=score_cutoff)
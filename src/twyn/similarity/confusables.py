@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import re
+from collections import defaultdict
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+from twyn.similarity.algorithm import EditDistance, SimilarityThreshold
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+
+CONFUSABLE_CHARACTERS = {
+    "0": "o",
+    "1": "l",
+    "5": "s",
+}
+"""Characters that can be mistaken for another one, mapped to it.
+
+Only the characters allowed in normalized package names (lowercase ASCII letters, digits and a few symbols) can be
+confused, as dependencies with any other character are rejected before they are compared.
+"""
+
+CONFUSABLE_SEQUENCES = {
+    "rn": "m",
+    "vv": "w",
+    "cl": "d",
+}
+"""Sequences of characters that can be mistaken for a single one, mapped to it."""
+
+_CONFUSABLE_CHARACTERS_TABLE = str.maketrans(CONFUSABLE_CHARACTERS)
+_CONFUSABLE_SEQUENCES_PATTERN = re.compile("|".join(map(re.escape, CONFUSABLE_SEQUENCES)))
+
+
+@lru_cache(maxsize=1 << 16)
+def get_skeleton(name: str) -> str:
+    """Return the skeleton of a name: the name it looks like once every confusable character is replaced.
+
+    Names that look alike share their skeleton (e.g. `rnatplotlib`, `matp1otlib` and `matplotlib`).
+    Skeletons are cached, since the same trusted names are compared against every dependency.
+    """
+    folded_name = name.translate(_CONFUSABLE_CHARACTERS_TABLE)
+    return _CONFUSABLE_SEQUENCES_PATTERN.sub(lambda match: CONFUSABLE_SEQUENCES[match.group()], folded_name)
+
+
+def group_by_skeleton(names: Iterable[str]) -> dict[str, set[str]]:
+    """Group names by their skeleton, so the names that look like a given one can be found with a single lookup."""
+    names_by_skeleton: defaultdict[str, set[str]] = defaultdict(set)
+    for name in names:
+        names_by_skeleton[get_skeleton(name)].add(name)
+    return dict(names_by_skeleton)
+
+
+class ConfusableEditDistance(EditDistance):
+    """Damerau-Levenshtein distance that also considers names that look alike as similar.
+
+    Names that differ but share their skeleton (see `get_skeleton`) are at `LOOKALIKE_DISTANCE`, the smallest distance
+    reported as a typosquat, however many edits apart they are: `rn` in place of `m` is two edits, but hard to spot.
+    The trusted packages managers look up those names in an index of the skeletons of the trusted packages before
+    computing any distance.
+    """
+
+    DETECTS_LOOKALIKES = True
+    LOOKALIKE_DISTANCE = SimilarityThreshold.MIN_VALUE
+    """Distance between different names that look alike."""
+
+    def _run_algorithm(self, first_sequence: str, second_sequence: str, max_distance: float | None) -> float | int:
+        """Compute the distance between sequences, which is `LOOKALIKE_DISTANCE` when they look alike."""
+        return self._run_batch_algorithm(first_sequence, [second_sequence], max_distance)[0]
+
+    def _run_batch_algorithm(
+        self, first_sequence: str, sequences: Sequence[str], max_distance: float | None
+    ) -> list[float | int]:
+        """Compute the distance between a sequence and all the given ones, folding the first one only once."""
+        skeleton = get_skeleton(first_sequence)
+        get_edit_distance = super()._run_algorithm
+        return [
+            self.LOOKALIKE_DISTANCE
+            if sequence != first_sequence and get_skeleton(sequence) == skeleton
+            else get_edit_distance(first_sequence, sequence, max_distance)
+            for sequence in sequences
+        ]
@@ -13,3 +13,12 @@ class ThresholdError(TwynError, ValueError):
 
     message = "Minimum threshold cannot be greater than maximum threshold."
     """Default error message for invalid threshold values."""
+
+
+class AlgorithmDependencyNotInstalledError(TwynError):
+    """Exception raised when the selected algorithm needs an optional dependency that is not installed."""
+
+    message = (
+        "The selected similarity algorithm needs extra dependencies. Install them with `pip install twyn[keyboard]`."
+    )
+    """Default error message for missing algorithm dependencies."""
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import TYPE_CHECKING
+
+from twyn.similarity.algorithm import AbstractSimilarityAlgorithm
+from twyn.similarity.exceptions import AlgorithmDependencyNotInstalledError
+from twyn.trusted_packages.constants import ADJACENCY_MATRIX
+
+try:
+    import numpy as np
+except ModuleNotFoundError:  # pragma: no cover
+    NUMPY_INSTALLED = False
+else:
+    NUMPY_INSTALLED = True
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from numpy.typing import NDArray
+
+
+class KeyboardEditDistance(AbstractSimilarityAlgorithm):
+    """Damerau-Levenshtein distance where hitting a key next to the intended one is a cheaper mistake.
+
+    Insertions, deletions, transpositions and substitutions cost 1, except for substitutions between keys that
+    are adjacent in an English keyboard, which cost `ADJACENT_KEY_SUBSTITUTION_COST`. Transpositions follow the
+    restricted (optimal string alignment) definition.
+
+    All the candidates are compared at once with NumPy: they are grouped by length and the dynamic programming
+    rows are computed for the whole group, one character of the compared name at a time. With a maximum distance,
+    a group stops as soon as every cell of its row is above it.
+    """
+
+    ADJACENT_KEY_SUBSTITUTION_COST = 0.5
+    """Cost of replacing a character by one of its neighbours in the keyboard."""
+    MIN_EDIT_COST = ADJACENT_KEY_SUBSTITUTION_COST
+    ALPHABET_SIZE = 128
+    """Size of the substitution cost table. Characters outside of ASCII share its last slot."""
+
+    def __init__(self) -> None:
+        if not NUMPY_INSTALLED:
+            raise AlgorithmDependencyNotInstalledError
+        self.substitution_costs = self._build_substitution_costs()
+
+    def _build_substitution_costs(self) -> NDArray[np.float32]:
+        """Precompute the cost of substituting any ASCII character by any other one."""
+        costs = np.ones((self.ALPHABET_SIZE, self.ALPHABET_SIZE), dtype=np.float32)
+        np.fill_diagonal(costs, 0.0)
+        for key, neighbours in ADJACENCY_MATRIX.items():
+            for neighbour in neighbours:
+                costs[ord(key), ord(neighbour)] = self.ADJACENT_KEY_SUBSTITUTION_COST
+                costs[ord(neighbour), ord(key)] = self.ADJACENT_KEY_SUBSTITUTION_COST
+        # Non-ASCII characters are all mapped to the last slot, equality is checked on their code points instead.
+        costs[-1, -1] = 1.0
+        return costs
+
+    def _run_algorithm(self, first_sequence: str, second_sequence: str, max_distance: float | None) -> float:
+        """Compute the keyboard-aware distance between two sequences."""
+        return self._run_batch_algorithm(first_sequence, [second_sequence], max_distance)[0]
+
+    def _run_batch_algorithm(
+        self, first_sequence: str, sequences: Sequence[str], max_distance: float | None
+    ) -> list[float]:
+        """Compute the keyboard-aware distance between a sequence and all the given ones."""
+        indexes_by_length: defaultdict[int, list[int]] = defaultdict(list)
+        for index, sequence in enumerate(sequences):
+            indexes_by_length[len(sequence)].append(index)
+
+        query = _encode([first_sequence], len(first_sequence))[:, 0]
+        distances = np.empty(len(sequences), dtype=np.float32)
+        for length, indexes in indexes_by_length.items():
+            candidates = _encode([sequences[index] for index in indexes], length)
+            distances[indexes] = self._compute_distances(query, candidates, max_distance)
+        return distances.tolist()
+
+    def _compute_distances(
+        self, query: NDArray[np.uint32], candidates: NDArray[np.uint32], max_distance: float | None
+    ) -> NDArray[np.float32]:
+        """Compute the distances between `query` and every column of `candidates`, which have all the same length.
+
+        Candidates are laid out one per column so that every operation runs over contiguous memory.
+        """
+        length, count = candidates.shape
+        columns = np.arange(length + 1, dtype=np.float32)[:, np.newaxis]
+        previous_row = np.repeat(columns, count, axis=1)
+        before_previous_row = previous_row
+        table_candidates = np.minimum(candidates, self.ALPHABET_SIZE - 1)
+        previous_matches = None
+
+        for row, char in enumerate(query, start=1):
+            matches = candidates == char
+            substitution = self.substitution_costs[min(char, self.ALPHABET_SIZE - 1)][table_candidates]
+            substitution[matches] = 0.0
+
+            current_row = np.empty_like(previous_row)
+            current_row[0] = row
+            np.add(previous_row[:-1], substitution, out=current_row[1:])
+            np.minimum(current_row[1:], previous_row[1:] + 1.0, out=current_row[1:])
+            if previous_matches is not None and length > 1:
+                # The candidate has the last two characters of the query swapped.
+                transposed = matches[:-1] & previous_matches[1:]
+                np.minimum(current_row[2:], before_previous_row[:-2] + 1.0, out=current_row[2:], where=transposed)
+            # Insertions chain along the row: cell j is the minimum of cell k plus (j - k) insertions, for all k <= j.
+            current_row -= columns
+            np.minimum.accumulate(current_row, axis=0, out=current_row)
+            current_row += columns
+            before_previous_row, previous_row, previous_matches = previous_row, current_row, matches
+            # Edits never make the distance smaller, so no cell of the following rows can be below this row.
+            if max_distance is not None and current_row.min() > max_distance:
+                return current_row.min(axis=0)
+
+        return previous_row[-1]
+
+
+def _encode(sequences: list[str], length: int) -> NDArray[np.uint32]:
+    """Encode sequences of the same length as a matrix of code points, one column per sequence."""
+    buffer = "".join(sequences).encode("utf-32-le")
+    return np.frombuffer(buffer, dtype=np.uint32).reshape(len(sequences), length).T.copy()
@@ -1,23 +1,44 @@
-import json
 import logging
 import os
+import re
+import sys
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
 from datetime import datetime
 from hashlib import md5
 from pathlib import Path
 
 from pydantic import BaseModel, ValidationError, field_validator
 
+from twyn.base import json_codec
 from twyn.file_handler.file_handler import FileHandler
-from twyn.trusted_packages.constants import CACHE_DIR, TRUSTED_PACKAGES_MAX_RETENTION_DAYS
+from twyn.trusted_packages.constants import (
+    CACHE_DIR_NAME,
+    CACHE_SCHEMA_VERSION,
+    INDEXES_DIR_NAME,
+    TRUSTED_PACKAGES_MAX_RETENTION_DAYS,
+)
 
 logger = logging.getLogger("twyn")
 
+_ENTRY_FILE_NAME_PATTERN = re.compile(r"\.?[0-9a-f]{32}\.(?:json|lock)(?:\..+\.tmp)?")
+"""Names of the files written for each source: its entry, its lock and the temporary files of atomic writes."""
+_INDEX_FILE_NAME_PATTERN = re.compile(r"\.?[^.]+\.json(?:\..+\.tmp)?")
+"""Names of the files written in the indexes subdirectory: the indexes and the temporary files of atomic writes."""
+
 
 class CacheEntry(BaseModel):
+    schema_version: int = CACHE_SCHEMA_VERSION
+    """Version of the layout used to store the entry."""
     saved_date: str
     """ISO format date string when the cache entry was saved."""
-    packages: set[str]
-    """Set of trusted package names."""
+    source: str | None = None
+    """Source the trusted packages were retrieved from."""
+    packages: dict[str, set[str]]
+    """Normalized trusted package names, grouped by their first letter."""
+    namespaces: dict[str, set[str]] = {}
+    """Normalized namespaced package names, grouped by their namespace."""
 
     @field_validator("saved_date")
     @classmethod
@@ -31,20 +52,90 @@ class CacheEntry(BaseModel):
             return v
 
 
+class DeletionIndexEntry(BaseModel):
+    schema_version: int = CACHE_SCHEMA_VERSION
+    """Version of the layout used to store the entry."""
+    max_distance: int
+    """Maximum number of deletions the index was built with."""
+    prefix_length: int
+    """Number of leading characters of every name the deletions were computed from."""
+    names: list[str]
+    """Sorted names the index was built from."""
+    deletes: dict[str, list[int]]
+    """Positions in `names` of the names that lead to every deletion."""
+
+
+@dataclass(frozen=True)
+class CacheEntryStats:
+    """Size and age of a single cache file."""
+
+    file_path: str
+    """Path to the cache file."""
+    size: int
+    """Size of the cache file, in bytes."""
+    source: str | None
+    """Source of the cached trusted packages. None if the entry could not be read."""
+    saved_date: str | None
+    """ISO format date string when the cache entry was saved. None if the entry could not be read."""
+    age_days: int | None
+    """Number of days since the entry was saved. None if the entry could not be read."""
+    is_outdated: bool
+    """Whether the entry is too old (or unreadable) to be used."""
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Summary of the contents of a cache directory."""
+
+    cache_dir: str
+    """Directory the stats were computed for."""
+    entries: list[CacheEntryStats]
+    """Stats of every cache entry found in the directory."""
+    total_size: int
+    """Size of all the files in the cache directory, in bytes."""
+
+
+def get_default_cache_dir() -> str:
+    """Return the user-level cache directory, shared across all projects.
+
+    It follows the XDG Base Directory specification, using `$XDG_CACHE_HOME/twyn` and falling back to `~/.cache/twyn`.
+    On Windows `%LOCALAPPDATA%` is used when `XDG_CACHE_HOME` is not set.
+    """
+    xdg_cache_home = os.environ.get("XDG_CACHE_HOME")
+    # Relative paths are considered invalid by the specification and must be ignored.
+    if xdg_cache_home and os.path.isabs(xdg_cache_home):
+        return str(Path(xdg_cache_home) / CACHE_DIR_NAME)
+
+    local_app_data = os.environ.get("LOCALAPPDATA")
+    if sys.platform == "win32" and local_app_data:  # pragma: no cover
+        return str(Path(local_app_data) / CACHE_DIR_NAME)
+
+    return str(Path.home() / ".cache" / CACHE_DIR_NAME)
+
+
 class CacheHandler:
     """Cache class that provides basic read/write/delete operation for individual source cache files."""
 
-    def __init__(self, cache_dir: str = CACHE_DIR) -> None:
-        self.cache_dir = cache_dir
+    def __init__(self, cache_dir: str | None = None) -> None:
+        self.cache_dir = cache_dir or get_default_cache_dir()
 
     def write_entry(self, source: str, data: CacheEntry) -> None:
         """Save cache entry to source-specific cache file."""
         file_handler = self._get_file_handler(source)
         # Ensure parent directory exists
         file_handler.file_path.parent.mkdir(parents=True, exist_ok=True)
-        file_handler.write(data.model_dump_json())
+        file_handler.write(json_codec.dumps_model(data.model_copy(update={"source": source})), atomic=True)
         logger.debug("Successfully wrote cache data to %s", file_handler.file_path)
 
+    @contextmanager
+    def lock(self, source: str) -> Iterator[None]:
+        """Hold an exclusive lock over the cache entry of a source.
+
+        It allows a single process to refresh an entry, while the rest wait for it and then reuse its result.
+        """
+        with FileHandler(self.get_cache_lock_path(source)).lock():
+            yield
+
     def get_cache_entry(self, source: str) -> CacheEntry | None:
         """Retrieve cache entry from source-specific cache file."""
         file_handler = self._get_file_handler(source)
@@ -54,14 +145,20 @@ class CacheHandler:
 
         try:
             with file_handler.open("rb") as fp:
-                json_content = json.load(fp)
-        except json.JSONDecodeError as e:
+                json_content = json_codec.loads(fp.read())
+        except json_codec.JSONDecodeError as e:
             logger.warning("Failed to decode JSON from cache file %s: %s", file_handler.file_path, e)
             return None
 
         if not json_content:
             return None
 
+        if json_content.get("schema_version") != CACHE_SCHEMA_VERSION:
+            logger.debug(
+                "Cache file %s was written with a different schema version. Ignoring it.", file_handler.file_path
+            )
+            return None
+
         try:
             entry = CacheEntry(**json_content)
             if not self.is_entry_outdated(entry):
@@ -72,6 +169,31 @@ class CacheHandler:
 
         return None
 
+    def write_deletion_index_entry(self, fingerprint: str, data: DeletionIndexEntry) -> None:
+        """Save a deletion index, identified by the fingerprint of the names it was built from."""
+        file_handler = FileHandler(self.get_index_file_path(fingerprint))
+        file_handler.file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_handler.write(json_codec.dumps_model(data), atomic=True)
+        logger.debug("Successfully wrote deletion index to %s", file_handler.file_path)
+        self._prune_outdated_indexes()
+
+    def get_deletion_index_entry(self, fingerprint: str) -> DeletionIndexEntry | None:
+        """Retrieve the deletion index built from the names with the given fingerprint, if it was stored."""
+        file_handler = FileHandler(self.get_index_file_path(fingerprint))
+        if not file_handler.exists():
+            logger.debug("Deletion index not found: %s", file_handler.file_path)
+            return None
+
+        try:
+            entry = json_codec.loads_model(DeletionIndexEntry, file_handler.read())
+        except ValidationError:
+            logger.warning("Could not read deletion index %s. It will be rebuilt.", file_handler.file_path)
+            return None
+
+        if entry.schema_version != CACHE_SCHEMA_VERSION:
+            return None
+        return entry
+
     def is_entry_outdated(self, entry: CacheEntry) -> bool:
         """Check if a cache entry is outdated based on retention days."""
         try:
@@ -83,26 +205,98 @@ class CacheHandler:
         else:
             return days_diff > TRUSTED_PACKAGES_MAX_RETENTION_DAYS
 
+    def get_stats(self) -> CacheStats:
+        """Return the entries stored in the cache directory, together with their age and size."""
+        entries: list[CacheEntryStats] = []
+        total_size = 0
+        cache_path = Path(self.cache_dir)
+        for path in self._get_cache_files():
+            size = path.stat().st_size
+            total_size += size
+            # Indexes derived from the entries are stored in a subdirectory and are not entries themselves.
+            if path.suffix == ".json" and path.parent == cache_path:
+                entries.append(self._get_entry_stats(path, size))
+
+        return CacheStats(cache_dir=self.cache_dir, entries=entries, total_size=total_size)
+
     def clear_all(self) -> None:
-        """Delete all cache files in the cache directory."""
-        for root, _dirs, files in os.walk(self.cache_dir):
-            for file in files:
-                if file.endswith(".json"):
-                    FileHandler(os.path.join(root, file)).delete()
+        """Delete all cache files in the cache directory, and the directory itself if nothing else is left in it."""
+        for path in self._get_cache_files():
+            # Lock files are empty, so they are not considered as existing by `FileHandler`.
+            path.unlink(missing_ok=True)
 
-        # Remove parent directory if it exists and is empty
-        cache_path = Path(self.cache_dir)
-        if cache_path.exists() and cache_path.is_dir():
+        for directory in (Path(self.cache_dir, INDEXES_DIR_NAME), Path(self.cache_dir)):
+            if not directory.is_dir():
+                continue
             try:
-                cache_path.rmdir()
+                directory.rmdir()
             except OSError:
-                logger.exception("Could not delete cache directory.")
+                logger.info("Cache directory %s holds other files. It will not be deleted.", directory)
 
     def get_cache_file_path(self, source: str) -> str:
         """Generate cache file path for a specific source."""
         safe_filename = md5(source.encode()).hexdigest()
         return str(Path(self.cache_dir) / f"{safe_filename}.json")
 
+    def get_cache_lock_path(self, source: str) -> str:
+        """Generate lock file path for a specific source."""
+        safe_filename = md5(source.encode()).hexdigest()
+        return str(Path(self.cache_dir) / f"{safe_filename}.lock")
+
+    def get_index_file_path(self, fingerprint: str) -> str:
+        """Generate file path for an index derived from the cached trusted packages."""
+        return str(Path(self.cache_dir) / INDEXES_DIR_NAME / f"{fingerprint}.json")
+
+    def _prune_outdated_indexes(self) -> None:
+        """Delete the indexes that were not rebuilt for longer than the retention period of the cache entries.
+
+        Indexes are identified by the names they were built from, so they are left behind when a reference changes.
+        """
+        max_age_seconds = TRUSTED_PACKAGES_MAX_RETENTION_DAYS * 24 * 60 * 60
+        now = datetime.now().timestamp()
+        for path in Path(self.cache_dir, INDEXES_DIR_NAME).glob("*.json"):
+            if now - path.stat().st_mtime > max_age_seconds:
+                path.unlink(missing_ok=True)
+
+    def _get_cache_files(self) -> list[Path]:
+        """Return the files written by the handler in the cache directory.
+
+        The cache directory can be set by the user, so any other file in it, or in other subdirectories, is left out.
+        """
+        cache_path = Path(self.cache_dir)
+        if not cache_path.is_dir():
+            return []
+
+        files = [path for path in cache_path.iterdir() if _ENTRY_FILE_NAME_PATTERN.fullmatch(path.name)]
+        indexes_path = cache_path / INDEXES_DIR_NAME
+        if indexes_path.is_dir():
+            files += [path for path in indexes_path.iterdir() if _INDEX_FILE_NAME_PATTERN.fullmatch(path.name)]
+        return sorted(path for path in files if path.is_file())
+
+    def _get_entry_stats(self, path: Path, size: int) -> CacheEntryStats:
+        """Read the metadata of a cache file, without validating the packages stored in it."""
+        try:
+            json_content = json_codec.loads(path.read_bytes())
+            saved_date = json_content["saved_date"]
+            age_days = (datetime.today().date() - datetime.fromisoformat(saved_date).date()).days
+        except (OSError, ValueError, TypeError, KeyError):
+            logger.debug("Could not read cache file %s", path)
+            return CacheEntryStats(
+                file_path=str(path), size=size, source=None, saved_date=None, age_days=None, is_outdated=True
+            )
+
+        return CacheEntryStats(
+            file_path=str(path),
+            size=size,
+            source=json_content.get("source"),
+            saved_date=saved_date,
+            age_days=age_days,
+            is_outdated=(
+                json_content.get("schema_version") != CACHE_SCHEMA_VERSION
+                or age_days > TRUSTED_PACKAGES_MAX_RETENTION_DAYS
+            ),
+        )
+
     def _get_file_handler(self, source: str) -> FileHandler:
         """Get file handler for a specific source cache file."""
         cache_file_path = self.get_cache_file_path(source)
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import logging
+from collections import deque
+from typing import TYPE_CHECKING
+
+from twyn.instrumentation.profiler import stage
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+logger = logging.getLogger("twyn")
+
+_ROOT = 0
+"""State of the automaton before reading any character."""
+
+
+class CombosquatDetector:
+    """Find the trusted names embedded in a dependency name, such as `requests` in `requests-toolkit`.
+
+    Such names (combosquats) are usually too many edits away from the trusted name to be found by the similarity
+    algorithm. All the trusted names are compiled into a single Aho-Corasick automaton, so a dependency name is
+    scanned once, in time proportional to its length, whatever the number of trusted names.
+
+    Only whole tokens count: a trusted name must start and end at a separator (or at the ends of the dependency), so
+    `six` is not found in `sixty`. Short names are not indexed, as they are part of too many unrelated names.
+    """
+
+    MIN_NAME_LENGTH = 5
+    """Minimum length of the trusted names that are looked for."""
+    SEPARATORS = frozenset("-_./")
+    """Characters that separate the tokens of a name."""
+
+    def __init__(self, names: Iterable[str]) -> None:
+        self.transitions: list[dict[str, int]] = [{}]
+        """Next state for every character that can be read in each state."""
+        self.names: list[str] = [""]
+        """Trusted name read when reaching each state, or an empty string if there is none."""
+        self.fail: list[int] = [_ROOT]
+        """State for the longest proper suffix of each state that is also a prefix of a trusted name."""
+        self.output: list[int] = [_ROOT]
+        """Closest state along the fail links of each state where a trusted name ends, or the root if there is none."""
+
+        for name in sorted(set(names)):
+            if len(name) >= self.MIN_NAME_LENGTH:
+                self._insert(name)
+        self._link()
+
+    @classmethod
+    def from_names(cls, names: Iterable[str]) -> CombosquatDetector:
+        """Build the automaton for the given trusted names."""
+        with stage("build_index"):
+            detector = cls(names)
+        logger.debug("Built combosquat automaton with %d states", len(detector.transitions))
+        return detector
+
+    def _insert(self, name: str) -> None:
+        """Add the states needed to read a name."""
+        state = _ROOT
+        for character in name:
+            next_state = self.transitions[state].get(character)
+            if next_state is None:
+                next_state = len(self.transitions)
+                self.transitions[state][character] = next_state
+                self.transitions.append({})
+                self.names.append("")
+                self.fail.append(_ROOT)
+                self.output.append(_ROOT)
+            state = next_state
+        self.names[state] = name
+
+    def _link(self) -> None:
+        """Compute the fail and output links, visiting the states in order of depth."""
+        queue = deque(self.transitions[_ROOT].values())
+        while queue:
+            state = queue.popleft()
+            for character, next_state in self.transitions[state].items():
+                fallback = self.fail[state]
+                while fallback != _ROOT and character not in self.transitions[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.transitions[fallback].get(character, _ROOT)
+                fail_state = self.fail[next_state]
+                self.output[next_state] = fail_state if self.names[fail_state] else self.output[fail_state]
+                queue.append(next_state)
+
+    def find(self, dependency: str) -> list[str]:
+        """Return the trusted names embedded in the dependency as whole tokens, in order of appearance.
+
+        Names within a longer match (such as `google` in `google-cloud-storage`) and the dependency itself are left out.
+        """
+        matches: list[tuple[int, int, str]] = []
+        state = _ROOT
+        for end, character in enumerate(dependency, start=1):
+            while state != _ROOT and character not in self.transitions[state]:
+                state = self.fail[state]
+            state = self.transitions[state].get(character, _ROOT)
+
+            match_state = state if self.names[state] else self.output[state]
+            while match_state != _ROOT:
+                name = self.names[match_state]
+                start = end - len(name)
+                if self._is_token(dependency, start, end):
+                    matches.append((start, end, name))
+                match_state = self.output[match_state]
+
+        return self._get_longest_matches(dependency, matches)
+
+    def _is_token(self, dependency: str, start: int, end: int) -> bool:
+        """Check whether the characters between `start` and `end` are surrounded by separators."""
+        return (start == 0 or dependency[start - 1] in self.SEPARATORS) and (
+            end == len(dependency) or dependency[end] in self.SEPARATORS
+        )
+
+    @staticmethod
+    def _get_longest_matches(dependency: str, matches: list[tuple[int, int, str]]) -> list[str]:
+        """Drop the matches that are within a longer one, including the dependency itself if it is a trusted name."""
+        longest_matches: list[str] = []
+        # Longer matches first, so the ones they contain are found after them.
+        matches.sort(key=lambda match: (match[0], -match[1]))
+        covered_until = 0
+        for start, end, name in matches:
+            if end <= covered_until:
+                continue
+            covered_until = end
+            if end - start < len(dependency):
+                longest_matches.append(name)
+        return longest_matches
@@ -1,10 +1,16 @@
 # Cache configuration constants
-CACHE_DIR = ".twyn"
-"""Directory name for storing cache files."""
+CACHE_DIR_NAME = "twyn"
+"""Directory name for storing cache files, within the user cache directory."""
 
 TRUSTED_PACKAGES_MAX_RETENTION_DAYS = 30
 """Maximum number of days to retain trusted packages in cache."""
 
+INDEXES_DIR_NAME = "indexes"
+"""Subdirectory of the cache directory where indexes built from the trusted packages are stored."""
+
+CACHE_SCHEMA_VERSION = 3
+"""Version of the cache files layout. Entries written with a different version are ignored."""
+
 
 ADJACENCY_MATRIX = {
     "1": ["2", "q", "w"],
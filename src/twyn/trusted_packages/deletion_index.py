@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import logging
+from collections import defaultdict
+from hashlib import md5
+from typing import TYPE_CHECKING
+
+from twyn.instrumentation.profiler import increment, stage
+from twyn.similarity.algorithm import SimilarityThreshold
+from twyn.trusted_packages.cache_handler import DeletionIndexEntry
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from twyn.trusted_packages.cache_handler import CacheHandler
+
+logger = logging.getLogger("twyn")
+
+
+class DeletionIndex:
+    """Symmetric deletion index (as in SymSpell) over a set of names.
+
+    Every name is indexed under all the strings that result from deleting up to `MAX_DISTANCE` characters from its
+    first `PREFIX_LENGTH` characters. Two names within `MAX_DISTANCE` edits (Damerau-Levenshtein) of each other always
+    share one of those strings, so looking up a name only takes a hash probe per deletion of the name.
+
+    Lookups may return names that are further away, so they still need to be verified with a similarity algorithm.
+    """
+
+    MAX_DISTANCE = int(SimilarityThreshold.MAX_FOR_LONG_WORDS)
+    """Maximum number of edits between a name and the names returned when looking it up."""
+    PREFIX_LENGTH = 7
+    """Only the first characters of the names are indexed, which keeps the index small for long names."""
+
+    def __init__(self, names: list[str], deletes: dict[str, list[int]]) -> None:
+        self.names = names
+        self.deletes = deletes
+
+    @classmethod
+    def from_names(cls, names: Iterable[str], cache_handler: CacheHandler | None = None) -> DeletionIndex:
+        """Build the index for the given names, reusing the one stored in the cache when available."""
+        with stage("build_index"):
+            sorted_names = sorted(set(names))
+            if not cache_handler:
+                return cls._build(sorted_names)
+
+            fingerprint = cls.get_fingerprint(sorted_names)
+            entry = cache_handler.get_deletion_index_entry(fingerprint)
+            if (
+                entry
+                and entry.max_distance == cls.MAX_DISTANCE
+                and entry.prefix_length == cls.PREFIX_LENGTH
+                and entry.names == sorted_names
+            ):
+                logger.debug("Loaded deletion index from cache")
+                increment("cache_hits")
+                return cls(entry.names, entry.deletes)
+
+            increment("cache_misses")
+            index = cls._build(sorted_names)
+            cache_handler.write_deletion_index_entry(fingerprint, index.to_cache_entry())
+            return index
+
+    @classmethod
+    def _build(cls, sorted_names: list[str]) -> DeletionIndex:
+        """Index every name under the deletions of its prefix."""
+        deletes: defaultdict[str, list[int]] = defaultdict(list)
+        for position, name in enumerate(sorted_names):
+            for deletion in get_deletions(name[: cls.PREFIX_LENGTH], cls.MAX_DISTANCE):
+                deletes[deletion].append(position)
+        logger.debug("Built deletion index with %d keys for %d names", len(deletes), len(sorted_names))
+        return cls(sorted_names, dict(deletes))
+
+    @staticmethod
+    def get_fingerprint(sorted_names: list[str]) -> str:
+        """Return an identifier for a set of names, used to store their index in the cache."""
+        return md5("\n".join(sorted_names).encode()).hexdigest()
+
+    def to_cache_entry(self) -> DeletionIndexEntry:
+        """Return the index in the format it is stored in the cache."""
+        return DeletionIndexEntry(
+            max_distance=self.MAX_DISTANCE,
+            prefix_length=self.PREFIX_LENGTH,
+            names=self.names,
+            deletes=self.deletes,
+        )
+
+    def lookup(self, name: str) -> list[str]:
+        """Return the indexed names that can be within `MAX_DISTANCE` edits of the given one, in alphabetical order."""
+        positions: set[int] = set()
+        for deletion in get_deletions(name[: self.PREFIX_LENGTH], self.MAX_DISTANCE):
+            positions.update(self.deletes.get(deletion, ()))
+        return [self.names[position] for position in sorted(positions)]
+
+
+def get_deletions(word: str, max_deletions: int) -> set[str]:
+    """Return all the strings that can be obtained by deleting up to `max_deletions` characters from `word`."""
+    deletions = {word}
+    previous = {word}
+    for _ in range(max_deletions):
+        previous = {candidate[:i] + candidate[i + 1 :] for candidate in previous for i in range(len(candidate))}
+        deletions |= previous
+    return deletions
@@ -1,7 +1,7 @@
 from collections import defaultdict
 from typing import Any, Protocol
 
-from twyn.trusted_packages.models import TyposquatCheckResultEntry
+from twyn.trusted_packages.models import TyposquatFinding
 
 OrderedPackages = defaultdict[str, set[str]]
 """Type alias for mapping package names by ecosystem."""
@@ -10,4 +10,6 @@ OrderedPackages = defaultdict[str, set[str]]
 class TrustedPackagesProtocol(Protocol):
     def __contains__(self, obj: Any) -> bool: ...
 
-    def get_typosquat(self, package_name: str) -> TyposquatCheckResultEntry: ...
+    def get_typosquat(self, package_name: str) -> TyposquatFinding: ...
+
+    def prepare(self) -> None: ...
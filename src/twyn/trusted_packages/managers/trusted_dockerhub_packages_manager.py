@@ -1,5 +1,7 @@
 import logging
 from collections import defaultdict
+from collections.abc import Iterable
+from functools import cached_property
 from typing import Any
 
 from twyn.similarity.algorithm import (
@@ -7,26 +9,37 @@ from twyn.similarity.algorithm import (
     SimilarityThreshold,
 )
 from twyn.trusted_packages.managers.base import OrderedPackages
-from twyn.trusted_packages.models import TyposquatCheckResultEntry
+from twyn.trusted_packages.models import TyposquatFinding
+from twyn.trusted_packages.references.base import NormalizedPackages
 from twyn.trusted_packages.selectors import AbstractSelector
+from twyn.trusted_packages.token_variants import get_token_variants, group_by_token_keys
 
 logger = logging.getLogger("twyn")
 
 
 class TrustedDockerHubPackageManager:
-    """Representation of namespaces that can be trusted."""
+    """Representation of namespaces that can be trusted.
+
+    Images are not scanned for combosquats even if `detect_combosquats` is set: images in other namespaces commonly
+    reuse the names of the trusted ones (`<user>/nginx`), which are already compared by namespace.
+    """
 
     def __init__(
         self,
-        names: set[str],
+        names: Iterable[str],
         algorithm: AbstractSimilarityAlgorithm,
         selector: AbstractSelector,
         threshold_class: type[SimilarityThreshold],
+        detect_combosquats: bool = False,
+        detect_token_variants: bool = False,
     ) -> None:
         self.namespaces = self._create_names_dictionary(names)
+        self.namespaces_by_image = self._create_image_index(self.namespaces)
+        self.detect_token_variants = detect_token_variants
 
         self.threshold_class = threshold_class
-        self.selector = selector
+        # A copy of its own, so whatever it precomputes for these names is freed along with the manager.
+        self.selector = selector.copy()
         self.algorithm = algorithm
 
     def __contains__(self, obj: Any) -> bool:
@@ -35,12 +48,22 @@ class TrustedDockerHubPackageManager:
             return obj in self.namespaces
         return False
 
-    def get_typosquat(self, package_name: str) -> TyposquatCheckResultEntry:
+    def prepare(self) -> None:
+        """Build the index of the token variants, if they are detected, before checking the first image.
+
+        The namespaces are compared without a selector, so there is no other index to build.
+        """
+        if self.detect_token_variants:
+            _ = self.names_by_token_key
+
+    def get_typosquat(self, package_name: str) -> TyposquatFinding:
         """Check if a given package name is similar to any trusted package and returns it.
 
-        Only if there is a match on the first letter can a package name be
-        considered similar to another one. The algorithm provided and the threshold
+        Only the namespaces that publish an image with the same name are compared with the namespace of the
+        package, regardless of their first letter. The algorithm provided and the threshold
         are used to determine if the package name can be considered similar.
+        If `detect_token_variants` is set, images made of the same tokens, reordered or with other separators, are
+        always similar.
         """
         if "/" not in package_name:
             logger.info(
@@ -52,22 +75,56 @@ class TrustedDockerHubPackageManager:
         registry_parts = package_name.split("/")
         namespace = "/".join(registry_parts[:-1])
         image_path = registry_parts[-1]
-        typosquat_result = TyposquatCheckResultEntry(dependency=package_name)
-        threshold = self.threshold_class.from_name(namespace)
-        for trusted_namespace_name in self.selector.select_similar_names(
-            names={"@": self.namespaces.keys()}, name=namespace
-        ):
-            distance = self.algorithm.get_distance(namespace, trusted_namespace_name)
+        typosquat_result = TyposquatFinding(dependency=package_name)
+        variants = get_token_variants(self.names_by_token_key, package_name) if self.detect_token_variants else set()
+        for trusted_package_name in sorted(variants):
+            typosquat_result.add(trusted_package_name)
 
-            if threshold.is_inside_threshold(distance) and image_path in self.namespaces[trusted_namespace_name]:
+        threshold = self.threshold_class.from_name(namespace)
+        candidates = [
+            candidate
+            for candidate in self.namespaces_by_image.get(image_path, [])
+            if f"{candidate}/{image_path}" not in variants
+        ]
+        distances = self.algorithm.get_distances(namespace, candidates, max_distance=threshold.max)
+        for trusted_namespace_name, distance in zip(candidates, distances, strict=True):
+            if threshold.is_inside_threshold(distance):
                 typosquat_result.add(f"{trusted_namespace_name}/{image_path}")
         return typosquat_result
 
-    def _create_names_dictionary(self, names: set[str]) -> OrderedPackages:
+    def _create_names_dictionary(self, names: Iterable[str]) -> OrderedPackages:
         """Create a dictionary which will group all packages that start with the same letter under the same key."""
-        namespaces: OrderedPackages = defaultdict(set)
+        if isinstance(names, NormalizedPackages):
+            # Already grouped when the reference was normalized or loaded from cache.
+            namespaces: OrderedPackages = defaultdict(set, names.namespaces or {})
+            if names.packages:
+                namespaces[""] = names.packages
+            return namespaces
+
+        namespaces = defaultdict(set)
         for name in names:
             registry = name.split("/")
             namespaces["/".join(registry[:-1])].add(registry[-1])
 
         return namespaces
+
+    @cached_property
+    def names_by_token_key(self) -> dict[str, set[str]]:
+        """Images grouped by their token keys, to find the ones made of the same tokens as an image with a lookup.
+
+        Only built once an image is checked with `detect_token_variants` set.
+        """
+        return group_by_token_keys(
+            f"{namespace}/{image}" if namespace else image
+            for namespace, images in self.namespaces.items()
+            for image in images
+        )
+
+    @staticmethod
+    def _create_image_index(namespaces: OrderedPackages) -> dict[str, list[str]]:
+        """Create a dictionary with the namespaces that publish each image, in the same order as `namespaces`."""
+        namespaces_by_image: dict[str, list[str]] = defaultdict(list)
+        for namespace, images in namespaces.items():
+            for image in images:
+                namespaces_by_image[image].append(namespace)
+        return dict(namespaces_by_image)
@@ -1,13 +1,20 @@
 from collections import defaultdict
+from collections.abc import Iterable
+from functools import cached_property
+from itertools import chain
 from typing import Any
 
 from twyn.similarity.algorithm import (
     AbstractSimilarityAlgorithm,
     SimilarityThreshold,
 )
+from twyn.similarity.confusables import get_skeleton, group_by_skeleton
+from twyn.trusted_packages.combosquats import CombosquatDetector
 from twyn.trusted_packages.managers.base import OrderedPackages
-from twyn.trusted_packages.models import TyposquatCheckResultEntry
+from twyn.trusted_packages.models import TyposquatFinding
+from twyn.trusted_packages.references.base import NormalizedPackages
 from twyn.trusted_packages.selectors import AbstractSelector
+from twyn.trusted_packages.token_variants import get_token_variants, group_by_token_keys
 
 
 class TrustedNpmPackageManager:
@@ -15,62 +22,154 @@ class TrustedNpmPackageManager:
 
     def __init__(
         self,
-        names: set[str],
+        names: Iterable[str],
         algorithm: AbstractSimilarityAlgorithm,
         selector: AbstractSelector,
         threshold_class: type[SimilarityThreshold],
+        detect_combosquats: bool = False,
+        detect_token_variants: bool = False,
     ) -> None:
-        self.packages, self.namespaces = self._create_names_dictionary(names)
+        self.packages, self.namespaces, self.namespaces_by_package = self._create_names_dictionary(names)
 
         self.threshold_class = threshold_class
-        self.selector = selector
+        # A copy of its own, so whatever it precomputes for these names is freed along with the manager.
+        self.selector = selector.copy()
         self.algorithm = algorithm
+        self.detect_token_variants = detect_token_variants
+        # Scoped packages commonly reuse the names of unscoped ones (`@types/react`), so only unscoped ones are checked.
+        self.combosquat_detector = (
+            CombosquatDetector.from_names(chain.from_iterable(self.packages.values())) if detect_combosquats else None
+        )
 
     def __contains__(self, obj: Any) -> bool:
         """Check if an object exists in the trusted namespaces."""
         if isinstance(obj, str):
-            return obj in self.packages[obj[0]] or obj in self.namespaces
+            return obj in self.packages.get(obj[0], ()) or obj in self.namespaces
         return False
 
-    def _create_names_dictionary(self, names: set[str]) -> tuple[OrderedPackages, OrderedPackages]:
-        """Create a dictionary which will group all packages that start with the same letter under the same key."""
-        first_letter_names: OrderedPackages = defaultdict(set)
-        namespaces: OrderedPackages = defaultdict(set)
-        for name in names:
-            if name.startswith("@"):
-                namespace, dependency = name.split("/")
-                namespaces[namespace].add(dependency)
-            else:
-                first_letter_names[name[0]].add(name)
-        return first_letter_names, namespaces
-
-    def _get_typosquats_from_namespace_dependency(self, package_name: str) -> TyposquatCheckResultEntry:
+    def prepare(self) -> None:
+        """Build the indexes used to check packages, if any, before checking the first one."""
+        self.selector.prepare(self.packages)
+        if self.algorithm.DETECTS_LOOKALIKES:
+            _ = self.packages_by_skeleton
+        if self.detect_token_variants:
+            _ = self.names_by_token_key
+
+    def _create_names_dictionary(
+        self, names: Iterable[str]
+    ) -> tuple[OrderedPackages, OrderedPackages, dict[str, list[str]]]:
+        """Create a dictionary which will group all packages that start with the same letter under the same key.
+
+        Scoped packages are grouped by scope instead, and indexed by their unscoped name as well, so the scopes that
+        contain a package can be found without going through all of them.
+        """
+        if isinstance(names, NormalizedPackages):
+            # Already grouped when the reference was normalized or loaded from cache.
+            first_letter_names = defaultdict(set, names.packages_by_first_letter)
+            namespaces: OrderedPackages = defaultdict(set, names.namespaces or {})
+        else:
+            first_letter_names = defaultdict(set)
+            namespaces = defaultdict(set)
+            for name in names:
+                if name.startswith("@"):
+                    namespace, dependency = name.split("/")
+                    namespaces[namespace].add(dependency)
+                else:
+                    first_letter_names[name[0]].add(name)
+
+        namespaces_by_package: dict[str, list[str]] = defaultdict(list)
+        for namespace, dependencies in namespaces.items():
+            for dependency in dependencies:
+                namespaces_by_package[dependency].append(namespace)
+        return first_letter_names, namespaces, dict(namespaces_by_package)
+
+    @cached_property
+    def packages_by_skeleton(self) -> dict[str, set[str]]:
+        """Unscoped packages grouped by their skeleton, to find the ones that look like a package with a lookup.
+
+        Only built once a package is checked with an algorithm that detects lookalikes. Scoped packages are only
+        compared with the scopes that contain the same package, which are few.
+        """
+        return group_by_skeleton(chain.from_iterable(self.packages.values()))
+
+    @cached_property
+    def names_by_token_key(self) -> dict[str, set[str]]:
+        """All the packages, scoped ones included, grouped by their token keys to find their variants with a lookup.
+
+        Only built once a package is checked with `detect_token_variants` set.
+        """
+        scoped_packages = (
+            f"{namespace}/{dependency}"
+            for namespace, dependencies in self.namespaces.items()
+            for dependency in dependencies
+        )
+        return group_by_token_keys(chain(chain.from_iterable(self.packages.values()), scoped_packages))
+
+    def _get_typosquats_from_namespace_dependency(self, package_name: str) -> TyposquatFinding:
         namespace, dependency = package_name.split("/")
         threshold = self.threshold_class.from_name(namespace)
-        typosquat_result = TyposquatCheckResultEntry(dependency=package_name)
-        for trusted_namespace_name in self.selector.select_similar_names(
-            names={"@": self.namespaces.keys()}, name=namespace
-        ):
-            distance = self.algorithm.get_distance(namespace, trusted_namespace_name)
-            if threshold.is_inside_threshold(distance) and dependency in self.namespaces[trusted_namespace_name]:
+        typosquat_result = TyposquatFinding(dependency=package_name)
+        variants = self._get_token_variants(package_name)
+        for trusted_package_name in sorted(variants):
+            typosquat_result.add(trusted_package_name)
+
+        # Only the scopes that contain the same package are compared, regardless of their first letter.
+        candidates = [
+            candidate
+            for candidate in self.namespaces_by_package.get(dependency, [])
+            if f"{candidate}/{dependency}" not in variants
+        ]
+        distances = self.algorithm.get_distances(namespace, candidates, max_distance=threshold.max)
+        for trusted_namespace_name, distance in zip(candidates, distances, strict=True):
+            if threshold.is_inside_threshold(distance):
                 typosquat_result.add(f"{trusted_namespace_name}/{dependency}")
         return typosquat_result
 
-    def _get_typosquats_from_dependency(self, package_name: str) -> TyposquatCheckResultEntry:
+    def _get_typosquats_from_dependency(self, package_name: str) -> TyposquatFinding:
         threshold = self.threshold_class.from_name(package_name)
-        typosquat_result = TyposquatCheckResultEntry(dependency=package_name)
-        for trusted_package_name in self.selector.select_similar_names(names=self.packages, name=package_name):
-            distance = self.algorithm.get_distance(package_name, trusted_package_name)
+        typosquat_result = TyposquatFinding(dependency=package_name)
+        lookalikes = self._get_lookalikes(package_name)
+        variants = self._get_token_variants(package_name) - lookalikes
+        for trusted_package_name in [*sorted(lookalikes), *sorted(variants)]:
+            typosquat_result.add(trusted_package_name)
+
+        candidates = [
+            candidate
+            for candidate in self.selector.select_similar_names(
+                names=self.packages, name=package_name, max_edits=self.algorithm.get_max_edits(threshold.max)
+            )
+            if candidate not in lookalikes and candidate not in variants
+        ]
+        distances = self.algorithm.get_distances(package_name, candidates, max_distance=threshold.max)
+        for trusted_package_name, distance in zip(candidates, distances, strict=True):
             if threshold.is_inside_threshold(distance):
                 typosquat_result.add(trusted_package_name)
+
+        if self.combosquat_detector:
+            for trusted_package_name in self.combosquat_detector.find(package_name):
+                typosquat_result.add_combosquat(trusted_package_name)
         return typosquat_result
 
-    def get_typosquat(self, package_name: str) -> TyposquatCheckResultEntry:
+    def _get_token_variants(self, package_name: str) -> set[str]:
+        """Return the trusted packages made of the same tokens as the given one, if they are detected."""
+        if not self.detect_token_variants:
+            return set()
+        return get_token_variants(self.names_by_token_key, package_name)
+
+    def _get_lookalikes(self, package_name: str) -> set[str]:
+        """Return the unscoped trusted packages that look like the given one, if the algorithm detects them."""
+        if not self.algorithm.DETECTS_LOOKALIKES:
+            return set()
+        return self.packages_by_skeleton.get(get_skeleton(package_name), set()) - {package_name}
+
+    def get_typosquat(self, package_name: str) -> TyposquatFinding:
         """Check if a given package name is similar to any trusted package and returns it.
 
         Only if there is a match on the first letter can a package name be
         considered similar to another one. The algorithm provided and the threshold
         are used to determine if the package name can be considered similar.
+        If `detect_token_variants` is set, packages made of the same tokens, reordered or with other separators, are
+        always similar.
         """
         if package_name.startswith("@"):
             return self._get_typosquats_from_namespace_dependency(package_name)
@@ -1,13 +1,20 @@
 from collections import defaultdict
+from collections.abc import Iterable
+from functools import cached_property
+from itertools import chain
 from typing import Any
 
 from twyn.similarity.algorithm import (
     AbstractSimilarityAlgorithm,
     SimilarityThreshold,
 )
+from twyn.similarity.confusables import get_skeleton, group_by_skeleton
+from twyn.trusted_packages.combosquats import CombosquatDetector
 from twyn.trusted_packages.managers.base import OrderedPackages
-from twyn.trusted_packages.models import TyposquatCheckResultEntry
+from twyn.trusted_packages.models import TyposquatFinding
+from twyn.trusted_packages.references.base import NormalizedPackages
 from twyn.trusted_packages.selectors import AbstractSelector
+from twyn.trusted_packages.token_variants import get_token_variants, group_by_token_keys
 
 
 class TrustedPackages:
@@ -15,41 +22,106 @@ class TrustedPackages:
 
     def __init__(
         self,
-        names: set[str],
+        names: Iterable[str],
         algorithm: AbstractSimilarityAlgorithm,
         selector: AbstractSelector,
         threshold_class: type[SimilarityThreshold],
+        detect_combosquats: bool = False,
+        detect_token_variants: bool = False,
     ) -> None:
         self.names = self._create_names_dictionary(names)
         self.threshold_class = threshold_class
-        self.selector = selector
+        # A copy of its own, so whatever it precomputes for these names is freed along with the manager.
+        self.selector = selector.copy()
         self.algorithm = algorithm
+        self.detect_token_variants = detect_token_variants
+        self.combosquat_detector = (
+            CombosquatDetector.from_names(chain.from_iterable(self.names.values())) if detect_combosquats else None
+        )
 
     def __contains__(self, obj: Any) -> bool:
         """Check if an object exists in the trusted packages."""
         if isinstance(obj, str):
-            return obj in self.names[obj[0]]
+            return obj in self.names.get(obj[0], ())
         return False
 
+    def prepare(self) -> None:
+        """Build the indexes used to check packages, if any, before checking the first one."""
+        self.selector.prepare(self.names)
+        if self.algorithm.DETECTS_LOOKALIKES:
+            _ = self.names_by_skeleton
+        if self.detect_token_variants:
+            _ = self.names_by_token_key
+
     @staticmethod
-    def _create_names_dictionary(names: set[str]) -> OrderedPackages:
+    def _create_names_dictionary(names: Iterable[str]) -> OrderedPackages:
         """Create a dictionary which will group all packages that start with the same letter under the same key."""
-        first_letter_names = defaultdict(set)
+        if isinstance(names, NormalizedPackages):
+            # Already grouped when the reference was normalized or loaded from cache.
+            return defaultdict(set, names.packages_by_first_letter)
+
+        first_letter_names: OrderedPackages = defaultdict(set)
         for name in names:
             first_letter_names[name[0]].add(name)
         return first_letter_names
 
-    def get_typosquat(self, package_name: str) -> TyposquatCheckResultEntry:
+    @cached_property
+    def names_by_skeleton(self) -> dict[str, set[str]]:
+        """Names grouped by their skeleton, to find the ones that look like a package with a single lookup.
+
+        Only built once a package is checked with an algorithm that detects lookalikes.
+        """
+        return group_by_skeleton(chain.from_iterable(self.names.values()))
+
+    @cached_property
+    def names_by_token_key(self) -> dict[str, set[str]]:
+        """Names grouped by their token keys, to find the ones made of the same tokens as a package with a lookup.
+
+        Only built once a package is checked with `detect_token_variants` set.
+        """
+        return group_by_token_keys(chain.from_iterable(self.names.values()))
+
+    def get_typosquat(self, package_name: str) -> TyposquatFinding:
         """Check if a given package name is similar to any trusted package and returns it.
 
         Only if there is a match on the first letter can a package name be
         considered similar to another one. The algorithm provided and the threshold
         are used to determine if the package name can be considered similar.
+        If `detect_token_variants` is set, packages made of the same tokens, reordered or with other separators, are
+        always similar.
         """
         threshold = self.threshold_class.from_name(package_name)
-        typosquat_result = TyposquatCheckResultEntry(dependency=package_name)
-        for trusted_package_name in self.selector.select_similar_names(names=self.names, name=package_name):
-            distance = self.algorithm.get_distance(package_name, trusted_package_name)
+        typosquat_result = TyposquatFinding(dependency=package_name)
+        lookalikes = self._get_lookalikes(package_name)
+        variants = self._get_token_variants(package_name) - lookalikes
+        for trusted_package_name in [*sorted(lookalikes), *sorted(variants)]:
+            typosquat_result.add(trusted_package_name)
+
+        candidates = [
+            candidate
+            for candidate in self.selector.select_similar_names(
+                names=self.names, name=package_name, max_edits=self.algorithm.get_max_edits(threshold.max)
+            )
+            if candidate not in lookalikes and candidate not in variants
+        ]
+        distances = self.algorithm.get_distances(package_name, candidates, max_distance=threshold.max)
+        for trusted_package_name, distance in zip(candidates, distances, strict=True):
             if threshold.is_inside_threshold(distance):
                 typosquat_result.add(trusted_package_name)
+
+        if self.combosquat_detector:
+            for trusted_package_name in self.combosquat_detector.find(package_name):
+                typosquat_result.add_combosquat(trusted_package_name)
         return typosquat_result
+
+    def _get_token_variants(self, package_name: str) -> set[str]:
+        """Return the trusted packages made of the same tokens as the given one, if they are detected."""
+        if not self.detect_token_variants:
+            return set()
+        return get_token_variants(self.names_by_token_key, package_name)
+
+    def _get_lookalikes(self, package_name: str) -> set[str]:
+        """Return the trusted packages that look like the given one, if the algorithm detects them."""
+        if not self.algorithm.DETECTS_LOOKALIKES:
+            return set()
+        return self.names_by_skeleton.get(get_skeleton(package_name), set()) - {package_name}
@@ -1,5 +1,9 @@
+from dataclasses import dataclass, field
+
 from pydantic import BaseModel
 
+from twyn.instrumentation.models import ProfilingReport
+
 
 class TyposquatCheckResultEntry(BaseModel):
     """Represents the result of analyzing a dependency for a possible typosquat."""
@@ -8,15 +12,55 @@ class TyposquatCheckResultEntry(BaseModel):
     """Name of the dependency being checked."""
     similars: list[str] = []
     """List of similar package names that might be typosquats."""
+    combosquats: list[str] = []
+    """List of trusted package names embedded in the dependency name, such as `requests` in `requests-toolkit`."""
 
     def __bool__(self) -> bool:
-        """Check if this result entry contains any similar packages."""
-        return bool(self.similars)
+        """Check if this result entry contains any similar or embedded packages."""
+        return bool(self.similars or self.combosquats)
 
     def add(self, similar_name: str) -> None:
         """Add a similar dependency to this typosquat check result."""
         self.similars.append(similar_name)
 
+    def add_combosquat(self, trusted_name: str) -> None:
+        """Add a trusted package whose name is embedded in the dependency to this typosquat check result."""
+        self.combosquats.append(trusted_name)
+
+
+@dataclass(slots=True)
+class TyposquatFinding:
+    """Trusted packages a dependency may be a typosquat of, found while checking it.
+
+    The trusted packages managers return one for every dependency they check, most of them empty, so it is a plain
+    record: `TyposquatCheckResultEntry` models are only built for the dependencies with findings, once reported.
+    """
+
+    dependency: str
+    """Name of the dependency being checked."""
+    similars: list[str] = field(default_factory=list)
+    """Trusted package names the dependency is similar to."""
+    combosquats: list[str] = field(default_factory=list)
+    """Trusted package names embedded in the dependency name."""
+
+    def __bool__(self) -> bool:
+        """Check if anything was found for the dependency."""
+        return bool(self.similars or self.combosquats)
+
+    def add(self, similar_name: str) -> None:
+        """Add a trusted package the dependency is similar to."""
+        self.similars.append(similar_name)
+
+    def add_combosquat(self, trusted_name: str) -> None:
+        """Add a trusted package whose name is embedded in the dependency."""
+        self.combosquats.append(trusted_name)
+
+    def to_result_entry(self) -> TyposquatCheckResultEntry:
+        """Return the result entry reporting this finding."""
+        return TyposquatCheckResultEntry(
+            dependency=self.dependency, similars=self.similars, combosquats=self.combosquats
+        )
+
 
 class TyposquatCheckResultFromSource(BaseModel):
     errors: list[TyposquatCheckResultEntry] = []
@@ -42,6 +86,8 @@ class TyposquatCheckResultFromSource(BaseModel):
 class TyposquatCheckResults(BaseModel):
     results: list[TyposquatCheckResultFromSource] = []
     """List of typosquat check results from different sources."""
+    profile: ProfilingReport | None = None
+    """Timings and counters of the check. Only set when profiling was requested."""
 
     def __bool__(self) -> bool:
         """Check if this result collection contains any results."""
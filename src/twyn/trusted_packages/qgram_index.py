@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import logging
+from collections import Counter, defaultdict
+from itertools import chain
+from typing import TYPE_CHECKING
+
+from twyn.instrumentation.profiler import stage
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+logger = logging.getLogger("twyn")
+
+_PADDING = "\x00"
+"""Character added around the names, so that their first and last characters are part of as many q-grams as the rest."""
+
+
+class QGramIndex:
+    """Inverted index from the q-grams (substrings of length `q`) of a set of names to the names that contain them.
+
+    An edit only changes the q-grams that overlap it: `q` of them for an insertion, deletion or substitution, and
+    `q + 1` for a transposition. So a name within `k` edits (Damerau-Levenshtein) of another one shares all of its
+    q-grams but `k * (q + 1)` at most (the count filter). Looking a name up only counts the q-grams it shares with the
+    names that contain any of them, instead of computing the distance to all the names.
+
+    Lookups may return names that are further away, so they still need to be verified with a similarity algorithm.
+    """
+
+    Q = 3
+    """Length of the indexed substrings. Longer ones are rarer, but fewer of them survive an edit."""
+
+    def __init__(self, names: Iterable[str], q: int = Q) -> None:
+        self.q = q
+        self.names = sorted(set(names))
+        self.name_ids_by_qgram: dict[str, list[int]] = defaultdict(list)
+        self.name_ids_by_length: dict[int, list[int]] = defaultdict(list)
+        for name_id, name in enumerate(self.names):
+            for qgram in self._get_qgrams(name):
+                self.name_ids_by_qgram[qgram].append(name_id)
+            self.name_ids_by_length[len(name)].append(name_id)
+
+    @classmethod
+    def from_names(cls, names: Iterable[str], q: int = Q) -> QGramIndex:
+        """Build the index for the given names."""
+        with stage("build_index"):
+            index = cls(names, q)
+        logger.debug("Built %d-gram index with %d entries", index.q, len(index.name_ids_by_qgram))
+        return index
+
+    def lookup(self, name: str, max_distance: int) -> list[str]:
+        """Return the names that pass the count and length filters for the given distance, in alphabetical order."""
+        qgrams = self._get_qgrams(name)
+        min_shared_qgrams = len(qgrams) - max_distance * (self.q + 1)
+        lengths = range(len(name) - max_distance, len(name) + max_distance + 1)
+        if min_shared_qgrams <= 0:
+            # Too many edits for the name to share any q-gram, only the length of the names can be filtered.
+            name_ids = sorted(chain.from_iterable(self.name_ids_by_length.get(length, ()) for length in lengths))
+            return [self.names[name_id] for name_id in name_ids]
+
+        shared_qgrams = Counter(chain.from_iterable(self.name_ids_by_qgram.get(qgram, ()) for qgram in qgrams))
+        return [
+            self.names[name_id]
+            for name_id, count in sorted(shared_qgrams.items())
+            if count >= min_shared_qgrams and len(self.names[name_id]) in lengths
+        ]
+
+    def _get_qgrams(self, name: str) -> set[str]:
+        """Return the distinct q-grams of a name, once padded."""
+        padding = _PADDING * (self.q - 1)
+        padded_name = f"{padding}{name}{padding}"
+        return {padded_name[start : start + self.q] for start in range(len(padded_name) - self.q + 1)}
@@ -1,18 +1,27 @@
+from __future__ import annotations
+
 import logging
 from abc import abstractmethod
-from collections.abc import Iterator
+from collections import defaultdict
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import requests
 
+from twyn.base import json_codec
+from twyn.instrumentation.profiler import increment, stage
 from twyn.trusted_packages.cache_handler import CacheEntry, CacheHandler
 from twyn.trusted_packages.exceptions import (
     EmptyPackagesListError,
     InvalidJSONError,
 )
 
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from twyn.trusted_packages.managers.base import OrderedPackages
+
 logger = logging.getLogger("twyn")
 
 
@@ -21,6 +30,7 @@ class NormalizedPackages:
     packages: set[str]
     namespaces: dict[str, set[str]] | None = None
     _raw_namespaces: set[str] = field(default_factory=set)
+    _packages_by_first_letter: OrderedPackages | None = field(default=None, repr=False, compare=False)
 
     def __post__init__(self) -> None:
         if self.namespaces:
@@ -44,6 +54,36 @@ class NormalizedPackages:
 
         return value in self.packages or value in self._raw_namespaces
 
+    @property
+    def packages_by_first_letter(self) -> OrderedPackages:
+        """Return the non-namespaced packages grouped by their first letter.
+
+        The grouping is computed once and reused, as it is the structure the trusted packages managers work with.
+        """
+        if self._packages_by_first_letter is None:
+            packages_by_first_letter: OrderedPackages = defaultdict(set)
+            for package in self.packages:
+                packages_by_first_letter[package[0]].add(package)
+            self._packages_by_first_letter = packages_by_first_letter
+        return self._packages_by_first_letter
+
+    @classmethod
+    def from_cache_entry(cls, entry: CacheEntry) -> NormalizedPackages:
+        """Build the normalized packages from a cache entry, without normalizing or grouping them again."""
+        return cls(
+            packages=set().union(*entry.packages.values()),
+            namespaces=entry.namespaces or None,
+            _packages_by_first_letter=defaultdict(set, entry.packages),
+        )
+
+    def to_cache_entry(self, saved_date: str) -> CacheEntry:
+        """Return a cache entry storing the packages in their normalized and grouped form."""
+        return CacheEntry(
+            saved_date=saved_date,
+            packages=dict(self.packages_by_first_letter),
+            namespaces=self.namespaces or {},
+        )
+
 
 class AbstractPackageReference:
     """Represents a reference from where to retrieve trusted packages.
@@ -72,47 +112,70 @@ class AbstractPackageReference:
         response.raise_for_status()
 
         try:
-            return response.json()
-        except requests.exceptions.JSONDecodeError as err:
+            return json_codec.loads(response.content)
+        except json_codec.JSONDecodeError as err:
             raise InvalidJSONError from err
 
-    def _save_trusted_packages_to_cache_if_enabled(self, packages: set[str]) -> None:
-        """Save trusted packages using CacheHandler."""
+    def _save_trusted_packages_to_cache_if_enabled(self, packages: NormalizedPackages) -> None:
+        """Save the normalized trusted packages using CacheHandler."""
         if not self.cache_handler:
             return
-        cache_entry = CacheEntry(saved_date=datetime.now().date().isoformat(), packages=packages)
+        cache_entry = packages.to_cache_entry(saved_date=datetime.now().date().isoformat())
         self.cache_handler.write_entry(self.source, cache_entry)
-        logger.debug("Saved %d trusted packages for source %s", len(packages), self.source)
+        logger.debug("Saved trusted packages for source %s", self.source)
 
-    def _get_packages_from_cache_if_enabled(self) -> set[str]:
-        """Get packages from cache if it's present and up to date."""
+    def _get_packages_from_cache_if_enabled(self) -> NormalizedPackages | None:
+        """Get the already normalized packages from cache if it's present and up to date."""
         if not self.cache_handler:
-            return set()
+            return None
         cache_entry = self.cache_handler.get_cache_entry(self.source)
-        if not cache_entry:
+        if not cache_entry or not (cache_entry.packages or cache_entry.namespaces):
             logger.debug("No cache entry found for source: %s", self.source)
-            return set()
+            return None
 
-        return cache_entry.packages
+        return NormalizedPackages.from_cache_entry(cache_entry)
 
     def get_packages(self) -> NormalizedPackages:
-        """Download and parse online source of top packages from the package ecosystem."""
-        packages = self._get_packages_from_cache_if_enabled()
-        # we don't save the cache here, we keep it as it is so the date remains the original one.
+        """Download and parse online source of top packages from the package ecosystem.
+
+        Cached packages are stored already normalized, so a cache hit does not need any further processing.
+        """
+        with stage("fetch", source=self.source):
+            normalized_packages = self._get_packages_from_cache_if_enabled()
+            # we don't save the cache here, we keep it as it is so the date remains the original one.
+            if normalized_packages is not None:
+                increment("cache_hits")
+                return normalized_packages
+
+            if not self.cache_handler:
+                return self._download_packages()
+
+            # Only one process at a time refreshes the cache entry, the rest wait for it and reuse its result.
+            with self.cache_handler.lock(self.source):
+                normalized_packages = self._get_packages_from_cache_if_enabled()
+                if normalized_packages is None:
+                    increment("cache_misses")
+                    normalized_packages = self._download_packages()
+                    # New packages were downloaded, we create a new entry updating all values.
+                    self._save_trusted_packages_to_cache_if_enabled(normalized_packages)
+                else:
+                    increment("cache_hits")
+
+            return normalized_packages
+
+    def _download_packages(self) -> NormalizedPackages:
+        """Download the trusted packages from the source and normalize them."""
+        # no cache usage, no cache hit (non-existent or outdated) or cache was empty.
+        logger.info("Fetching trusted packages from trusted packages reference...")
+        data = self._download()
+        try:
+            packages = set(data["packages"])
+        except KeyError as err:
+            raise InvalidJSONError("`packages` key not in JSON.") from err
+
+        logger.debug("Successfully downloaded trusted packages list from %s", self.source)
         if not packages:
-            # no cache usage, no cache hit (non-existent or outdated) or cache was empty.
-            logger.info("Fetching trusted packages from trusted packages reference...")
-            data = self._download()
-            try:
-                packages = set(data["packages"])
-            except KeyError as err:
-                raise InvalidJSONError("`packages` key not in JSON.") from err
-
-            logger.debug("Successfully downloaded trusted packages list from %s", self.source)
-            if not packages:
-                raise EmptyPackagesListError
-
-            # New packages were downloaded, we create a new entry updating all values.
-            self._save_trusted_packages_to_cache_if_enabled(packages)
-
-        return self.normalize_packages(packages)
+            raise EmptyPackagesListError
+
+        with stage("normalize"):
+            return self.normalize_packages(packages)
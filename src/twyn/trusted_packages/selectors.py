@@ -1,24 +1,54 @@
 from __future__ import annotations
 
 import logging
+import threading
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING
+from itertools import chain
+from typing import TYPE_CHECKING, Any, Generic, TypeVar
 
+from typing_extensions import Self
+
+from twyn.similarity.algorithm import SimilarityThreshold
 from twyn.trusted_packages.constants import ADJACENCY_MATRIX
+from twyn.trusted_packages.deletion_index import DeletionIndex
 from twyn.trusted_packages.exceptions import CharacterNotInMatrixError
+from twyn.trusted_packages.qgram_index import QGramIndex
+from twyn.trusted_packages.trie import NameTrie
 
 if TYPE_CHECKING:
     from collections.abc import Iterable
 
+    from twyn.trusted_packages.cache_handler import CacheHandler
     from twyn.trusted_packages.managers.trusted_pypi_packages_manager import OrderedPackages
 
 logger = logging.getLogger("twyn")
 
+IndexT = TypeVar("IndexT")
+
 
 class AbstractSelector(ABC):
+    def __init__(self, cache_handler: CacheHandler | None = None) -> None:
+        # Selectors that precompute an index of the trusted names can store it in the cache.
+        self.cache_handler = cache_handler
+
     @abstractmethod
-    def select_similar_names(self, names: OrderedPackages, name: str) -> Iterable[str]:
-        """Override this to select names that are similar to the provided one."""
+    def select_similar_names(self, names: OrderedPackages, name: str, max_edits: int | None = None) -> Iterable[str]:
+        """Override this to select names that are similar to the provided one.
+
+        Names more than `max_edits` edits away from it may be left out. It defaults to the maximum threshold for the
+        name, while the trusted packages managers pass the one of their algorithm (see `get_max_edits`).
+        """
+
+    def copy(self) -> Self:
+        """Return a new selector with the same settings and nothing precomputed.
+
+        Each trusted packages manager selects names with a copy of its own, so whatever the selector precomputes for
+        the names of a manager is freed along with it.
+        """
+        return type(self)(self.cache_handler)
+
+    def prepare(self, names: OrderedPackages) -> None:  # noqa: B027
+        """Precompute whatever is needed to select names among the given ones. Most selectors need nothing."""
 
     def __str__(self) -> str:
         """Return the class name as string representation."""
@@ -28,7 +58,7 @@ class AbstractSelector(ABC):
 class FirstLetterNearbyInKeyboard(AbstractSelector):
     """Selects names that start with a letter that is nearby in an English Keyboard."""
 
-    def select_similar_names(self, names: OrderedPackages, name: str) -> Iterable[str]:
+    def select_similar_names(self, names: OrderedPackages, name: str, max_edits: int | None = None) -> Iterable[str]:
         """Select package names with first letters nearby on keyboard."""
         candidate_characters = self._get_candidate_characters(name[0])
         for letter in candidate_characters:
@@ -46,15 +76,123 @@ class FirstLetterNearbyInKeyboard(AbstractSelector):
 class FirstLetterExact(AbstractSelector):
     """Selects names that share the same first letter."""
 
-    def select_similar_names(self, names: OrderedPackages, name: str) -> Iterable[str]:
+    def select_similar_names(self, names: OrderedPackages, name: str, max_edits: int | None = None) -> Iterable[str]:
         """Select package names that start with the same letter."""
-        yield from names[name[0]]
+        # `get`, as indexing the `defaultdict` would add a key while other threads may be iterating over it.
+        yield from names.get(name[0], ())
 
 
 class AllSimilar(AbstractSelector):
     """Consider all names to be similar."""
 
-    def select_similar_names(self, names: OrderedPackages, name: str) -> Iterable[str]:
+    def select_similar_names(self, names: OrderedPackages, name: str, max_edits: int | None = None) -> Iterable[str]:
         """Return all available package names as candidates."""
-        for candidates in names:
-            yield from names[candidates]
+        for candidates in names.values():
+            yield from candidates
+
+
+class AbstractIndexedSelector(AbstractSelector, Generic[IndexT]):
+    """Selector that precomputes an index of the names it is given, to look up names in it.
+
+    Only the index of the last names is kept, as each trusted packages manager has a selector of its own (see `copy`).
+    The index is pickled along with the selector, so worker processes do not build it again.
+    """
+
+    def __init__(self, cache_handler: CacheHandler | None = None) -> None:
+        super().__init__(cache_handler)
+        self._indexed_names: tuple[OrderedPackages, IndexT] | None = None
+        """Last names given to the selector, with their index."""
+        # Selectors may be shared by threads (e.g. in a `TwynEngine`), which should not build the same index twice.
+        self._index_lock = threading.Lock()
+
+    def __getstate__(self) -> dict[str, Any]:
+        """Drop the lock when pickling the selector, e.g. to send it to worker processes."""
+        state = self.__dict__.copy()
+        del state["_index_lock"]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        """Restore a pickled selector with a new lock."""
+        self.__dict__.update(state)
+        self._index_lock = threading.Lock()
+
+    def prepare(self, names: OrderedPackages) -> None:
+        """Build the index of the given names, unless it is already built."""
+        self._get_index(names)
+
+    @abstractmethod
+    def _build_index(self, names: OrderedPackages) -> IndexT:
+        """Override this to build the index of the given names."""
+
+    def _get_index(self, names: OrderedPackages) -> IndexT:
+        """Return the index of the given names, building it unless they are the last ones the selector was given."""
+        if (indexed_names := self._indexed_names) and indexed_names[0] is names:
+            return indexed_names[1]
+
+        with self._index_lock:
+            if (indexed_names := self._indexed_names) and indexed_names[0] is names:
+                return indexed_names[1]
+
+            index = self._build_index(names)
+            self._indexed_names = (names, index)
+            return index
+
+
+class DeletionNeighbourhood(AbstractIndexedSelector[DeletionIndex]):
+    """Selects names that may be within the maximum edit distance, using a precomputed deletion index.
+
+    The index of every set of names is built once and stored in the cache, so each lookup takes a handful of hash
+    probes instead of comparing the name against all of them.
+    """
+
+    def select_similar_names(self, names: OrderedPackages, name: str, max_edits: int | None = None) -> Iterable[str]:
+        """Return the names that share a deletion with the provided one.
+
+        Names are only indexed for up to `DeletionIndex.MAX_DISTANCE` edits, so all of them are returned beyond that.
+        """
+        index = self._get_index(names)
+        if max_edits is not None and max_edits > index.MAX_DISTANCE:
+            return index.names
+        return index.lookup(name)
+
+    def _build_index(self, names: OrderedPackages) -> DeletionIndex:
+        """Build the deletion index of all the names, or load it from the cache."""
+        return DeletionIndex.from_names(chain.from_iterable(names.values()), self.cache_handler)
+
+
+class TrieNeighbourhood(AbstractIndexedSelector[NameTrie]):
+    """Selects names that are within the maximum edit distance, walking a trie of all the names.
+
+    Names that share a prefix share the computation of their distance to that prefix, and the names under a prefix
+    that is already too far away are never visited. Only the names within the threshold of the provided one are
+    selected, so the similarity algorithm is only run on actual matches.
+    """
+
+    def select_similar_names(self, names: OrderedPackages, name: str, max_edits: int | None = None) -> Iterable[str]:
+        """Return the names within `max_edits` edits of the provided one."""
+        return self._get_index(names).lookup(name, _get_max_edits(name, max_edits))
+
+    def _build_index(self, names: OrderedPackages) -> NameTrie:
+        """Build the trie of all the names."""
+        return NameTrie.from_names(chain.from_iterable(names.values()))
+
+
+class QGramNeighbourhood(AbstractIndexedSelector[QGramIndex]):
+    """Selects names that may be within the maximum edit distance, using an inverted index of their q-grams.
+
+    Only the names that share enough q-grams with the provided one to be within the maximum threshold are selected,
+    so the similarity algorithm is run on a few candidates instead of all the names.
+    """
+
+    def select_similar_names(self, names: OrderedPackages, name: str, max_edits: int | None = None) -> Iterable[str]:
+        """Return the names that share enough q-grams with the provided one to be within `max_edits` edits."""
+        return self._get_index(names).lookup(name, _get_max_edits(name, max_edits))
+
+    def _build_index(self, names: OrderedPackages) -> QGramIndex:
+        """Build the q-gram index of all the names."""
+        return QGramIndex.from_names(chain.from_iterable(names.values()))
+
+
+def _get_max_edits(name: str, max_edits: int | None) -> int:
+    """Return the given maximum number of edits, or the maximum threshold for the name if there is none."""
+    return int(SimilarityThreshold.from_name(name).max) if max_edits is None else max_edits
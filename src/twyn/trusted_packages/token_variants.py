@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import re
+from collections import defaultdict
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+TOKEN_SEPARATORS = "-_."
+"""Characters that separate the tokens of a name. `/` is not one of them, as it separates namespaces from names."""
+
+_TOKEN_SEPARATORS_PATTERN = re.compile(f"[{re.escape(TOKEN_SEPARATORS)}]+")
+
+
+def get_token_keys(name: str) -> set[str]:
+    """Return the keys of a name that stay the same when its tokens are reordered or its separators dropped.
+
+    There are two of them: the name with its tokens sorted (`dateutil-python` for `python-dateutil`), and the name
+    without separators (`pythondateutil`). Tokens are only sorted within each part of a namespaced name, so
+    `@types/node` and `node/@types` are not variants of each other.
+    A key without separators is both kinds at once, so both kinds can be stored in the same index.
+    """
+    parts = name.split("/")
+    sorted_tokens = "/".join("-".join(sorted(_TOKEN_SEPARATORS_PATTERN.split(part))) for part in parts)
+    without_separators = "/".join(_TOKEN_SEPARATORS_PATTERN.sub("", part) for part in parts)
+    return {sorted_tokens, without_separators}
+
+
+def group_by_token_keys(names: Iterable[str]) -> dict[str, set[str]]:
+    """Group names by their token keys, so the variants of a given one can be found with a couple of lookups."""
+    names_by_token_key: defaultdict[str, set[str]] = defaultdict(set)
+    for name in names:
+        for key in get_token_keys(name):
+            names_by_token_key[key].add(name)
+    return dict(names_by_token_key)
+
+
+def get_token_variants(names_by_token_key: dict[str, set[str]], name: str) -> set[str]:
+    """Return the names in the index that are made of the same tokens as the given one, other than itself."""
+    variants: set[str] = set()
+    for key in get_token_keys(name):
+        variants |= names_by_token_key.get(key, set())
+    variants.discard(name)
+    return variants
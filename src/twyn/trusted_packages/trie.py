@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING
+
+from twyn.instrumentation.profiler import stage
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+logger = logging.getLogger("twyn")
+
+_UNREACHABLE = 1 << 30
+"""Distance used for the border cells of the distance matrix, which can never be part of an alignment."""
+
+
+class _TrieNode:
+    """Node of a `NameTrie`, reached by the characters of a prefix shared by some of the names."""
+
+    __slots__ = ("children", "name")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _TrieNode] = {}
+        self.name: str | None = None
+
+
+class NameTrie:
+    """Trie over a set of names, that finds the ones within a number of edits of a given name.
+
+    Distances are Damerau-Levenshtein distances, the same ones computed by `EditDistance`. They are computed by
+    walking the trie with the Lowrance-Wagner algorithm: every node adds a row to the distance matrix, so names that
+    share a prefix also share the rows of that prefix. Whole subtrees are skipped as soon as every cell of a row is
+    above the maximum distance, as their names can only be further away.
+    """
+
+    def __init__(self, names: Iterable[str]) -> None:
+        self.root = _TrieNode()
+        self.size = 0
+        for name in sorted(set(names)):
+            self._insert(name)
+
+    @classmethod
+    def from_names(cls, names: Iterable[str]) -> NameTrie:
+        """Build the trie for the given names."""
+        with stage("build_index"):
+            trie = cls(names)
+        logger.debug("Built trie for %d names", trie.size)
+        return trie
+
+    def _insert(self, name: str) -> None:
+        """Add a name to the trie."""
+        node = self.root
+        for character in name:
+            node = node.children.setdefault(character, _TrieNode())
+        node.name = name
+        self.size += 1
+
+    def lookup(self, name: str, max_distance: int) -> list[str]:
+        """Return the names that are at most `max_distance` edits away from the given one, in alphabetical order."""
+        # Rows are shifted by one row and one column, to fit the border of the matrix used by transpositions.
+        # Cells that are too far away are capped at `max_distance + 1`, which is enough to discard them.
+        too_far = max_distance + 1
+        rows = [
+            [_UNREACHABLE] * (len(name) + 2),
+            [_UNREACHABLE, *(min(column, too_far) for column in range(len(name) + 1))],
+        ]
+        matches: list[str] = []
+        self._walk(self.root, name, max_distance, rows, {}, matches)
+        return matches
+
+    def _walk(
+        self,
+        node: _TrieNode,
+        name: str,
+        max_distance: int,
+        rows: list[list[int]],
+        last_row_by_character: dict[str, int],
+        matches: list[str],
+    ) -> None:
+        """Add a row to the distance matrix for each child of a node, collecting the names within the distance.
+
+        A cell is at least as far as the difference between the lengths of the prefixes, so only the cells within
+        `max_distance` of the diagonal are computed. The rest are left at `max_distance + 1`.
+        """
+        too_far = max_distance + 1
+        row_index = len(rows) - 1
+        previous = rows[-1]
+        first_column = max(1, row_index - max_distance)
+        last_column = min(len(name), row_index + max_distance)
+        for character, child in node.children.items():
+            row = [too_far] * (len(name) + 2)
+            row[0] = _UNREACHABLE
+            row[1] = min(row_index, too_far)
+            # Columns before the band can only matter for transpositions, which are too far away from it.
+            last_matching_column = 0
+            for column in range(first_column, last_column + 1):
+                name_character = name[column - 1]
+                transposition_column = last_matching_column
+                if character == name_character:
+                    distance = previous[column]
+                    last_matching_column = column
+                else:
+                    distance = previous[column] + 1
+                distance = min(distance, row[column] + 1, previous[column + 1] + 1)
+                if transposition_column and (last_matching_row := last_row_by_character.get(name_character)):
+                    distance = min(
+                        distance,
+                        rows[last_matching_row][transposition_column]
+                        + (row_index - last_matching_row)
+                        + (column - transposition_column - 1),
+                    )
+                row[column + 1] = min(distance, too_far)
+
+            if child.name is not None and row[-1] <= max_distance:
+                matches.append(child.name)
+            # The border cell is unreachable, so it never lowers the minimum.
+            if min(row) > max_distance:
+                continue
+
+            rows.append(row)
+            previous_last_row = last_row_by_character.get(character)
+            last_row_by_character[character] = row_index
+            self._walk(child, name, max_distance, rows, last_row_by_character, matches)
+            rows.pop()
+            if previous_last_row is None:
+                del last_row_by_character[character]
+            else:
+                last_row_by_character[character] = previous_last_row
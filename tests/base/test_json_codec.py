@@ -0,0 +1,57 @@
+from collections.abc import Iterator
+from unittest.mock import patch
+
+import pytest
+from pydantic import BaseModel, ValidationError
+from twyn.base import json_codec
+
+
+class Package(BaseModel):
+    name: str
+    version: str | None = None
+
+
+@pytest.fixture(params=[True, False], ids=["orjson", "stdlib"])
+def orjson_installed(request: pytest.FixtureRequest) -> Iterator[bool]:
+    if request.param and not json_codec.ORJSON_INSTALLED:
+        pytest.skip("orjson is not installed")
+    with patch("twyn.base.json_codec.ORJSON_INSTALLED", request.param):
+        yield request.param
+
+
+class TestJsonCodec:
+    @pytest.mark.usefixtures("orjson_installed")
+    @pytest.mark.parametrize(
+        "data",
+        [
+            '{"packages": ["requests", "numpy"], "count": 2}',
+            b'{"packages": ["requests", "numpy"], "count": 2}',
+            bytearray(b'{"packages": ["requests", "numpy"], "count": 2}'),
+            memoryview(b'{"packages": ["requests", "numpy"], "count": 2}'),
+        ],
+    )
+    def test_loads(self, data: str | bytes | bytearray | memoryview) -> None:
+        assert json_codec.loads(data) == {"packages": ["requests", "numpy"], "count": 2}
+
+    @pytest.mark.usefixtures("orjson_installed")
+    def test_loads_utf8_bytes(self) -> None:
+        assert json_codec.loads('{"name": "pаckage"}'.encode()) == {"name": "pаckage"}  # noqa: RUF001
+
+    @pytest.mark.usefixtures("orjson_installed")
+    @pytest.mark.parametrize("data", ["not json", b'{"packages": [', b""])
+    def test_loads_invalid_json(self, data: str | bytes) -> None:
+        with pytest.raises(json_codec.JSONDecodeError):
+            json_codec.loads(data)
+
+    def test_loads_model(self) -> None:
+        assert json_codec.loads_model(Package, b'{"name": "requests"}') == Package(name="requests")
+
+    def test_loads_model_invalid(self) -> None:
+        with pytest.raises(ValidationError):
+            json_codec.loads_model(Package, b'{"version": "1.0.0"}')
+
+    def test_dumps_model(self) -> None:
+        model = Package(name="requests")
+
+        assert json_codec.dumps_model(model) == '{"name":"requests","version":null}'
+        assert json_codec.dumps_model(model, indent=2, exclude_none=True) == '{\n  "name": "requests"\n}'
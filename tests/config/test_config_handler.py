@@ -1,6 +1,7 @@
 import dataclasses
 from copy import deepcopy
 from pathlib import Path
+from typing import Any
 from unittest.mock import Mock, patch
 
 import pytest
@@ -15,7 +16,9 @@ from twyn.config.exceptions import (
     AllowlistPackageAlreadyExistsError,
     AllowlistPackageDoesNotExistError,
     ConfigFileNotConfiguredError,
+    InvalidJobsError,
     InvalidSelectorMethodError,
+    InvalidSimilarityAlgorithmError,
     TOMLError,
 )
 from twyn.file_handler.exceptions import PathNotFoundError
@@ -41,8 +44,21 @@ class TestConfigHandler:
             package_ecosystem=None,
             recursive=False,
             dockerhub_source=None,
+            cache_dir=None,
+            similarity_algorithm="edit-distance",
+            jobs=1,
+            detect_combosquats=False,
+            detect_token_variants=False,
         )
 
+    def test_cache_dir_priorities(self, tmp_path: Path) -> None:
+        config_file = tmp_path / "twyn.toml"
+        with create_tmp_file(config_file, '[tool.twyn]\ncache_dir="/from/config"\n'):
+            handler = ConfigHandler(FileHandler(str(config_file)))
+
+            assert handler.resolve_config().cache_dir == "/from/config"
+            assert handler.resolve_config(cache_dir="/from/cli").cache_dir == "/from/cli"
+
     def test_config_raises_for_unknown_file(self) -> None:
         with pytest.raises(TOMLError):
             ConfigHandler(FileHandler("non-existent-file.toml")).resolve_config()
@@ -102,6 +118,10 @@ class TestConfigHandler:
                     "selector_method": "all",
                     "use_cache": False,
                     "recursive": False,
+                    "similarity_algorithm": "edit-distance",
+                    "jobs": 1,
+                    "detect_combosquats": False,
+                    "detect_token_variants": False,
                 },
             }
         }
@@ -216,7 +236,9 @@ class TestAllowlistConfigHandler:
 
         assert not mock_write_toml.called
 
-    @pytest.mark.parametrize("valid_selector", ["first-letter", "nearby-letter", "all"])
+    @pytest.mark.parametrize(
+        "valid_selector", ["first-letter", "nearby-letter", "all", "deletion-index", "trie", "q-gram"]
+    )
     def test_valid_selector_methods_accepted(self, valid_selector: str, pyproject_toml_file: Path) -> None:
         """Test that all valid selector methods are accepted."""
         config = ConfigHandler(FileHandler(str(pyproject_toml_file)))
@@ -234,7 +256,7 @@ class TestAllowlistConfigHandler:
 
         error_message = str(exc_info.value)
         assert "Invalid selector_method 'random-selector'" in error_message
-        assert "Must be one of: all, first-letter, nearby-letter" in error_message
+        assert "Must be one of: all, deletion-index, first-letter, nearby-letter, q-gram, trie" in error_message
 
     def test_invalid_selector_method_from_config_file(self, tmp_path: Path) -> None:
         """Test that invalid selector method from config file is rejected."""
@@ -253,7 +275,55 @@ class TestAllowlistConfigHandler:
 
         error_message = str(exc_info.value)
         assert "Invalid selector_method 'invalid-selector'" in error_message
-        assert "Must be one of: all, first-letter, nearby-letter" in error_message
+        assert "Must be one of: all, deletion-index, first-letter, nearby-letter, q-gram, trie" in error_message
+
+    def test_similarity_algorithm_priorities(self, tmp_path: Path) -> None:
+        config_file = tmp_path / "twyn.toml"
+        with create_tmp_file(config_file, '[tool.twyn]\nsimilarity_algorithm="keyboard-distance"\n'):
+            handler = ConfigHandler(FileHandler(str(config_file)))
+
+            assert handler.resolve_config().similarity_algorithm == "keyboard-distance"
+            assert handler.resolve_config(similarity_algorithm="edit-distance").similarity_algorithm == "edit-distance"
+
+    def test_jobs_priorities(self, tmp_path: Path) -> None:
+        config_file = tmp_path / "twyn.toml"
+        with create_tmp_file(config_file, "[tool.twyn]\njobs=4\n"):
+            handler = ConfigHandler(FileHandler(str(config_file)))
+
+            assert handler.resolve_config().jobs == 4
+            assert handler.resolve_config(jobs=2).jobs == 2
+        assert ConfigHandler().resolve_config().jobs == 1
+
+    def test_detect_combosquats_priorities(self, tmp_path: Path) -> None:
+        config_file = tmp_path / "twyn.toml"
+        with create_tmp_file(config_file, "[tool.twyn]\ndetect_combosquats=true\n"):
+            handler = ConfigHandler(FileHandler(str(config_file)))
+
+            assert handler.resolve_config().detect_combosquats is True
+            assert handler.resolve_config(detect_combosquats=False).detect_combosquats is False
+        assert ConfigHandler().resolve_config().detect_combosquats is False
+
+    def test_detect_token_variants_priorities(self, tmp_path: Path) -> None:
+        config_file = tmp_path / "twyn.toml"
+        with create_tmp_file(config_file, "[tool.twyn]\ndetect_token_variants=true\n"):
+            handler = ConfigHandler(FileHandler(str(config_file)))
+
+            assert handler.resolve_config().detect_token_variants is True
+            assert handler.resolve_config(detect_token_variants=False).detect_token_variants is False
+        assert ConfigHandler().resolve_config().detect_token_variants is False
+
+    @pytest.mark.parametrize("jobs", [0, -1, True, "4"])
+    def test_invalid_jobs_rejected(self, jobs: Any) -> None:
+        with pytest.raises(InvalidJobsError, match="Must be a positive integer"):
+            ConfigHandler().resolve_config(jobs=jobs)
+
+    def test_invalid_similarity_algorithm_rejected(self) -> None:
+        with pytest.raises(InvalidSimilarityAlgorithmError) as exc_info:
+            ConfigHandler().resolve_config(similarity_algorithm="hamming")
+
+        error_message = str(exc_info.value)
+        assert "Invalid similarity_algorithm 'hamming'" in error_message
+        assert "Must be one of: confusable-distance, edit-distance, keyboard-distance" in error_message
 
     def test_load_single_dependency_file(self, tmp_path: Path) -> None:
         pyproject_toml = tmp_path / "pyproject.toml"
@@ -6,6 +6,15 @@ from typing import Any
 from unittest import mock
 
 import pytest
+from twyn.instrumentation.hooks import InstrumentationHook
+
+
+@pytest.fixture(autouse=True)
+def isolated_user_cache_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Point the default cache directory to a temporary one, so tests never touch the user's cache."""
+    cache_home = tmp_path / "xdg-cache"
+    monkeypatch.setenv("XDG_CACHE_HOME", str(cache_home))
+    return cache_home
 
 
 @contextmanager
@@ -15,6 +24,30 @@ def create_tmp_file(path: Path, data: str) -> Iterator[Path]:
     yield path
 
 
+class RecordingHook(InstrumentationHook):
+    """Hook that keeps every span and counter it receives."""
+
+    def __init__(self) -> None:
+        self.events: list[tuple[str, ...]] = []
+        self.spans: list[tuple[str, dict[str, Any]]] = []
+        self.counters: dict[str, int] = {}
+
+    @contextmanager
+    def span(self, name: str, attributes: dict[str, Any]) -> Iterator[None]:
+        self.spans.append((name, attributes))
+        self.events.append(("start", name))
+        try:
+            yield
+        except Exception as e:
+            self.events.append(("error", name, type(e).__name__))
+            raise
+        finally:
+            self.events.append(("end", name))
+
+    def add(self, counter: str, amount: int) -> None:
+        self.counters[counter] = self.counters.get(counter, 0) + amount
+
+
 @contextmanager
 def patch_pypi_packages_download(packages: list[str]) -> Iterator[mock.Mock]:
     """Patcher of `requests.get` for Top PyPi list.
@@ -1,3 +1,7 @@
+import io
+import os
+import stat
+from collections.abc import Callable
 from pathlib import Path
 from unittest.mock import Mock, patch
 
@@ -10,36 +14,33 @@ from twyn.dependency_parser import (
     RequirementsTxtParser,
     UvLockParser,
 )
-from twyn.dependency_parser.parsers.abstract_parser import AbstractParser
+from twyn.dependency_parser.parsers.abstract_parser import AbstractParser, DependencyContent
 from twyn.dependency_parser.parsers.dockerfile_parser import DockerfileParser
+from twyn.dependency_parser.parsers.exceptions import InvalidFileFormatError
 from twyn.dependency_parser.parsers.yarn_lock_parser import YarnLockParser
 
+from tests.conftest import create_tmp_file
+
+
+def _stat_result(mode: int, size: int) -> os.stat_result:
+    return os.stat_result((mode, 0, 0, 1, 0, 0, size, 0, 0, 0))
+
 
 class TestAbstractParser:
     class TemporaryParser(AbstractParser):
         """Subclass of AbstractParser to test methods."""
 
-        def parse(self) -> set[str]:
-            self._read()
+        def parse_content(self, content: DependencyContent) -> set[str]:
             return set()
 
-    @patch("pathlib.Path.stat")
-    @patch("pathlib.Path.exists")
-    @patch("pathlib.Path.is_file")
-    def test_file_exists(self, mock_is_file: Mock, mock_exists: Mock, mock_stat: Mock) -> None:
-        mock_exists.return_value = True
-        mock_is_file.return_value = True
-
-        mock_stat_result = Mock()
-        mock_stat_result.st_size = 100
-        mock_stat.return_value = mock_stat_result
+    @patch("twyn.file_handler.file_handler.os.stat")
+    def test_file_exists(self, mock_stat: Mock) -> None:
+        mock_stat.return_value = _stat_result(mode=stat.S_IFREG, size=100)
 
         parser = self.TemporaryParser("fake_path.txt")
         assert parser.file_exists() is True
 
-    @patch("pathlib.Path.stat")
-    @patch("pathlib.Path.exists")
-    @patch("pathlib.Path.is_file")
+    @patch("twyn.file_handler.file_handler.os.stat")
     @pytest.mark.parametrize(
         ("file_exists", "is_file", "file_size"),
         [
@@ -48,24 +49,87 @@ class TestAbstractParser:
             (True, True, 0),
         ],
     )
-    def test_raise_for_valid_file(
+    def test_raise_for_valid_file(self, mock_stat: Mock, file_exists: bool, is_file: bool, file_size: int) -> None:
+        if file_exists:
+            mock_stat.return_value = _stat_result(mode=stat.S_IFREG if is_file else stat.S_IFDIR, size=file_size)
+        else:
+            mock_stat.side_effect = FileNotFoundError
+
+        parser = self.TemporaryParser("fake_path.txt")
+        assert parser.file_exists() is False
+
+    @pytest.mark.parametrize(
+        ("parser_class", "fixture_name"),
+        [
+            (RequirementsTxtParser, "requirements_txt_file"),
+            (PoetryLockParser, "poetry_lock_file_ge_1_5"),
+            (UvLockParser, "uv_lock_file"),
+            (PackageLockJsonParser, "package_lock_json_file_v3"),
+            (YarnLockParser, "yarn_lock_file_v1"),
+            (YarnLockParser, "yarn_lock_file_v2"),
+            (PnpmLockParser, "pnpm_lock_file_v9"),
+            (DockerfileParser, "dockerfile"),
+            (DockerComposeParser, "docker_compose_file"),
+        ],
+    )
+    @pytest.mark.parametrize(
+        "to_content",
+        [
+            str,
+            str.encode,
+            lambda text: memoryview(text.encode()),
+            io.StringIO,
+            lambda text: io.BytesIO(text.encode()),
+        ],
+        ids=["str", "bytes", "memoryview", "text-io", "bytes-io"],
+    )
+    def test_parse_content(
         self,
-        mock_is_file: Mock,
-        mock_exists: Mock,
-        mock_stat: Mock,
-        file_exists: bool,
-        is_file: bool,
-        file_size: int,
+        parser_class: type[AbstractParser],
+        fixture_name: str,
+        to_content: Callable[[str], DependencyContent],
+        request: pytest.FixtureRequest,
     ) -> None:
-        mock_exists.return_value = file_exists
-        mock_is_file.return_value = is_file
+        """Check that parsing the content of a file gives the same dependencies as parsing the file itself."""
+        file_path = request.getfixturevalue(fixture_name)
+        parsed_file = parser_class(file_path).parse()
 
-        mock_stat_result = Mock()
-        mock_stat_result.st_size = file_size
-        mock_stat.return_value = mock_stat_result
+        assert parsed_file
+        assert parser_class().parse_content(to_content(file_path.read_text())) == parsed_file
 
-        parser = self.TemporaryParser("fake_path.txt")
-        assert parser.file_exists() is False
+    @pytest.mark.parametrize(
+        ("parser_class", "fixture_name"),
+        [
+            (RequirementsTxtParser, "requirements_txt_file"),
+            (PoetryLockParser, "poetry_lock_file_ge_1_5"),
+            (UvLockParser, "uv_lock_file"),
+            (PackageLockJsonParser, "package_lock_json_file_v3"),
+            (YarnLockParser, "yarn_lock_file_v1"),
+            (PnpmLockParser, "pnpm_lock_file_v9"),
+            (DockerfileParser, "dockerfile"),
+            (DockerComposeParser, "docker_compose_file"),
+        ],
+    )
+    def test_parse_reads_through_file_handler(
+        self, parser_class: type[AbstractParser], fixture_name: str, request: pytest.FixtureRequest
+    ) -> None:
+        """Check that parsers reuse the content their file handler already read."""
+        parser = parser_class(request.getfixturevalue(fixture_name))
+        parser.file_handler.read()
+
+        with patch.object(Path, "open", side_effect=AssertionError("file read again")):
+            assert parser.parse()
+
+    @pytest.mark.parametrize(
+        "parser_class",
+        [RequirementsTxtParser, UvLockParser, PackageLockJsonParser, YarnLockParser, PnpmLockParser, DockerfileParser],
+    )
+    @pytest.mark.parametrize("to_content", [bytes, memoryview, io.BytesIO], ids=["bytes", "memoryview", "bytes-io"])
+    def test_parse_content_that_is_not_utf8(
+        self, parser_class: type[AbstractParser], to_content: Callable[[bytes], DependencyContent]
+    ) -> None:
+        with pytest.raises(InvalidFileFormatError):
+            parser_class().parse_content(to_content(b"\xff\xfe\x00requests"))
 
 
 class TestRequirementsTxtParser:
@@ -73,6 +137,25 @@ class TestRequirementsTxtParser:
         parser = RequirementsTxtParser(file_path=requirements_txt_file)
         assert parser.parse() == {"South", "pycrypto", "Flask", "django", "requests", "urllib3"}
 
+    def test_parse_requirements_txt_file_with_includes(self, tmp_path: Path) -> None:
+        with (
+            create_tmp_file(tmp_path / "requirements" / "base.txt", "requests\n-r ../requirements.txt\n"),
+            create_tmp_file(tmp_path / "requirements.txt", "django\n-r requirements/base.txt\n-r missing.txt\n"),
+        ):
+            parser = RequirementsTxtParser(file_path=str(tmp_path / "requirements.txt"))
+
+            assert parser.parse() == {"django", "requests"}
+
+    def test_parse_content_does_not_read_included_files(self, tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+        with create_tmp_file(tmp_path / "secret.txt", "private-package\n") as secret_file:
+            parser = RequirementsTxtParser(file_path=str(tmp_path / "requirements.txt"))
+
+            with caplog.at_level("WARNING"):
+                parsed = parser.parse_content(f"flask\n-r {secret_file}\n-r secret.txt\n")
+
+        assert parsed == {"flask"}
+        assert len([message for message in caplog.messages if "Not reading" in message]) == 2
+
 
 class TestLockParser:
     def test_parse_poetry_lock_file_lt_1_5(self, poetry_lock_file_lt_1_5: Path) -> None:
@@ -119,6 +202,13 @@ class TestPackageLockJsonParser:
         assert "debug" in result
         assert "test-project" not in result
 
+    def test_parse_invalid_package_lock_json_file(self, tmp_path: Path) -> None:
+        with create_tmp_file(tmp_path / "package-lock.json", '{"lockfileVersion": 3, "packages": {'):
+            parser = PackageLockJsonParser(file_path=str(tmp_path / "package-lock.json"))
+
+            with pytest.raises(InvalidFileFormatError, match="Invalid JSON format"):
+                parser.parse()
+
 
 class TestYarnLockParser:
     def test_parse_yarn_lock_v1(self, yarn_lock_file_v1: Path) -> None:
@@ -155,6 +245,10 @@ class TestPnpmLockParser:
         assert "test-project" not in result
         assert "my-workspace" not in result
 
+    def test_parse_invalid_pnpm_lock(self) -> None:
+        with pytest.raises(InvalidFileFormatError, match="Invalid YAML format"):
+            PnpmLockParser().parse_content("lockfileVersion: '9.0'\npackages: [\n")
+
 
 class TestDockerfileParser:
     def test_dockefile_parser(self, dockerfile: Path) -> None:
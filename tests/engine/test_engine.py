@@ -0,0 +1,259 @@
+import asyncio
+import gc
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+from twyn.engine import TwynEngine
+from twyn.trusted_packages.exceptions import InvalidArgumentsError
+from twyn.trusted_packages.models import (
+    TyposquatCheckResultEntry,
+    TyposquatCheckResultFromSource,
+    TyposquatCheckResults,
+)
+from twyn.trusted_packages.references.base import NormalizedPackages
+
+
+class TestTwynEngine:
+    @patch("twyn.trusted_packages.TopPyPiReference.get_packages")
+    def test_check_loads_trusted_packages_once(self, mock_get_packages: Mock) -> None:
+        mock_get_packages.return_value = NormalizedPackages(packages={"requests", "numpy"})
+        engine = TwynEngine()
+
+        first = engine.check({"reqests", "numpy"}, "pypi")
+        second = engine.check(["nunpy"], "pypi")
+
+        assert mock_get_packages.call_count == 1
+        assert first == TyposquatCheckResults(
+            results=[
+                TyposquatCheckResultFromSource(
+                    errors=[TyposquatCheckResultEntry(dependency="reqests", similars=["requests"])],
+                    source="manual_input",
+                )
+            ]
+        )
+        assert second.results[0].errors == [TyposquatCheckResultEntry(dependency="nunpy", similars=["numpy"])]
+
+    @patch("twyn.trusted_packages.TopPyPiReference.get_packages")
+    def test_check_without_typos(self, mock_get_packages: Mock) -> None:
+        mock_get_packages.return_value = NormalizedPackages(packages={"requests"})
+
+        assert TwynEngine().check({"requests"}, "pypi") == TyposquatCheckResults()
+
+    def test_check_invalid_ecosystem(self) -> None:
+        with pytest.raises(InvalidArgumentsError):
+            TwynEngine().check({"requests"}, "cargo")
+
+    @patch("twyn.trusted_packages.TopPyPiReference.get_packages")
+    def test_check_files(self, mock_get_packages: Mock, uv_lock_file_with_typo: Path) -> None:
+        mock_get_packages.return_value = NormalizedPackages(packages={"requests"})
+        engine = TwynEngine()
+
+        results = engine.check_files([str(uv_lock_file_with_typo)])
+        engine.check_files([str(uv_lock_file_with_typo)])
+
+        assert mock_get_packages.call_count == 1
+        assert results == TyposquatCheckResults(
+            results=[
+                TyposquatCheckResultFromSource(
+                    errors=[TyposquatCheckResultEntry(dependency="reqests", similars=["requests"])],
+                    source=str(uv_lock_file_with_typo),
+                )
+            ]
+        )
+
+    @patch("twyn.trusted_packages.TopPyPiReference.get_packages")
+    def test_check_file_contents(self, mock_get_packages: Mock) -> None:
+        mock_get_packages.return_value = NormalizedPackages(packages={"requests", "numpy"})
+
+        results = TwynEngine(use_cache=False).check_file_contents(
+            {
+                "backend/requirements.txt": "reqests==2.0.0\nnumpy\n",
+                "worker/requirements.txt": "nunpy\n",
+                "docs/requirements.txt": "requests\n",
+            }
+        )
+
+        assert sorted(results.results, key=lambda result: result.source) == [
+            TyposquatCheckResultFromSource(
+                errors=[TyposquatCheckResultEntry(dependency="reqests", similars=["requests"])],
+                source="backend/requirements.txt",
+            ),
+            TyposquatCheckResultFromSource(
+                errors=[TyposquatCheckResultEntry(dependency="nunpy", similars=["numpy"])],
+                source="worker/requirements.txt",
+            ),
+        ]
+
+    @patch("twyn.trusted_packages.TopNpmReference.get_packages")
+    @patch("twyn.trusted_packages.TopPyPiReference.get_packages")
+    def test_check_file_contents_skips_files_that_cannot_be_parsed(
+        self, mock_pypi_packages: Mock, mock_npm_packages: Mock, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        mock_pypi_packages.return_value = NormalizedPackages(packages={"requests"})
+        mock_npm_packages.return_value = NormalizedPackages(packages={"react"})
+
+        with caplog.at_level("WARNING"):
+            results = TwynEngine(use_cache=False).check_file_contents(
+                {
+                    "requirements.txt": b"\xff\xfe\x00reqests\n",
+                    "package-lock.json": b"\xff\xfe\x00{}",
+                    "pnpm-lock.yaml": "packages: [\n",
+                    "backend/requirements.txt": "reqests\n",
+                }
+            )
+
+        assert results == TyposquatCheckResults(
+            results=[
+                TyposquatCheckResultFromSource(
+                    errors=[TyposquatCheckResultEntry(dependency="reqests", similars=["requests"])],
+                    source="backend/requirements.txt",
+                )
+            ]
+        )
+        assert len([message for message in caplog.messages if "Could not parse" in message]) == 3
+
+    @patch("twyn.trusted_packages.TopPyPiReference.get_packages")
+    def test_check_file_contents_does_not_read_included_files(self, mock_get_packages: Mock, tmp_path: Path) -> None:
+        mock_get_packages.return_value = NormalizedPackages(packages={"requests"})
+        secret_file = tmp_path / "secret.txt"
+        secret_file.write_text("reqests\n")
+
+        results = TwynEngine(use_cache=False).check_file_contents({"requirements.txt": f"-r {secret_file}\n"})
+
+        assert results == TyposquatCheckResults()
+
+    @patch("twyn.trusted_packages.TopPyPiReference.get_packages")
+    def test_concurrent_checks_load_trusted_packages_once(self, mock_get_packages: Mock) -> None:
+        def slow_get_packages() -> NormalizedPackages:
+            time.sleep(0.05)
+            return NormalizedPackages(packages={"requests"})
+
+        mock_get_packages.side_effect = slow_get_packages
+        engine = TwynEngine(selector_method="deletion-index", use_cache=False)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda _: engine.check({"reqests"}, "pypi"), range(16)))
+
+        assert mock_get_packages.call_count == 1
+        assert all(result.results[0].errors[0].similars == ["requests"] for result in results)
+
+    @pytest.mark.parametrize(
+        ("ecosystem", "dependency", "first_letter_names"),
+        [("pypi", "7reqests", "names"), ("npm", "@types/reqests", "packages")],
+    )
+    @patch("twyn.trusted_packages.TopNpmReference.get_packages")
+    @patch("twyn.trusted_packages.TopPyPiReference.get_packages")
+    def test_concurrent_checks_do_not_change_trusted_packages(
+        self,
+        mock_pypi_packages: Mock,
+        mock_npm_packages: Mock,
+        ecosystem: str,
+        dependency: str,
+        first_letter_names: str,
+    ) -> None:
+        """Check that dependencies whose first character has no trusted packages do not add it to them.
+
+        Other threads may be going through the same trusted packages with the `all` selector at the same time.
+        """
+        names = {f"{letter}package{number}" for letter in "abcdefghijklmnopqrstuvwxyz" for number in range(100)}
+        mock_pypi_packages.return_value = NormalizedPackages(packages=names)
+        mock_npm_packages.return_value = NormalizedPackages(packages=names)
+        engine = TwynEngine(selector_method="all", use_cache=False)
+        trusted_packages = engine.get_ecosystem(ecosystem).trusted_packages
+        first_letters = set(getattr(trusted_packages, first_letter_names))
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda _: engine.check({dependency, "apackage1x"}, ecosystem), range(64)))
+
+        assert set(getattr(trusted_packages, first_letter_names)) == first_letters
+        assert all(result.results[0].get_typosquats() == {"apackage1x"} for result in results)
+
+    @patch("twyn.trusted_packages.TopPyPiReference.get_packages")
+    def test_concurrent_async_checks_share_trusted_packages(
+        self, mock_get_packages: Mock, uv_lock_file_with_typo: Path
+    ) -> None:
+        def slow_get_packages() -> NormalizedPackages:
+            time.sleep(0.05)
+            return NormalizedPackages(packages={"requests", "numpy"})
+
+        mock_get_packages.side_effect = slow_get_packages
+        engine = TwynEngine(use_cache=False)
+
+        async def run() -> tuple[TyposquatCheckResults, TyposquatCheckResults, TyposquatCheckResults]:
+            return await asyncio.gather(
+                engine.check_async({"reqests"}, "pypi"),
+                engine.check_async({"nunpy"}, "pypi"),
+                engine.check_files_async([str(uv_lock_file_with_typo)]),
+            )
+
+        names_result, other_names_result, files_result = asyncio.run(run())
+
+        assert mock_get_packages.call_count == 1
+        assert names_result.results[0].errors == [
+            TyposquatCheckResultEntry(dependency="reqests", similars=["requests"])
+        ]
+        assert other_names_result.results[0].errors == [
+            TyposquatCheckResultEntry(dependency="nunpy", similars=["numpy"])
+        ]
+        assert files_result.results[0].source == str(uv_lock_file_with_typo)
+
+    @patch("twyn.trusted_packages.TopPyPiReference.get_packages")
+    def test_refresh_in_background_once_expired(self, mock_get_packages: Mock) -> None:
+        mock_get_packages.return_value = NormalizedPackages(packages={"requests"})
+        engine = TwynEngine(refresh_interval=0)
+        assert engine.check({"nunpy"}, "pypi") == TyposquatCheckResults()
+
+        mock_get_packages.return_value = NormalizedPackages(packages={"numpy"})
+        # The expired packages are still used while they are reloaded.
+        assert engine.check({"nunpy"}, "pypi") == TyposquatCheckResults()
+        engine._refresh_threads["pypi"].join()
+
+        engine.refresh_interval = 60
+        assert mock_get_packages.call_count == 2
+        assert engine.check({"nunpy"}, "pypi").results[0].errors[0].similars == ["numpy"]
+
+    @patch("twyn.trusted_packages.TopPyPiReference.get_packages")
+    def test_failed_refresh_keeps_previous_packages(self, mock_get_packages: Mock) -> None:
+        mock_get_packages.return_value = NormalizedPackages(packages={"requests"})
+        engine = TwynEngine(refresh_interval=0)
+        engine.load("pypi")
+        previous = engine._ecosystems["pypi"]
+
+        mock_get_packages.side_effect = ConnectionError
+        assert engine.get_ecosystem("pypi") is previous
+        engine._refresh_threads["pypi"].join()
+
+        refreshed = engine._ecosystems["pypi"]
+        assert refreshed.trusted_packages is previous.trusted_packages
+        assert refreshed.loaded_at > previous.loaded_at
+
+    @patch("twyn.trusted_packages.TopPyPiReference.get_packages")
+    def test_refresh(self, mock_get_packages: Mock) -> None:
+        mock_get_packages.return_value = NormalizedPackages(packages={"requests"})
+        engine = TwynEngine()
+        engine.load("pypi")
+
+        mock_get_packages.return_value = NormalizedPackages(packages={"numpy"})
+        engine.refresh()
+
+        assert mock_get_packages.call_count == 2
+        assert engine.check({"nunpy"}, "pypi").results[0].errors[0].similars == ["numpy"]
+
+    @patch("twyn.trusted_packages.TopPyPiReference.get_packages")
+    def test_refresh_frees_the_previous_selector_index(self, mock_get_packages: Mock) -> None:
+        mock_get_packages.return_value = NormalizedPackages(packages={"requests"})
+        engine = TwynEngine(selector_method="q-gram")
+        engine.check({"reqests"}, "pypi")
+        previous_selector = weakref.ref(engine.get_ecosystem("pypi").trusted_packages.selector)
+
+        for _ in range(5):
+            engine.refresh()
+            engine.check({"reqests"}, "pypi")
+        gc.collect()
+
+        assert previous_selector() is None
+        assert engine.selector_method._indexed_names is None
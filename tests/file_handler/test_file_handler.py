@@ -1,8 +1,10 @@
+import os
 from pathlib import Path
-from unittest.mock import Mock, patch
+from unittest.mock import patch
 
 import pytest
-from twyn.file_handler.exceptions import PathIsNotFileError
+from tests.conftest import create_tmp_file
+from twyn.file_handler.exceptions import EmptyFileError, PathIsNotFileError, PathNotFoundError
 from twyn.file_handler.file_handler import FileHandler
 
 
@@ -24,17 +26,39 @@ class TestFileHandler:
         with pytest.raises(PathIsNotFileError):
             parser.read()
 
-    @patch("pathlib.Path.exists")
-    @patch("pathlib.Path.is_file")
     @pytest.mark.parametrize(
-        ("file_exists", "is_file"),
-        [(False, False), (True, False)],
+        ("file_name", "expected_exception"),
+        [("missing.txt", PathNotFoundError), ("directory", PathIsNotFileError), ("empty.txt", EmptyFileError)],
     )
-    def test_raise_for_valid_file(
-        self, mock_is_file: Mock, mock_exists: Mock, file_exists: bool, is_file: bool
-    ) -> None:
-        mock_exists.return_value = file_exists
-        mock_is_file.return_value = is_file
+    def test_raise_for_valid_file(self, tmp_path: Path, file_name: str, expected_exception: type[Exception]) -> None:
+        (tmp_path / "directory").mkdir()
+        (tmp_path / "empty.txt").touch()
 
-        parser = FileHandler("fake.txt")
+        parser = FileHandler(str(tmp_path / file_name))
         assert parser.exists() is False
+        with pytest.raises(expected_exception):
+            parser.read()
+
+    def test_file_is_checked_and_read_once(self, tmp_path: Path) -> None:
+        with create_tmp_file(tmp_path / "requirements.txt", "requests\n") as file_path:
+            handler = FileHandler(str(file_path))
+
+            with (
+                patch("twyn.file_handler.file_handler.os.stat", wraps=os.stat) as mock_stat,
+                patch.object(Path, "read_text", autospec=True, side_effect=Path.read_text) as mock_read_text,
+            ):
+                assert handler.exists() is True
+                assert handler.read() == "requests\n"
+                assert handler.read() == "requests\n"
+
+            assert mock_stat.call_count == 1
+            assert mock_read_text.call_count == 1
+
+    def test_write_discards_previous_state(self, tmp_path: Path) -> None:
+        handler = FileHandler(str(tmp_path / "file.txt"))
+        assert handler.exists() is False
+
+        handler.write("new content", atomic=True)
+
+        assert handler.exists() is True
+        assert handler.read() == "new content"
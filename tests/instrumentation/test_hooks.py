@@ -0,0 +1,50 @@
+import pytest
+from twyn.instrumentation.hooks import (
+    get_hooks,
+    register_hook,
+    unregister_hook,
+    use_hook,
+)
+from twyn.instrumentation.profiler import increment, stage
+
+from tests.conftest import RecordingHook
+
+
+class TestHooks:
+    def test_register_and_unregister_hook(self) -> None:
+        hook = RecordingHook()
+        register_hook(hook)
+        register_hook(hook)
+        assert get_hooks() == (hook,)
+
+        unregister_hook(hook)
+        unregister_hook(hook)
+        assert get_hooks() == ()
+
+    def test_stages_and_counters_are_sent_to_the_hooks(self) -> None:
+        with use_hook(RecordingHook()) as hook:
+            with stage("fetch", source="https://example.com"), stage("normalize"):
+                increment("cache_misses")
+            increment("cache_misses", 2)
+
+        assert get_hooks() == ()
+        assert hook.spans == [("fetch", {"source": "https://example.com"}), ("normalize", {})]
+        assert hook.events == [("start", "fetch"), ("start", "normalize"), ("end", "normalize"), ("end", "fetch")]
+        assert hook.counters == {"cache_misses": 3}
+
+    def test_exceptions_are_propagated_through_the_spans(self) -> None:
+        with use_hook(RecordingHook()) as hook, pytest.raises(ValueError, match="boom"), stage("parse"):
+            raise ValueError("boom")
+
+        assert hook.events == [("start", "parse"), ("error", "parse", "ValueError"), ("end", "parse")]
+
+    def test_nothing_is_sent_to_unregistered_hooks(self) -> None:
+        hook = RecordingHook()
+        with use_hook(hook):
+            pass
+
+        with stage("match"):
+            increment("dependencies_checked")
+
+        assert hook.spans == []
+        assert hook.counters == {}
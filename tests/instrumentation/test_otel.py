@@ -0,0 +1,56 @@
+from unittest.mock import Mock, patch
+
+import pytest
+from twyn.instrumentation.exceptions import InstrumentationDependencyNotInstalledError
+from twyn.instrumentation.hooks import use_hook
+from twyn.main import check_dependencies
+
+pytest.importorskip("opentelemetry.sdk")
+
+from opentelemetry.sdk.metrics import MeterProvider  # noqa: E402
+from opentelemetry.sdk.metrics.export import InMemoryMetricReader, NumberDataPoint  # noqa: E402
+from opentelemetry.sdk.trace import TracerProvider  # noqa: E402
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor  # noqa: E402
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter  # noqa: E402
+from twyn.instrumentation.otel import OpenTelemetryHook  # noqa: E402
+
+
+class TestOpenTelemetryHook:
+    @patch("twyn.trusted_packages.TopPyPiReference._get_packages_from_cache_if_enabled")
+    def test_check_dependencies_is_traced(self, mock_get_packages_from_cache: Mock) -> None:
+        mock_get_packages_from_cache.return_value = {"requests", "numpy"}
+        exporter = InMemorySpanExporter()
+        tracer_provider = TracerProvider()
+        tracer_provider.add_span_processor(SimpleSpanProcessor(exporter))
+        metric_reader = InMemoryMetricReader()
+        hook = OpenTelemetryHook(tracer_provider, MeterProvider(metric_readers=[metric_reader]))
+
+        with (
+            use_hook(hook),
+            tracer_provider.get_tracer("test").start_as_current_span("scan") as parent_span,
+        ):
+            check_dependencies(dependencies={"reqests", "flask"}, package_ecosystem="pypi")
+
+        spans = {span.name: span for span in exporter.get_finished_spans()}
+        assert set(spans) == {"scan", "twyn.fetch", "twyn.build_index", "twyn.normalize", "twyn.match"}
+        match_parent = spans["twyn.match"].parent
+        assert match_parent is not None
+        assert match_parent.span_id == parent_span.get_span_context().span_id
+        assert spans["twyn.match"].attributes == {"dependencies": 2}
+
+        metrics_data = metric_reader.get_metrics_data()
+        assert metrics_data is not None
+        metrics = {
+            metric.name: sum(point.value for point in metric.data.data_points if isinstance(point, NumberDataPoint))
+            for resource_metrics in metrics_data.resource_metrics
+            for scope_metrics in resource_metrics.scope_metrics
+            for metric in scope_metrics.metrics
+        }
+        assert metrics == {"twyn.cache_hits": 1, "twyn.dependencies_checked": 2, "twyn.distance_computations": 4}
+
+    def test_opentelemetry_not_installed(self) -> None:
+        with (
+            patch("twyn.instrumentation.otel.OPENTELEMETRY_INSTALLED", new=False),
+            pytest.raises(InstrumentationDependencyNotInstalledError),
+        ):
+            OpenTelemetryHook()
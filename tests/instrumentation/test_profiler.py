@@ -0,0 +1,57 @@
+from unittest.mock import patch
+
+from twyn.instrumentation.profiler import Profiler, get_active_profiler, increment, profiling, stage
+
+
+class TestProfiler:
+    def test_nested_stages_are_only_accounted_to_the_innermost_one(self) -> None:
+        profiler = Profiler()
+        with (
+            patch("twyn.instrumentation.profiler.time.perf_counter", side_effect=[0.0, 1.0, 3.0, 6.0]),
+            profiler.stage("fetch"),
+            profiler.stage("normalize"),
+        ):
+            pass
+
+        assert profiler.stages == {"normalize": 2.0, "fetch": 4.0}
+
+    def test_stage_times_are_accumulated(self) -> None:
+        profiler = Profiler()
+        with patch("twyn.instrumentation.profiler.time.perf_counter", side_effect=[0.0, 1.5, 2.0, 2.5]):
+            with profiler.stage("parse"):
+                pass
+            with profiler.stage("parse"):
+                pass
+
+        assert profiler.stages == {"parse": 2.0}
+
+    def test_counters(self) -> None:
+        profiler = Profiler()
+        profiler.increment("cache_hits")
+        profiler.increment("distance_computations", 10)
+        profiler.increment("distance_computations", 5)
+
+        report = profiler.to_report()
+
+        assert report.counters == {"cache_hits": 1, "distance_computations": 15}
+        assert report.total_seconds >= 0
+
+    def test_module_functions_use_the_active_profiler(self) -> None:
+        profiler = Profiler()
+        with profiling(profiler):
+            assert get_active_profiler() is profiler
+            increment("files_found", 2)
+            with stage("discovery"):
+                pass
+
+        assert get_active_profiler() is None
+        assert profiler.counters == {"files_found": 2}
+        assert set(profiler.stages) == {"discovery"}
+
+    def test_module_functions_do_nothing_without_profiler(self) -> None:
+        with profiling(None):
+            increment("files_found")
+            with stage("discovery"):
+                pass
+
+        assert get_active_profiler() is None
@@ -1,4 +1,5 @@
 import json
+import pstats
 from pathlib import Path
 from unittest.mock import Mock, call, patch
 
@@ -6,6 +7,7 @@ import pytest
 from click.testing import CliRunner
 from twyn import cli
 from twyn.base.exceptions import TwynError
+from twyn.instrumentation.models import ProfilingReport
 from twyn.trusted_packages.cache_handler import CacheEntry, CacheHandler
 from twyn.trusted_packages.models import (
     TyposquatCheckResultEntry,
@@ -22,7 +24,7 @@ class TestCli:
         sources = ["https://pypi.org/simple/", "https://registry.npmjs.org/", "https://example.com/packages/"]
 
         for source in sources:
-            entry = CacheEntry(saved_date="2025-01-01", packages={"package1", "package2"})
+            entry = CacheEntry(saved_date="2025-01-01", packages={"p": {"package1", "package2"}})
             cache_handler.write_entry(source, entry)
 
         # Verify cache files exist
@@ -31,8 +33,7 @@ class TestCli:
         assert len(cache_files) == 3
 
         runner = CliRunner()
-        with patch("twyn.cli.CACHE_DIR", tmp_path):
-            result = runner.invoke(cli.cache.commands["clear"])
+        result = runner.invoke(cli.cache.commands["clear"], ["--cache-dir", str(tmp_path)])
 
         assert result.exit_code == 0
 
@@ -40,6 +41,99 @@ class TestCli:
         cache_files = list(tmp_path.glob("*.json"))
         assert len(cache_files) == 0
 
+    def test_cache_stats_shows_entries(self, tmp_path: Path) -> None:
+        cache_handler = CacheHandler(str(tmp_path))
+        cache_handler.write_entry("https://pypi.org/simple/", CacheEntry(saved_date="2025-01-01", packages={}))
+
+        runner = CliRunner()
+        result = runner.invoke(cli.cache.commands["stats"], ["--cache-dir", str(tmp_path)])
+
+        assert result.exit_code == 0
+        assert "https://pypi.org/simple/" in result.output
+        assert "1 entries" in result.output
+
+    @patch("twyn.cli.check_dependencies")
+    def test_cache_dir_option(self, mock_check_dependencies: Mock) -> None:
+        runner = CliRunner()
+        runner.invoke(
+            cli.run,
+            ["--cache-dir", "/tmp/twyn-cache", "--dependency", "requests"],
+        )
+        assert mock_check_dependencies.call_args[1]["cache_dir"] == "/tmp/twyn-cache"
+
+    @patch("twyn.cli.check_dependencies")
+    def test_jobs_option(self, mock_check_dependencies: Mock) -> None:
+        runner = CliRunner()
+        runner.invoke(cli.run, ["-j", "4", "--dependency", "requests"])
+        assert mock_check_dependencies.call_args[1]["jobs"] == 4
+
+        result = runner.invoke(cli.run, ["--jobs", "0", "--dependency", "requests"])
+        assert result.exit_code == 2
+        assert mock_check_dependencies.call_count == 1
+
+    @patch("twyn.cli.check_dependencies")
+    def test_detect_combosquats_option(self, mock_check_dependencies: Mock) -> None:
+        runner = CliRunner()
+        runner.invoke(cli.run, ["--detect-combosquats", "--dependency", "requests"])
+        assert mock_check_dependencies.call_args[1]["detect_combosquats"] is True
+
+        runner.invoke(cli.run, ["--dependency", "requests"])
+        assert mock_check_dependencies.call_args[1]["detect_combosquats"] is None
+
+    @patch("twyn.cli.check_dependencies")
+    def test_detect_token_variants_option(self, mock_check_dependencies: Mock) -> None:
+        runner = CliRunner()
+        runner.invoke(cli.run, ["--detect-token-variants", "--dependency", "requests"])
+        assert mock_check_dependencies.call_args[1]["detect_token_variants"] is True
+
+        runner.invoke(cli.run, ["--dependency", "requests"])
+        assert mock_check_dependencies.call_args[1]["detect_token_variants"] is None
+
+    @patch("twyn.cli.check_dependencies")
+    def test_profile_option(self, mock_check_dependencies: Mock) -> None:
+        mock_check_dependencies.return_value = TyposquatCheckResults(
+            profile=ProfilingReport(total_seconds=2.0, stages={"match": 1.5}, counters={"distance_computations": 42})
+        )
+        runner = CliRunner()
+        result = runner.invoke(cli.run, ["--profile", "--dependency", "requests"])
+
+        assert mock_check_dependencies.call_args[1]["profile"] is True
+        assert "match" in result.output
+        assert "75.0" in result.output
+        assert "distance_computations" in result.output
+
+    @patch("twyn.cli.check_dependencies")
+    def test_profile_option_with_json(self, mock_check_dependencies: Mock) -> None:
+        mock_check_dependencies.return_value = TyposquatCheckResults(
+            profile=ProfilingReport(total_seconds=2.0, stages={"match": 1.5}, counters={"distance_computations": 42})
+        )
+        runner = CliRunner()
+        result = runner.invoke(cli.run, ["--profile", "--json", "--dependency", "requests"])
+
+        assert json.loads(result.output) == {
+            "results": [],
+            "profile": {"total_seconds": 2.0, "stages": {"match": 1.5}, "counters": {"distance_computations": 42}},
+        }
+
+    @patch("twyn.cli.check_dependencies")
+    def test_profile_output_option(self, mock_check_dependencies: Mock, tmp_path: Path) -> None:
+        mock_check_dependencies.return_value = TyposquatCheckResults()
+        profile_output = tmp_path / "twyn.prof"
+        runner = CliRunner()
+        runner.invoke(cli.run, ["--profile-output", str(profile_output), "--dependency", "requests"])
+
+        assert mock_check_dependencies.call_args[1]["profile"] is False
+        assert pstats.Stats(str(profile_output)).get_stats_profile().func_profiles
+
+    @patch("twyn.cli.check_dependencies")
+    def test_similarity_algorithm_option(self, mock_check_dependencies: Mock) -> None:
+        runner = CliRunner()
+        runner.invoke(
+            cli.run,
+            ["--similarity-algorithm", "keyboard-distance", "--dependency", "requests"],
+        )
+        assert mock_check_dependencies.call_args[1]["similarity_algorithm"] == "keyboard-distance"
+
     @patch("twyn.cli.check_dependencies")
     def test_no_cache_option_disables_cache(self, mock_check_dependencies: Mock) -> None:
         runner = CliRunner()
@@ -100,6 +194,12 @@ class TestCli:
                 pypi_source=None,
                 npm_source=None,
                 dockerhub_source=None,
+                cache_dir=None,
+                similarity_algorithm=None,
+                jobs=None,
+                detect_combosquats=None,
+                detect_token_variants=None,
+                profile=False,
             )
         ]
 
@@ -128,6 +228,12 @@ class TestCli:
                 pypi_source=None,
                 npm_source=None,
                 dockerhub_source=None,
+                cache_dir=None,
+                similarity_algorithm=None,
+                jobs=None,
+                detect_combosquats=None,
+                detect_token_variants=None,
+                profile=False,
             )
         ]
 
@@ -156,6 +262,12 @@ class TestCli:
                 pypi_source=None,
                 npm_source=None,
                 dockerhub_source=None,
+                cache_dir=None,
+                similarity_algorithm=None,
+                jobs=None,
+                detect_combosquats=None,
+                detect_token_variants=None,
+                profile=False,
             )
         ]
 
@@ -183,6 +295,12 @@ class TestCli:
                 pypi_source=None,
                 npm_source=None,
                 dockerhub_source=None,
+                cache_dir=None,
+                similarity_algorithm=None,
+                jobs=None,
+                detect_combosquats=None,
+                detect_token_variants=None,
+                profile=False,
             )
         ]
 
@@ -222,6 +340,12 @@ class TestCli:
                 pypi_source=None,
                 npm_source=None,
                 dockerhub_source=None,
+                cache_dir=None,
+                similarity_algorithm=None,
+                jobs=None,
+                detect_combosquats=None,
+                detect_token_variants=None,
+                profile=False,
             )
         ]
 
@@ -254,6 +378,12 @@ class TestCli:
             pypi_source=None,
             npm_source=None,
             dockerhub_source=None,
+            cache_dir=None,
+            similarity_algorithm=None,
+            jobs=None,
+            detect_combosquats=None,
+            detect_token_variants=None,
+            profile=False,
         )
         assert mock_check_dependencies.call_args_list[0] == call_args
         assert mock_check_dependencies.call_args_list[1] == call_args
@@ -277,6 +407,12 @@ class TestCli:
                 pypi_source=None,
                 npm_source=None,
                 dockerhub_source=None,
+                cache_dir=None,
+                similarity_algorithm=None,
+                jobs=None,
+                detect_combosquats=None,
+                detect_token_variants=None,
+                profile=False,
             )
         ]
 
@@ -296,6 +432,22 @@ class TestCli:
         assert result.exit_code == 1
         assert "did you mean any of [mypackage]" in result.output
 
+    @patch("twyn.cli.check_dependencies")
+    def test_combosquat_detected(self, mock_check_dependencies: Mock) -> None:
+        mock_check_dependencies.return_value = TyposquatCheckResults(
+            results=[
+                TyposquatCheckResultFromSource(
+                    errors=[TyposquatCheckResultEntry(dependency="requests-toolkit", combosquats=["requests"])],
+                    source="manual_input",
+                )
+            ]
+        )
+
+        result = CliRunner().invoke(cli.run)
+        assert result.exit_code == 1
+        assert "`requests-toolkit`, it contains the name of [requests]" in result.output
+        assert "did you mean" not in result.output
+
     def test_table_and_json_mutually_exclusive(self) -> None:
         runner = CliRunner()
         result = runner.invoke(
@@ -328,7 +480,12 @@ class TestCli:
 
         assert result.exit_code == 1
         assert json.loads(result.output) == {
-            "results": [{"errors": [{"dependency": "my-package", "similars": ["mypackage"]}], "source": "manual_input"}]
+            "results": [
+                {
+                    "errors": [{"dependency": "my-package", "similars": ["mypackage"], "combosquats": []}],
+                    "source": "manual_input",
+                }
+            ]
         }
 
     @patch("twyn.cli.check_dependencies")
@@ -483,6 +640,12 @@ class TestCli:
                 pypi_source="https://custom-pypi.org/",
                 npm_source=None,
                 dockerhub_source=None,
+                cache_dir=None,
+                similarity_algorithm=None,
+                jobs=None,
+                detect_combosquats=None,
+                detect_token_variants=None,
+                profile=False,
             )
         ]
 
@@ -512,6 +675,12 @@ class TestCli:
                 pypi_source=None,
                 npm_source="https://custom-npm.org/",
                 dockerhub_source=None,
+                cache_dir=None,
+                similarity_algorithm=None,
+                jobs=None,
+                detect_combosquats=None,
+                detect_token_variants=None,
+                profile=False,
             )
         ]
 
@@ -541,6 +710,12 @@ class TestCli:
                 pypi_source=None,
                 npm_source=None,
                 dockerhub_source="https://custom.org/",
+                cache_dir=None,
+                similarity_algorithm=None,
+                jobs=None,
+                detect_combosquats=None,
+                detect_token_variants=None,
+                profile=False,
             )
         ]
 
@@ -574,5 +749,11 @@ class TestCli:
                 pypi_source="https://custom-pypi.org/",
                 npm_source="https://custom-npm.org/",
                 dockerhub_source="https://custom-dockerhub.org/",
+                cache_dir=None,
+                similarity_algorithm=None,
+                jobs=None,
+                detect_combosquats=None,
+                detect_token_variants=None,
+                profile=False,
             )
         ]
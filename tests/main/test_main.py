@@ -1,4 +1,8 @@
+import asyncio
+import dataclasses
 import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Any
 from unittest.mock import Mock, patch
@@ -6,7 +10,7 @@ from unittest.mock import Mock, patch
 import pytest
 from tomlkit import dumps, parse
 from twyn.config.config_handler import ConfigHandler, TwynConfiguration
-from twyn.config.exceptions import InvalidSelectorMethodError
+from twyn.config.exceptions import InvalidSelectorMethodError, InvalidSimilarityAlgorithmError
 from twyn.dependency_managers.exceptions import NoMatchingDependencyManagerError
 from twyn.dependency_managers.managers import (
     get_dependency_manager_from_file,
@@ -14,17 +18,30 @@ from twyn.dependency_managers.managers import (
 )
 from twyn.dependency_parser.dependency_selector import DependencySelector
 from twyn.file_handler.file_handler import FileHandler
+from twyn.instrumentation.hooks import use_hook
 from twyn.main import (
+    _analyze_dependencies_in_parallel,
+    _get_similarity_algorithm,
+    _init_worker,
     check_dependencies,
+    check_dependencies_async,
 )
+from twyn.similarity.algorithm import EditDistance, SimilarityThreshold
 from twyn.trusted_packages.exceptions import InvalidArgumentsError
+from twyn.trusted_packages.managers.trusted_pypi_packages_manager import TrustedPackages
 from twyn.trusted_packages.models import (
     TyposquatCheckResultEntry,
     TyposquatCheckResultFromSource,
     TyposquatCheckResults,
 )
+from twyn.trusted_packages.selectors import QGramNeighbourhood
 
-from tests.conftest import create_tmp_file, patch_dockerhub_images_download, patch_npm_packages_download
+from tests.conftest import (
+    RecordingHook,
+    create_tmp_file,
+    patch_dockerhub_images_download,
+    patch_npm_packages_download,
+)
 
 
 @pytest.mark.usefixtures("disable_track")
@@ -62,6 +79,11 @@ class TestCheckDependencies:
                     package_ecosystem="pypi",
                     recursive=True,
                     dockerhub_source=None,
+                    cache_dir=None,
+                    similarity_algorithm="edit-distance",
+                    jobs=1,
+                    detect_combosquats=False,
+                    detect_token_variants=False,
                 ),
             ),  # CLI args take precedence over config from file
             (
@@ -86,6 +108,11 @@ class TestCheckDependencies:
                     package_ecosystem="pypi",
                     recursive=True,
                     dockerhub_source=None,
+                    cache_dir=None,
+                    similarity_algorithm="edit-distance",
+                    jobs=1,
+                    detect_combosquats=False,
+                    detect_token_variants=False,
                 ),
             ),  # Config from file takes precendence over fallback values
             (
@@ -101,6 +128,11 @@ class TestCheckDependencies:
                     use_cache=True,
                     package_ecosystem=None,
                     recursive=False,
+                    cache_dir=None,
+                    similarity_algorithm="edit-distance",
+                    jobs=1,
+                    detect_combosquats=False,
+                    detect_token_variants=False,
                 ),
             ),  # Fallback values
         ],
@@ -163,6 +195,195 @@ class TestCheckDependencies:
             ]
         )
 
+    @patch("twyn.trusted_packages.TopPyPiReference._get_packages_from_cache_if_enabled")
+    def test_check_dependencies_in_parallel(self, mock_get_packages_from_cache: Mock) -> None:
+        """Check that sharding the dependencies across processes returns the same results, in the same order."""
+        mock_get_packages_from_cache.return_value = {"requests", "numpy", "django", "flask"}
+        dependencies = {"reqests", "nunpy", "djangoo", "flask", "urllib3", "fask"}
+
+        serial = check_dependencies(dependencies=dependencies, package_ecosystem="pypi")
+        parallel = check_dependencies(dependencies=dependencies, package_ecosystem="pypi", jobs=3)
+
+        assert parallel.results[0].errors == serial.results[0].errors
+        assert [entry.dependency for entry in parallel.results[0].errors] == ["djangoo", "fask", "nunpy", "reqests"]
+
+    @patch("twyn.trusted_packages.TopPyPiReference._get_packages_from_cache_if_enabled")
+    def test_check_dependencies_detects_combosquats(self, mock_get_packages_from_cache: Mock) -> None:
+        mock_get_packages_from_cache.return_value = {"requests", "numpy"}
+        dependencies = {"requests-toolkit", "reqests"}
+
+        assert check_dependencies(dependencies=dependencies, package_ecosystem="pypi") == TyposquatCheckResults(
+            results=[
+                TyposquatCheckResultFromSource(
+                    errors=[TyposquatCheckResultEntry(dependency="reqests", similars=["requests"])],
+                    source="manual_input",
+                )
+            ]
+        )
+        results = check_dependencies(dependencies=dependencies, package_ecosystem="pypi", detect_combosquats=True)
+        assert sorted(results.results[0].errors, key=lambda entry: entry.dependency) == [
+            TyposquatCheckResultEntry(dependency="reqests", similars=["requests"]),
+            TyposquatCheckResultEntry(dependency="requests-toolkit", combosquats=["requests"]),
+        ]
+
+    @patch("twyn.trusted_packages.TopPyPiReference._get_packages_from_cache_if_enabled")
+    def test_check_dependencies_detects_token_variants(self, mock_get_packages_from_cache: Mock) -> None:
+        mock_get_packages_from_cache.return_value = {"python-dateutil"}
+
+        assert check_dependencies(dependencies={"dateutil-python"}, package_ecosystem="pypi") == TyposquatCheckResults()
+        assert check_dependencies(
+            dependencies={"dateutil-python"}, package_ecosystem="pypi", detect_token_variants=True
+        ) == TyposquatCheckResults(
+            results=[
+                TyposquatCheckResultFromSource(
+                    errors=[TyposquatCheckResultEntry(dependency="dateutil-python", similars=["python-dateutil"])],
+                    source="manual_input",
+                )
+            ]
+        )
+
+    @patch("twyn.main._analyze_dependencies_in_parallel")
+    @patch("twyn.trusted_packages.TopPyPiReference._get_packages_from_cache_if_enabled")
+    def test_check_dependencies_in_parallel_skips_allowlist(
+        self, mock_get_packages_from_cache: Mock, mock_parallel: Mock
+    ) -> None:
+        mock_get_packages_from_cache.return_value = {"requests"}
+        mock_parallel.return_value = []
+        with patch("twyn.main._get_config") as mock_config:
+            mock_config.return_value = ConfigHandler().resolve_config(package_ecosystem="pypi", jobs=2)
+            mock_config.return_value = dataclasses.replace(mock_config.return_value, allowlist={"reqests"})
+            check_dependencies(dependencies={"reqests", "requets"})
+
+        assert mock_parallel.call_args[0][1] == ["requets"]
+
+    @patch("twyn.trusted_packages.TopPyPiReference._get_packages_from_cache_if_enabled")
+    def test_check_dependencies_skips_allowlist(self, mock_get_packages_from_cache: Mock) -> None:
+        mock_get_packages_from_cache.return_value = {"requests"}
+        with patch("twyn.main._get_config") as mock_config, use_hook(RecordingHook()) as hook:
+            mock_config.return_value = ConfigHandler().resolve_config(package_ecosystem="pypi")
+            mock_config.return_value = dataclasses.replace(mock_config.return_value, allowlist={"reqests"})
+            results = check_dependencies(dependencies={"reqests", "requets"})
+
+        assert [entry.dependency for entry in results.results[0].errors] == ["requets"]
+        assert hook.spans[-1] == ("match", {"dependencies": 1})
+        assert hook.counters["dependencies_checked"] == 1
+
+    @patch("twyn.trusted_packages.TopPyPiReference._get_packages_from_cache_if_enabled")
+    def test_check_dependencies_with_profile(self, mock_get_packages_from_cache: Mock) -> None:
+        mock_get_packages_from_cache.return_value = {"requests", "numpy"}
+
+        results = check_dependencies(dependencies={"reqests", "numpy", "flask"}, package_ecosystem="pypi", profile=True)
+
+        assert results.profile is not None
+        assert set(results.profile.stages) == {"fetch", "normalize", "build_index", "match"}
+        assert results.profile.counters == {"cache_hits": 1, "dependencies_checked": 3, "distance_computations": 4}
+
+    @patch("twyn.trusted_packages.TopPyPiReference._get_packages_from_cache_if_enabled")
+    def test_check_dependencies_with_profile_in_parallel(self, mock_get_packages_from_cache: Mock) -> None:
+        """Check that the counters collected in the worker processes are added to the profile."""
+        mock_get_packages_from_cache.return_value = {"requests", "numpy"}
+
+        results = check_dependencies(
+            dependencies={"reqests", "numpy", "flask"}, package_ecosystem="pypi", profile=True, jobs=2
+        )
+
+        assert results.profile is not None
+        assert results.profile.counters["dependencies_checked"] == 3
+        assert results.profile.counters["distance_computations"] == 4
+
+    @patch("twyn.trusted_packages.TopPyPiReference._get_packages_from_cache_if_enabled")
+    def test_check_dependencies_in_parallel_reports_counters_to_hooks(self, mock_get_packages_from_cache: Mock) -> None:
+        mock_get_packages_from_cache.return_value = {"requests", "numpy"}
+
+        with use_hook(RecordingHook()) as hook:
+            check_dependencies(dependencies={"reqests", "numpy", "flask"}, package_ecosystem="pypi", jobs=2)
+
+        assert [name for name, _ in hook.spans] == ["fetch", "build_index", "normalize", "match"]
+        assert hook.spans[-1][1] == {"dependencies": 3, "jobs": 2}
+        assert hook.counters == {"cache_hits": 1, "dependencies_checked": 3, "distance_computations": 4}
+
+    @patch("twyn.trusted_packages.TopPyPiReference.get_packages")
+    def test_check_dependencies_from_file_with_profile(
+        self, mock_get_packages: Mock, uv_lock_file_with_typo: Path
+    ) -> None:
+        mock_get_packages.return_value = {"requests"}
+
+        results = check_dependencies(dependency_files={str(uv_lock_file_with_typo)}, use_cache=False, profile=True)
+
+        assert results.profile is not None
+        assert {"discovery", "parse", "normalize", "build_index", "match"} <= set(results.profile.stages)
+        assert results.profile.counters["files_found"] == 1
+        assert results.profile.counters["names_parsed"] == 3
+
+    @patch("twyn.trusted_packages.TopPyPiReference._get_packages_from_cache_if_enabled")
+    def test_check_dependencies_without_profile(self, mock_get_packages_from_cache: Mock) -> None:
+        mock_get_packages_from_cache.return_value = {"requests"}
+
+        results = check_dependencies(dependencies={"reqests"}, package_ecosystem="pypi")
+
+        assert results.profile is None
+
+    @patch("twyn.trusted_packages.TopPyPiReference._get_packages_from_cache_if_enabled")
+    def test_check_dependencies_async_does_not_block_event_loop(self, mock_get_packages_from_cache: Mock) -> None:
+        """Check that the event loop keeps running other tasks while the trusted packages are being loaded."""
+        event_loop_ran = threading.Event()
+
+        def wait_for_event_loop() -> set[str]:
+            assert event_loop_ran.wait(timeout=5)
+            return {"requests"}
+
+        mock_get_packages_from_cache.side_effect = wait_for_event_loop
+
+        async def run() -> TyposquatCheckResults:
+            check = asyncio.create_task(check_dependencies_async(dependencies={"reqests"}, package_ecosystem="pypi"))
+            await asyncio.sleep(0)
+            event_loop_ran.set()
+            return await check
+
+        results = asyncio.run(run())
+
+        assert results.results[0].errors == [TyposquatCheckResultEntry(dependency="reqests", similars=["requests"])]
+
+    def test_analyze_dependencies_in_parallel_without_dependencies(self) -> None:
+        assert _analyze_dependencies_in_parallel(Mock(), [], False, None, 2) == []
+
+    @patch("twyn.main.ProcessPoolExecutor", wraps=ProcessPoolExecutor)
+    @patch("twyn.trusted_packages.TopPyPiReference.get_packages")
+    def test_check_dependencies_in_parallel_shares_pool_between_files(
+        self, mock_get_packages: Mock, mock_executor: Mock, tmp_path: Path
+    ) -> None:
+        """Check that the files of an ecosystem are analyzed in the same pool, started once."""
+        mock_get_packages.return_value = {"requests", "numpy"}
+        with (
+            create_tmp_file(tmp_path / "backend" / "requirements.txt", "reqests\n"),
+            create_tmp_file(tmp_path / "worker" / "requirements.txt", "nunpy\n"),
+        ):
+            results = check_dependencies(
+                dependency_files={
+                    str(tmp_path / "backend" / "requirements.txt"),
+                    str(tmp_path / "worker" / "requirements.txt"),
+                },
+                use_cache=False,
+                jobs=2,
+            )
+
+        assert mock_executor.call_count == 1
+        assert sorted(result.errors[0].dependency for result in results.results) == ["nunpy", "reqests"]
+
+    def test_init_worker_builds_selector_index(self) -> None:
+        trusted_packages = TrustedPackages(
+            names={"requests", "numpy"},
+            algorithm=EditDistance(),
+            selector=QGramNeighbourhood(),
+            threshold_class=SimilarityThreshold,
+        )
+
+        with patch("twyn.main._worker_trusted_packages"), patch("twyn.main.clear_hooks"):
+            _init_worker(trusted_packages)
+
+        assert trusted_packages.selector._indexed_names is not None
+        assert trusted_packages.selector._indexed_names[0] is trusted_packages.names
+
     def test_check_dependencies_fails_if_unkown_selector_method(self) -> None:
         """Check that if an invalid selector method is given, it raises InvalidSelectorMethodError."""
         with pytest.raises(InvalidSelectorMethodError):
@@ -208,8 +429,8 @@ class TestCheckDependencies:
             results=[
                 TyposquatCheckResultFromSource(
                     errors=[
-                        TyposquatCheckResultEntry(dependency="lodas", similars=["lodash"]),
                         TyposquatCheckResultEntry(dependency="@awz/sdk", similars=["@aws/sdk"]),
+                        TyposquatCheckResultEntry(dependency="lodas", similars=["lodash"]),
                     ],
                     source=str(package_lock_json_file_with_namespace_typo),
                 )
@@ -238,6 +459,11 @@ class TestCheckDependencies:
             package_ecosystem=None,
             recursive=False,
             dockerhub_source=None,
+            cache_dir=None,
+            similarity_algorithm="edit-distance",
+            jobs=1,
+            detect_combosquats=False,
+            detect_token_variants=False,
         )
         mock_fpath.return_value = uv_lock_file_with_typo
         error = check_dependencies()
@@ -275,6 +501,11 @@ class TestCheckDependencies:
             package_ecosystem="pypi",
             recursive=False,
             dockerhub_source=None,
+            cache_dir=None,
+            similarity_algorithm="edit-distance",
+            jobs=1,
+            detect_combosquats=False,
+            detect_token_variants=False,
         )
         mock_fpath.return_value = uv_lock_file_with_typo
         error = check_dependencies()
@@ -309,6 +540,40 @@ class TestCheckDependencies:
             ]
         )
 
+    @patch("twyn.trusted_packages.TopPyPiReference._get_packages_from_cache_if_enabled")
+    def test_check_dependencies_with_deletion_index(self, mock_get_packages_from_cache: Mock) -> None:
+        mock_get_packages_from_cache.return_value = {"mypackage", "requests", "numpy"}
+        error = check_dependencies(
+            dependencies={"my-package", "nunpy", "urllib3"},
+            package_ecosystem="pypi",
+            selector_method="deletion-index",
+        )
+
+        assert [result.source for result in error.results] == ["manual_input"]
+        assert {(entry.dependency, tuple(entry.similars)) for entry in error.results[0].errors} == {
+            ("my-package", ("mypackage",)),
+            ("nunpy", ("numpy",)),
+        }
+
+    @patch("twyn.trusted_packages.TopPyPiReference._get_packages_from_cache_if_enabled")
+    def test_check_dependencies_with_keyboard_distance(self, mock_get_packages_from_cache: Mock) -> None:
+        pytest.importorskip("numpy")
+        mock_get_packages_from_cache.return_value = {"numpy", "mypy"}
+        error = check_dependencies(
+            dependencies={"nimpy"},
+            package_ecosystem="pypi",
+            similarity_algorithm="keyboard-distance",
+        )
+
+        assert error == TyposquatCheckResults(
+            results=[
+                TyposquatCheckResultFromSource(
+                    errors=[TyposquatCheckResultEntry(dependency="nimpy", similars=["numpy"])],
+                    source="manual_input",
+                )
+            ]
+        )
+
     @patch("twyn.trusted_packages.TopNpmReference._get_packages_from_cache_if_enabled")
     def test_check_dependencies_with_input_from_cli_detects_typosquats_on_namespace_packages(
         self, mock_get_packages_from_cache: Mock
@@ -330,8 +595,8 @@ class TestCheckDependencies:
             results=[
                 TyposquatCheckResultFromSource(
                     errors=[
-                        TyposquatCheckResultEntry(dependency="lodas", similars=["lodash"]),
                         TyposquatCheckResultEntry(dependency="@awz/sdk", similars=["@aws/sdk"]),
+                        TyposquatCheckResultEntry(dependency="lodas", similars=["lodash"]),
                     ],
                     source="manual_input",
                 )
@@ -495,6 +760,10 @@ class TestCheckDependencies:
         with pytest.raises(InvalidSelectorMethodError):
             check_dependencies(selector_method="i am batman")
 
+    def test_get_invalid_similarity_algorithm(self) -> None:
+        with pytest.raises(InvalidSimilarityAlgorithmError):
+            _get_similarity_algorithm("i am robin")
+
     @patch("twyn.trusted_packages.TopPyPiReference.get_packages")
     def test_check_dependencies_ignores_package_in_allowlist(
         self, mock_get_packages: Mock, uv_lock_file_with_typo: Path
@@ -525,6 +794,11 @@ class TestCheckDependencies:
             package_ecosystem=None,
             recursive=False,
             dockerhub_source=None,
+            cache_dir=None,
+            similarity_algorithm="edit-distance",
+            jobs=1,
+            detect_combosquats=False,
+            detect_token_variants=False,
         )
 
         # Check that the package is no longer an error
@@ -562,6 +836,11 @@ class TestCheckDependencies:
             package_ecosystem=None,
             recursive=False,
             dockerhub_source=None,
+            cache_dir=None,
+            similarity_algorithm="edit-distance",
+            jobs=1,
+            detect_combosquats=False,
+            detect_token_variants=False,
         )
         mock_get_packages.return_value = {"requests"}
         with patch("rich.progress.track") as m_track:
@@ -581,6 +860,11 @@ class TestCheckDependencies:
             package_ecosystem=None,
             recursive=False,
             dockerhub_source=None,
+            cache_dir=None,
+            similarity_algorithm="edit-distance",
+            jobs=1,
+            detect_combosquats=False,
+            detect_token_variants=False,
         )
         mock_get_packages.return_value = {"requests"}
         with patch("rich.progress.track") as m_track:
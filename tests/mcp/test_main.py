@@ -0,0 +1,137 @@
+import asyncio
+from collections.abc import Iterator
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+from twyn.mcp.models import BatchCheckResults, DependencyFileContent, DependencyGroup, DependencyGroupResult
+from twyn.trusted_packages.models import TyposquatCheckResultEntry, TyposquatCheckResultFromSource
+from twyn.trusted_packages.references.base import NormalizedPackages
+
+pytest.importorskip("fastmcp")
+
+from twyn.mcp import main  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def server_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[Path]:
+    """Run every test with no engines and from an empty directory, where the server would look for its config."""
+    monkeypatch.chdir(tmp_path)
+    main._engines.clear()
+    yield tmp_path
+    main._engines.clear()
+
+
+class TestMcpEngines:
+    @patch("twyn.trusted_packages.TopPyPiReference.get_packages")
+    def test_engines_are_reused(self, mock_get_packages: Mock) -> None:
+        mock_get_packages.return_value = NormalizedPackages(packages={"requests"})
+
+        asyncio.run(main.check_possible_typosquat({"reqests"}, "pypi"))
+        asyncio.run(main.check_possible_typosquat({"requests"}, "pypi"))
+
+        assert len(main._engines) == 1
+        assert mock_get_packages.call_count == 1
+
+    @patch("twyn.mcp.main.MAX_ENGINES", 2)
+    @patch("twyn.trusted_packages.TopPyPiReference.get_packages")
+    def test_least_recently_used_engine_is_dropped(self, mock_get_packages: Mock) -> None:
+        mock_get_packages.return_value = NormalizedPackages(packages={"requests"})
+
+        for selector_method in ("all", "first-letter", "all", "nearby-letter"):
+            asyncio.run(main.check_possible_typosquat({"reqests"}, "pypi", selector_method=selector_method))
+
+        assert [settings[1] for settings in main._engines] == ["all", "nearby-letter"]
+
+    @patch("twyn.trusted_packages.TopPyPiReference.get_packages")
+    def test_custom_source_is_used(self, mock_get_packages: Mock) -> None:
+        mock_get_packages.return_value = NormalizedPackages(packages={"requests"})
+
+        asyncio.run(main.check_possible_typosquat({"reqests"}, "pypi", pypi_source="https://example.com/top.json"))
+
+        [engine] = main._engines.values()
+        assert engine.get_ecosystem("pypi").reference.source == "https://example.com/top.json"
+
+    @patch("twyn.trusted_packages.TopPyPiReference.get_packages")
+    def test_config_file_is_loaded(self, mock_get_packages: Mock, server_dir: Path) -> None:
+        mock_get_packages.return_value = NormalizedPackages(packages={"requests"})
+        config_file = server_dir / "custom.toml"
+        config_file.write_text('[tool.twyn]\nallowlist = ["reqests"]\n')
+
+        results = asyncio.run(main.check_possible_typosquat({"reqests"}, "pypi", config_file=str(config_file)))
+
+        assert not results.results
+
+
+class TestMcpBatch:
+    @patch("twyn.trusted_packages.TopNpmReference.get_packages")
+    @patch("twyn.trusted_packages.TopPyPiReference.get_packages")
+    def test_batch_returns_one_result_per_group(self, mock_pypi_packages: Mock, mock_npm_packages: Mock) -> None:
+        mock_pypi_packages.return_value = NormalizedPackages(packages={"requests", "numpy"})
+        mock_npm_packages.return_value = NormalizedPackages(packages={"react"})
+
+        results = asyncio.run(
+            main.check_possible_typosquats_batch(
+                groups=[
+                    DependencyGroup(package_ecosystem="pypi", dependencies={"reqests"}),
+                    DependencyGroup(package_ecosystem="npm", dependencies={"react"}),
+                    DependencyGroup(package_ecosystem="pypi", dependencies={"nunpy"}),
+                ],
+                files=[
+                    DependencyFileContent(file_name="requirements.txt", content="reqests\n"),
+                    DependencyFileContent(file_name="docs/requirements.txt", content="numpy\n"),
+                ],
+            )
+        )
+
+        assert results == BatchCheckResults(
+            groups=[
+                DependencyGroupResult(
+                    package_ecosystem="pypi",
+                    errors=[TyposquatCheckResultEntry(dependency="reqests", similars=["requests"])],
+                ),
+                DependencyGroupResult(package_ecosystem="npm"),
+                DependencyGroupResult(
+                    package_ecosystem="pypi",
+                    errors=[TyposquatCheckResultEntry(dependency="nunpy", similars=["numpy"])],
+                ),
+            ],
+            files=[
+                TyposquatCheckResultFromSource(
+                    errors=[TyposquatCheckResultEntry(dependency="reqests", similars=["requests"])],
+                    source="requirements.txt",
+                )
+            ],
+        )
+
+    def test_empty_batch(self) -> None:
+        assert asyncio.run(main.check_possible_typosquats_batch()) == BatchCheckResults()
+
+
+class TestMcpRefresh:
+    @patch("twyn.trusted_packages.TopNpmReference.get_packages")
+    @patch("twyn.trusted_packages.TopPyPiReference.get_packages")
+    def test_refresh_reloads_every_engine(self, mock_pypi_packages: Mock, mock_npm_packages: Mock) -> None:
+        mock_pypi_packages.return_value = NormalizedPackages(packages={"requests"})
+        mock_npm_packages.return_value = NormalizedPackages(packages={"react"})
+        asyncio.run(main.check_possible_typosquat({"reqests"}, "pypi", selector_method="all"))
+        asyncio.run(main.check_possible_typosquat({"reqests"}, "pypi", selector_method="first-letter"))
+        asyncio.run(main.check_possible_typosquat({"raect"}, "npm", selector_method="all"))
+
+        asyncio.run(main.refresh_trusted_packages())
+
+        assert mock_pypi_packages.call_count == 4
+        assert mock_npm_packages.call_count == 2
+
+    @patch("twyn.trusted_packages.TopNpmReference.get_packages")
+    @patch("twyn.trusted_packages.TopPyPiReference.get_packages")
+    def test_refresh_one_ecosystem(self, mock_pypi_packages: Mock, mock_npm_packages: Mock) -> None:
+        mock_pypi_packages.return_value = NormalizedPackages(packages={"requests"})
+        mock_npm_packages.return_value = NormalizedPackages(packages={"react"})
+        asyncio.run(main.check_possible_typosquat({"reqests"}, "pypi"))
+        asyncio.run(main.check_possible_typosquat({"raect"}, "npm"))
+
+        asyncio.run(main.refresh_trusted_packages("npm"))
+
+        assert mock_pypi_packages.call_count == 1
+        assert mock_npm_packages.call_count == 2
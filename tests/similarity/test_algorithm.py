@@ -9,7 +9,7 @@ from twyn.similarity.exceptions import DistanceAlgorithmError, ThresholdError
 
 class TestAbstractSimilarityAlgorithm:
     class DifferentLettersSimilarityAlgorithm(AbstractSimilarityAlgorithm):
-        def _run_algorithm(self, first_sequence: str, second_sequence: str) -> float | int:
+        def _run_algorithm(self, first_sequence: str, second_sequence: str, max_distance: float | None) -> float | int:
             first_letters = set(first_sequence)
             second_letters = set(second_sequence)
             return len(first_letters.symmetric_difference(second_letters))
@@ -31,6 +31,10 @@ class TestAbstractSimilarityAlgorithm:
         algorithm = self.DifferentLettersSimilarityAlgorithm()
         assert algorithm.get_distance(word1, word2) == expected_distance
 
+    def test_distances_in_batch(self):
+        algorithm = self.DifferentLettersSimilarityAlgorithm()
+        assert algorithm.get_distances("foo", ["bar", "foo", "boo"]) == [5, 0, 2]
+
 
 class TestEditDistance:
     @pytest.mark.parametrize(
@@ -49,10 +53,32 @@ class TestEditDistance:
         algorithm = EditDistance()
         assert algorithm.get_distance(word1, word2) == expected_distance
 
+    @pytest.mark.parametrize(
+        ("word1", "word2", "max_distance", "expected_distance"),
+        [
+            ("requests", "requets", 2, 1),
+            ("requests", "rqeuets", 2, 2),
+            ("reque", "requests", 2, 3),
+            ("reque", "requests", 1.5, 2),
+            ("numpy", "django", 1, 2),
+        ],
+    )
+    def test_distance_is_cut_off_above_max_distance(self, word1, word2, max_distance, expected_distance):
+        algorithm = EditDistance()
+        assert algorithm.get_distance(word1, word2, max_distance) == expected_distance
+
+    def test_distances_in_batch_with_max_distance(self):
+        algorithm = EditDistance()
+        distances = algorithm.get_distances("requests", ["requets", "urllib3", "requests"], max_distance=2)
+
+        assert distances[0] == 1
+        assert distances[1] > 2
+        assert distances[2] == 0
+
 
 class TestExceptions:
     class ExceptionAlgorithm(AbstractSimilarityAlgorithm):
-        def _run_algorithm(self, first_sequence: str, second_sequence: str) -> float | int:
+        def _run_algorithm(self, first_sequence: str, second_sequence: str, max_distance: float | None) -> float | int:
             raise KeyError
 
     def test_exception(self):
@@ -62,8 +88,37 @@ class TestExceptions:
         ):
             self.ExceptionAlgorithm().get_distance("", "")
 
+    def test_exception_in_batch(self):
+        with pytest.raises(
+            DistanceAlgorithmError,
+            match="Exception raised while running distance algorithm",
+        ):
+            self.ExceptionAlgorithm().get_distances("", ["", "a"])
+
 
 class TestSimilarityThreshold:
     def test_invalid_threshold(self):
         with pytest.raises(ThresholdError):
             SimilarityThreshold(max=0)
+
+    @pytest.mark.parametrize(
+        ("name", "expected_max"),
+        [("", 1.0), ("numpy", 1.0), ("django", 2.0), ("requests-oauthlib", 2.0)],
+    )
+    def test_from_name(self, name, expected_max):
+        threshold = SimilarityThreshold.from_name(name)
+
+        assert threshold.min == SimilarityThreshold.MIN_VALUE
+        assert threshold.max == expected_max
+
+    def test_thresholds_are_shared_by_names_of_the_same_length(self):
+        assert SimilarityThreshold.from_name("numpy") is SimilarityThreshold.from_name("nunpy")
+        assert SimilarityThreshold.from_name("requests") is SimilarityThreshold.from_name("requests-oauthlib")
+
+    def test_subclasses_have_their_own_thresholds(self):
+        class StrictSimilarityThreshold(SimilarityThreshold):
+            MAX_FOR_LONG_WORDS = 1.0
+
+        assert SimilarityThreshold.from_name("requests").max == 2.0
+        assert StrictSimilarityThreshold.from_name("requests").max == 1.0
+        assert SimilarityThreshold.from_name("requests").max == 2.0
@@ -0,0 +1,64 @@
+import re
+
+import pytest
+from twyn.similarity.algorithm import EditDistance
+from twyn.similarity.confusables import (
+    CONFUSABLE_CHARACTERS,
+    ConfusableEditDistance,
+    get_skeleton,
+    group_by_skeleton,
+)
+
+
+class TestGetSkeleton:
+    @pytest.mark.parametrize(
+        ("name", "expected_skeleton"),
+        [
+            ("requests", "requests"),
+            ("rnatplotlib", "matplotlib"),
+            ("matp1otlib", "matplotlib"),
+            ("djang0", "django"),
+            ("vvheel", "wheel"),
+            ("c1ick", "dick"),
+            ("5ix", "six"),
+        ],
+    )
+    def test_get_skeleton(self, name: str, expected_skeleton: str) -> None:
+        assert get_skeleton(name) == expected_skeleton
+
+    def test_confusable_characters_are_valid_in_package_names(self) -> None:
+        """Check that only characters that can make it through the normalization of the names are confused."""
+        assert all(re.fullmatch(r"[a-z0-9._~-]", character) for character in CONFUSABLE_CHARACTERS)
+
+    def test_group_by_skeleton(self) -> None:
+        assert group_by_skeleton(["json5", "jsons", "requests"]) == {
+            "jsons": {"json5", "jsons"},
+            "requests": {"requests"},
+        }
+
+
+class TestConfusableEditDistance:
+    @pytest.mark.parametrize(
+        ("word1", "word2", "expected_distance"),
+        [
+            ("requests", "requests", 0),
+            ("requests", "requets", 1),
+            ("rnatplotlib", "matplotlib", 0.5),
+            ("djang0", "django", 0.5),
+            ("reque", "requests", 3),
+        ],
+    )
+    def test_distance_between_words(self, word1: str, word2: str, expected_distance: float) -> None:
+        assert ConfusableEditDistance().get_distance(word1, word2) == expected_distance
+
+    def test_distances_in_batch(self) -> None:
+        candidates = ["matplotlib", "rnatplotlib", "rnatplotlob", "numpy"]
+
+        distances = ConfusableEditDistance().get_distances("rnatplotlib", candidates, max_distance=2)
+
+        assert distances[:3] == [0.5, 0, 1]
+        assert distances[3] > 2
+
+    def test_only_confusable_algorithms_detect_lookalikes(self) -> None:
+        assert ConfusableEditDistance.DETECTS_LOOKALIKES
+        assert not EditDistance.DETECTS_LOOKALIKES
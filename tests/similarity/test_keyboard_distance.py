@@ -0,0 +1,76 @@
+from unittest.mock import patch
+
+import pytest
+from rapidfuzz.distance import OSA
+from twyn.similarity.algorithm import SimilarityThreshold
+from twyn.similarity.exceptions import AlgorithmDependencyNotInstalledError
+
+pytest.importorskip("numpy")
+
+from twyn.similarity.keyboard_distance import KeyboardEditDistance  # noqa: E402
+
+
+class TestKeyboardEditDistance:
+    @pytest.mark.parametrize(
+        ("word1", "word2", "expected_distance"),
+        [
+            ("requests", "requests", 0.0),
+            ("requests", "rwquests", 0.5),  # `e` and `w` are next to each other
+            ("requests", "rpquests", 1.0),
+            ("requests", "requets", 1.0),
+            ("requests", "reqeusts", 1.0),
+            ("requests", "rwqeusts", 1.5),
+            ("reque", "requests", 3.0),
+            ("", "abc", 3.0),
+            ("réquests", "requests", 1.0),
+        ],
+    )
+    def test_distance_between_words(self, word1: str, word2: str, expected_distance: float) -> None:
+        assert KeyboardEditDistance().get_distance(word1, word2) == expected_distance
+
+    @pytest.mark.parametrize(("max_distance", "expected_max_edits"), [(1.0, 2), (2.0, 4), (0.5, 1)])
+    def test_max_edits(self, max_distance: float, expected_max_edits: int) -> None:
+        """Check that as many adjacent key substitutions as fit in the distance are allowed."""
+        assert KeyboardEditDistance().get_max_edits(max_distance) == expected_max_edits
+
+    def test_distances_in_batch_keep_order(self) -> None:
+        candidates = ["rwquests", "requests", "urllib3", "", "reqeusts"]
+        algorithm = KeyboardEditDistance()
+
+        assert algorithm.get_distances("requests", candidates) == [
+            algorithm.get_distance("requests", candidate) for candidate in candidates
+        ]
+        assert algorithm.get_distances("requests", []) == []
+
+    def test_same_as_optimal_string_alignment_without_keyboard_weights(self) -> None:
+        class UnweightedKeyboardEditDistance(KeyboardEditDistance):
+            ADJACENT_KEY_SUBSTITUTION_COST = 1.0
+
+        candidates = ["abc", "acb", "ca", "abcd", "bca", "", "cabd", "xyz", "ab", "ba"]
+        algorithm = UnweightedKeyboardEditDistance()
+        for name in ["abc", "ca", "", "abdc"]:
+            assert algorithm.get_distances(name, candidates) == [
+                OSA.distance(name, candidate) for candidate in candidates
+            ]
+
+    def test_distances_above_max_distance_are_cut_off(self) -> None:
+        candidates = ["rwquests", "requests", "urllib3", "reqeusts", "abcdefgh", "zzzzzzzz"]
+        algorithm = KeyboardEditDistance()
+
+        distances = algorithm.get_distances("requests", candidates, max_distance=1)
+
+        for candidate, distance in zip(candidates, distances, strict=True):
+            exact_distance = algorithm.get_distance("requests", candidate)
+            assert distance == exact_distance if exact_distance <= 1 else distance > 1
+
+    def test_adjacent_key_typo_is_inside_threshold(self) -> None:
+        distance = KeyboardEditDistance().get_distance("numpy", "nimpy")
+
+        assert SimilarityThreshold.from_name("numpy").is_inside_threshold(distance)
+
+    def test_numpy_not_installed(self) -> None:
+        with (
+            patch("twyn.similarity.keyboard_distance.NUMPY_INSTALLED", new=False),
+            pytest.raises(AlgorithmDependencyNotInstalledError, match=r"twyn\[keyboard\]"),
+        ):
+            KeyboardEditDistance()
@@ -1,10 +1,18 @@
+import os
 from datetime import datetime, timedelta
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 from freezegun import freeze_time
 from pydantic import ValidationError
-from twyn.trusted_packages.cache_handler import CacheEntry, CacheHandler
+from twyn.trusted_packages.cache_handler import (
+    CacheEntry,
+    CacheHandler,
+    DeletionIndexEntry,
+    get_default_cache_dir,
+)
+from twyn.trusted_packages.constants import CACHE_SCHEMA_VERSION
 
 
 @freeze_time("2025-01-01")
@@ -14,7 +22,7 @@ class TestCacheHandler:
         source = "https://source.com"
 
         cache_handler = CacheHandler(str(tmp_path))
-        entry = CacheEntry(saved_date="2025-01-01", packages={"requests"})
+        entry = CacheEntry(saved_date="2025-01-01", packages={"r": {"requests"}})
 
         cache_handler.write_entry(source, entry)
         result = cache_handler.get_cache_entry(source)
@@ -29,13 +37,105 @@ class TestCacheHandler:
         source = "https://source.com"
 
         cache_handler = CacheHandler(str(tmp_path / "my-path"))
-        entry = CacheEntry(saved_date="2025-01-01", packages={"requests"})
+        entry = CacheEntry(saved_date="2025-01-01", packages={"r": {"requests"}})
 
         cache_handler.write_entry(source, entry)
 
         fpath = tmp_path / f"{cache_handler.get_cache_file_path(source)}"
         assert fpath.exists()
 
+    def test_write_entry_does_not_leave_partial_files(self, tmp_path: Path) -> None:
+        """Test that a failed write keeps the previous entry intact and does not leave temporary files behind."""
+        source = "https://source.com"
+        cache_handler = CacheHandler(str(tmp_path))
+        cache_handler.write_entry(source, CacheEntry(saved_date="2025-01-01", packages={"r": {"requests"}}))
+
+        with patch("os.replace", side_effect=OSError("disk full")), pytest.raises(OSError, match="disk full"):
+            cache_handler.write_entry(source, CacheEntry(saved_date="2025-01-01", packages={"d": {"django"}}))
+
+        result = cache_handler.get_cache_entry(source)
+        assert result is not None
+        assert result.packages == {"r": {"requests"}}
+        assert [path.name for path in tmp_path.iterdir()] == [Path(cache_handler.get_cache_file_path(source)).name]
+
+    def test_clear_all_removes_lock_files(self, tmp_path: Path) -> None:
+        cache_dir = tmp_path / "cache"
+        cache_handler = CacheHandler(str(cache_dir))
+        with cache_handler.lock("source"):
+            cache_handler.write_entry("source", CacheEntry(saved_date="2025-01-01", packages={"p": {"package"}}))
+
+        assert Path(cache_handler.get_cache_lock_path("source")).exists()
+
+        cache_handler.clear_all()
+
+        assert not cache_dir.exists()
+
+    def test_deletion_index_entry(self, tmp_path: Path) -> None:
+        cache_handler = CacheHandler(str(tmp_path))
+        entry = DeletionIndexEntry(max_distance=2, prefix_length=7, names=["foo"], deletes={"foo": [0], "fo": [0]})
+
+        assert cache_handler.get_deletion_index_entry("fingerprint") is None
+        cache_handler.write_deletion_index_entry("fingerprint", entry)
+
+        assert cache_handler.get_deletion_index_entry("fingerprint") == entry
+        assert cache_handler.get_stats().entries == []
+
+        cache_handler.clear_all()
+        assert not tmp_path.exists()
+
+    def test_corrupt_deletion_index_entry(self, tmp_path: Path) -> None:
+        cache_handler = CacheHandler(str(tmp_path))
+        index_path = Path(cache_handler.get_index_file_path("fingerprint"))
+        index_path.parent.mkdir()
+        index_path.write_text('{"names": "not a list"}')
+
+        assert cache_handler.get_deletion_index_entry("fingerprint") is None
+
+    def test_write_deletion_index_prunes_outdated_indexes(self, tmp_path: Path) -> None:
+        cache_handler = CacheHandler(str(tmp_path))
+        entry = DeletionIndexEntry(max_distance=2, prefix_length=7, names=[], deletes={})
+        cache_handler.write_deletion_index_entry("old", entry)
+        old_timestamp = (datetime.now() - timedelta(days=31)).timestamp()
+        os.utime(cache_handler.get_index_file_path("old"), (old_timestamp, old_timestamp))
+
+        cache_handler.write_deletion_index_entry("new", entry)
+
+        assert not Path(cache_handler.get_index_file_path("old")).exists()
+        assert Path(cache_handler.get_index_file_path("new")).exists()
+
+    def test_default_cache_dir_is_shared_user_cache(self, isolated_user_cache_dir: Path) -> None:
+        assert CacheHandler().cache_dir == str(isolated_user_cache_dir / "twyn")
+
+    def test_default_cache_dir_ignores_relative_xdg_cache_home(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("XDG_CACHE_HOME", "relative/path")
+        assert get_default_cache_dir() == str(Path.home() / ".cache" / "twyn")
+
+    def test_get_stats(self, tmp_path: Path) -> None:
+        cache_handler = CacheHandler(str(tmp_path))
+        cache_handler.write_entry("pypi", CacheEntry(saved_date="2024-12-31", packages={"r": {"requests"}}))
+        cache_handler.write_entry("npm", CacheEntry(saved_date="2024-10-01", packages={"l": {"lodash"}}))
+        corrupt_file = Path(cache_handler.get_cache_file_path("corrupt"))
+        corrupt_file.write_text("not a json")
+
+        stats = cache_handler.get_stats()
+
+        assert stats.cache_dir == str(tmp_path)
+        assert stats.total_size == sum(path.stat().st_size for path in tmp_path.iterdir())
+        entries = {entry.source: entry for entry in stats.entries}
+        assert entries["pypi"].age_days == 1
+        assert entries["pypi"].is_outdated is False
+        assert entries["pypi"].size == Path(cache_handler.get_cache_file_path("pypi")).stat().st_size
+        assert entries["npm"].age_days == 92
+        assert entries["npm"].is_outdated is True
+        assert entries[None].file_path == str(corrupt_file)
+        assert entries[None].is_outdated is True
+
+    def test_get_stats_non_existent_cache_dir(self, tmp_path: Path) -> None:
+        stats = CacheHandler(str(tmp_path / "missing")).get_stats()
+
+        assert stats.entries == []
+        assert stats.total_size == 0
+
     def test_read_nonexistent_file(self) -> None:
         """Test reading non-existent file raises FileNotFoundError."""
         cache_handler = CacheHandler("fakedir")
@@ -55,12 +155,12 @@ class TestCacheHandler:
 
         # Create entries for different sources
         source1 = "pypi"
-        packages1 = {"numpy", "pandas", "requests"}
+        packages1 = {"n": {"numpy"}, "p": {"pandas"}, "r": {"requests"}}
         date1 = datetime.now().date().isoformat()
         entry1 = CacheEntry(saved_date=date1, packages=packages1)
 
         source2 = "pypi2"
-        packages2 = {"test-package", "dev-tools", "beta-lib"}
+        packages2 = {"t": {"test-package"}, "d": {"dev-tools"}, "b": {"beta-lib"}}
         entry2 = CacheEntry(saved_date=datetime.now().date().isoformat(), packages=packages2)
 
         # Write entries to cache
@@ -78,7 +178,7 @@ class TestCacheHandler:
         assert retrieved_entry2.packages == packages2
 
         # Update an entry
-        packages1_new = {"new-package"}
+        packages1_new = {"n": {"new-package"}}
         date1_new = datetime(2025, 1, 2).date().isoformat()
 
         assert date1 != date1_new
@@ -100,7 +200,7 @@ class TestCacheHandler:
         """Test is_entry_outdated returns False for fresh cache entry."""
         # Create a fresh entry (today's date)
         fresh_date = datetime.today().date().isoformat()
-        entry = CacheEntry(saved_date=fresh_date, packages={"package1", "package2"})
+        entry = CacheEntry(saved_date=fresh_date, packages={"p": {"package1", "package2"}})
 
         cache_handler = CacheHandler(str(tmp_path))
 
@@ -110,7 +210,7 @@ class TestCacheHandler:
         """Test is_entry_outdated returns True for old cache entry."""
         # Create an old entry (40 days ago, assuming default retention is 30 days)
         old_date = (datetime.today().date() - timedelta(days=40)).isoformat()
-        entry = CacheEntry(saved_date=old_date, packages={"package1", "package2"})
+        entry = CacheEntry(saved_date=old_date, packages={"p": {"package1", "package2"}})
 
         cache_handler = CacheHandler(str(tmp_path))
 
@@ -128,7 +228,7 @@ class TestCacheHandler:
         # Create multiple cache entries
         sources = ["source1", "source2", "source3"]
         for source in sources:
-            entry = CacheEntry(saved_date="2025-01-01", packages={"package"})
+            entry = CacheEntry(saved_date="2025-01-01", packages={"p": {"package"}})
             cache_handler.write_entry(source, entry)
 
         # Verify files exist
@@ -145,6 +245,36 @@ class TestCacheHandler:
         # Verify cache directory is removed
         assert not tmp_path.exists() or not any(tmp_path.iterdir())
 
+    def test_clear_all_keeps_files_it_did_not_write(self, tmp_path: Path) -> None:
+        """Test clear_all only deletes cache files, as the cache directory may be a project directory."""
+        cache_handler = CacheHandler(str(tmp_path))
+        with cache_handler.lock("pypi"):
+            cache_handler.write_entry("pypi", CacheEntry(saved_date="2025-01-01", packages={"r": {"requests"}}))
+        cache_handler.write_deletion_index_entry(
+            "fingerprint", DeletionIndexEntry(max_distance=2, prefix_length=7, names=[], deletes={})
+        )
+        unrelated_files = [
+            tmp_path / "package-lock.json",
+            tmp_path / "tsconfig.json",
+            tmp_path / "build.lock",
+            tmp_path / "frontend" / "package.json",
+        ]
+        for path in unrelated_files:
+            path.parent.mkdir(exist_ok=True)
+            path.write_text("{}")
+
+        assert cache_handler.get_stats().total_size == sum(
+            path.stat().st_size
+            for path in [
+                Path(cache_handler.get_cache_file_path("pypi")),
+                Path(cache_handler.get_index_file_path("fingerprint")),
+            ]
+        )
+
+        cache_handler.clear_all()
+
+        assert sorted(path for path in tmp_path.rglob("*") if path.is_file()) == sorted(unrelated_files)
+
     def test_clear_all_with_empty_cache_directory(self, tmp_path: Path) -> None:
         """Test clear_all handles empty cache directory gracefully."""
         cache_handler = CacheHandler(str(tmp_path))
@@ -174,13 +304,23 @@ class TestCacheHandler:
         fpath = tmp_path / f"{cache_handler.get_cache_file_path(source)}"
         # Write valid JSON but invalid CacheEntry (missing packages)
         fpath.parent.mkdir(parents=True, exist_ok=True)
-        fpath.write_text('{"saved_date": "2025-01-01"}')
+        fpath.write_text(f'{{"schema_version": {CACHE_SCHEMA_VERSION}, "saved_date": "2025-01-01"}}')
         with caplog.at_level("WARNING"):
             result = cache_handler.get_cache_entry(source)
         assert result is None
         assert any("Could not read cache for source" in m for m in caplog.messages)
         assert not fpath.exists()  # Should be deleted
 
+    def test_get_cache_entry_ignores_other_schema_versions(self, tmp_path: Path) -> None:
+        """Test that entries written with a previous cache layout are ignored."""
+        cache_handler = CacheHandler(str(tmp_path))
+        source = "old-schema"
+        fpath = tmp_path / f"{cache_handler.get_cache_file_path(source)}"
+        fpath.parent.mkdir(parents=True, exist_ok=True)
+        fpath.write_text('{"saved_date": "2025-01-01", "packages": ["requests"]}')
+
+        assert cache_handler.get_cache_entry(source) is None
+
     def test__clear_entry_deletes_file(self, tmp_path):
         cache_handler = CacheHandler(str(tmp_path))
         source = "to-delete"
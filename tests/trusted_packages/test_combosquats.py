@@ -0,0 +1,45 @@
+import pytest
+from twyn.trusted_packages.combosquats import CombosquatDetector
+
+
+class TestCombosquatDetector:
+    @pytest.mark.parametrize(
+        ("dependency", "matches"),
+        [
+            ("requests-toolkit", ["requests"]),
+            ("toolkit_requests", ["requests"]),
+            ("py.requests.extra", ["requests"]),
+            ("numpy-requests", ["numpy", "requests"]),
+            ("requests-requests", ["requests", "requests"]),
+            ("requestsx", []),  # not a whole token
+            ("xrequests-toolkit", []),
+            ("requests", []),  # the trusted name itself
+            ("unrelated", []),
+        ],
+    )
+    def test_find(self, dependency: str, matches: list[str]) -> None:
+        detector = CombosquatDetector({"requests", "numpy", "toolkits"})
+
+        assert detector.find(dependency) == matches
+
+    def test_find_keeps_the_longest_match(self) -> None:
+        detector = CombosquatDetector({"google", "google-cloud", "google-cloud-storage", "storage-utils"})
+
+        assert detector.find("google-cloud-storage-helper") == ["google-cloud-storage"]
+        assert detector.find("google-cloud-storage-utils") == ["google-cloud-storage", "storage-utils"]
+        # Names within a trusted dependency are not reported.
+        assert detector.find("google-cloud-storage") == []
+
+    def test_find_follows_fail_links(self) -> None:
+        # Reading `abcde` leaves the automaton deep in `abcdef`, it has to fall back to find `bcdeg`.
+        detector = CombosquatDetector({"abcdef", "bcdeg"})
+
+        assert detector.find("x.abcdeg") == []
+        assert detector.find("a-bcdeg") == ["bcdeg"]
+
+    def test_short_names_are_not_indexed(self) -> None:
+        detector = CombosquatDetector({"six", "attrs", "boto3"})
+
+        assert detector.find("six-utils") == []
+        assert detector.find("attrs-utils") == ["attrs"]
+        assert all(name != "six" for name in detector.names)
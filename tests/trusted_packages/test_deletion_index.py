@@ -0,0 +1,53 @@
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from rapidfuzz.distance import DamerauLevenshtein
+from twyn.trusted_packages.cache_handler import CacheHandler
+from twyn.trusted_packages.deletion_index import DeletionIndex, get_deletions
+
+NAMES = ["requests", "urllib3", "numpy", "pandas", "django", "flask", "boto3", "botocore", "requests-oauthlib"]
+
+
+class TestDeletionIndex:
+    def test_get_deletions(self) -> None:
+        assert get_deletions("abc", 1) == {"abc", "bc", "ac", "ab"}
+        assert get_deletions("abc", 2) == {"abc", "bc", "ac", "ab", "a", "b", "c"}
+
+    @pytest.mark.parametrize(
+        "name",
+        ["reqeusts", "requets", "rrquests", "requestss", "nunpy", "numpyy", "dajngo", "djangooo", "boto", "flsk", "x"],
+    )
+    def test_lookup_finds_all_names_within_max_distance(self, name: str) -> None:
+        index = DeletionIndex.from_names(NAMES)
+
+        expected = {
+            trusted for trusted in NAMES if DamerauLevenshtein.distance(name, trusted) <= DeletionIndex.MAX_DISTANCE
+        }
+        assert expected <= set(index.lookup(name))
+
+    def test_lookup_only_probes_nearby_names(self) -> None:
+        index = DeletionIndex.from_names(NAMES)
+
+        assert index.lookup("requets") == ["requests", "requests-oauthlib"]
+        assert index.lookup("somethingelse") == []
+
+    def test_index_is_stored_in_cache(self, tmp_path: Path) -> None:
+        cache_handler = CacheHandler(str(tmp_path))
+        index = DeletionIndex.from_names(NAMES, cache_handler)
+
+        with patch.object(DeletionIndex, "_build") as mock_build:
+            cached_index = DeletionIndex.from_names(reversed(NAMES), cache_handler)
+
+        assert not mock_build.called
+        assert cached_index.names == index.names
+        assert cached_index.deletes == index.deletes
+
+    def test_index_is_rebuilt_for_different_names(self, tmp_path: Path) -> None:
+        cache_handler = CacheHandler(str(tmp_path))
+        DeletionIndex.from_names(NAMES, cache_handler)
+
+        index = DeletionIndex.from_names(["lodash"], cache_handler)
+
+        assert index.lookup("lodahs") == ["lodash"]
+        assert len(list((tmp_path / "indexes").iterdir())) == 2
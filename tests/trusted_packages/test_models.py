@@ -4,6 +4,7 @@ from twyn.trusted_packages.models import (
     TyposquatCheckResultEntry,
     TyposquatCheckResultFromSource,
     TyposquatCheckResults,
+    TyposquatFinding,
 )
 
 
@@ -19,6 +20,18 @@ class TestModels:
         with pytest.raises(ValidationError):
             TyposquatCheckResultEntry(dependency=None)
 
+    def test_typosquat_finding_bool_and_to_result_entry(self) -> None:
+        finding = TyposquatFinding(dependency="left-pad")
+        assert not finding
+        assert not hasattr(finding, "__dict__")  # records are slotted
+        finding.add("leftpad")
+        finding.add_combosquat("left")
+        assert finding
+
+        assert finding.to_result_entry() == TyposquatCheckResultEntry(
+            dependency="left-pad", similars=["leftpad"], combosquats=["left"]
+        )
+
     def test_typosquat_check_result_from_source_bool_contains_get_typosquats(self) -> None:
         entry1 = TyposquatCheckResultEntry(dependency="foo", similars=["fou"])
         entry2 = TyposquatCheckResultEntry(dependency="baz", similars=["bar"])
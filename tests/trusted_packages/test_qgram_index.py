@@ -0,0 +1,80 @@
+import random
+import string
+
+import pytest
+from rapidfuzz.distance import DamerauLevenshtein
+from twyn.similarity.algorithm import EditDistance, SimilarityThreshold
+from twyn.trusted_packages.managers.trusted_pypi_packages_manager import TrustedPackages
+from twyn.trusted_packages.qgram_index import QGramIndex
+from twyn.trusted_packages.selectors import AllSimilar, QGramNeighbourhood
+
+NAMES = [
+    "requests",
+    "requests-oauthlib",
+    "urllib3",
+    "numpy",
+    "django",
+    "mypy-boto3-s3",
+    "mypy-boto3-ec2",
+    "google-cloud-storage",
+    "google-cloud-core",
+]
+
+
+class TestQGramIndex:
+    @pytest.mark.parametrize(
+        "name", ["reqeusts", "requets", "requestss", "nunpy", "dajngo", "mypy-boto3-s4", "google-cloud-stroage"]
+    )
+    @pytest.mark.parametrize("q", [2, 3])
+    def test_lookup_returns_names_within_max_distance(self, name: str, q: int) -> None:
+        index = QGramIndex.from_names(NAMES, q)
+
+        candidates = index.lookup(name, 2)
+
+        assert {trusted for trusted in NAMES if DamerauLevenshtein.distance(name, trusted) <= 2} <= set(candidates)
+
+    def test_lookup_filters_names_without_enough_shared_qgrams(self) -> None:
+        index = QGramIndex.from_names(NAMES)
+
+        assert index.lookup("reqeusts", 2) == ["requests"]
+        assert index.lookup("google-cloud-stroage", 2) == ["google-cloud-storage"]
+        assert index.lookup("somethingelse", 2) == []
+
+    def test_lookup_filters_by_length_when_no_qgram_needs_to_be_shared(self) -> None:
+        index = QGramIndex.from_names(["ab", "xyz", "abcdef"])
+
+        assert index.lookup("ba", 1) == ["ab", "xyz"]
+
+    def test_lookup_does_not_miss_transpositions(self) -> None:
+        """Check that transpositions, which change one more q-gram than other edits, are accounted for."""
+        index = QGramIndex.from_names(["abcdefgh"], q=2)
+
+        assert index.lookup("bacdefhg", 2) == ["abcdefgh"]
+
+    @pytest.mark.parametrize("q", [2, 3])
+    def test_lookup_never_misses_names_on_random_names(self, q: int) -> None:
+        rng = random.Random(1234)
+        alphabet = string.ascii_lowercase[:5] + "-"
+        names = {"".join(rng.choices(alphabet, k=rng.randint(1, 12))) for _ in range(500)}
+        index = QGramIndex.from_names(names, q)
+
+        for _ in range(200):
+            name = "".join(rng.choices(alphabet, k=rng.randint(1, 12)))
+            for max_distance in (1, 2):
+                assert {
+                    trusted for trusted in names if DamerauLevenshtein.distance(name, trusted) <= max_distance
+                } <= set(index.lookup(name, max_distance))
+
+
+class TestQGramNeighbourhood:
+    @pytest.mark.parametrize(
+        "name", ["reqeusts", "requets", "nunpy", "numpy", "dajngo", "mypy-boto3-s4", "google-cloud-stroage", "xyz"]
+    )
+    def test_finds_the_same_typosquats_as_all(self, name: str) -> None:
+        def get_typosquat(selector: AllSimilar | QGramNeighbourhood) -> set[str]:
+            trusted_packages = TrustedPackages(
+                names=NAMES, algorithm=EditDistance(), selector=selector, threshold_class=SimilarityThreshold
+            )
+            return set(trusted_packages.get_typosquat(name).similars)
+
+        assert get_typosquat(QGramNeighbourhood()) == get_typosquat(AllSimilar())
@@ -1,10 +1,13 @@
+import multiprocessing
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
+from typing import Any
 from unittest.mock import Mock, patch
 
 import pytest
-import requests
 from freezegun import freeze_time
 from twyn.trusted_packages import TopNpmReference, TopPyPiReference
 from twyn.trusted_packages.cache_handler import CacheEntry, CacheHandler
@@ -18,6 +21,19 @@ from twyn.trusted_packages.references.base import AbstractPackageReference, Norm
 from tests.conftest import patch_npm_packages_download, patch_pypi_packages_download
 
 
+def _get_packages_in_subprocess(cache_dir: str, downloads_dir: str) -> list[str]:
+    """Retrieve the trusted packages from a different process, recording every download that takes place."""
+
+    def _slow_download(self: TopPyPiReference) -> dict[str, Any]:
+        Path(downloads_dir, str(os.getpid())).touch()
+        time.sleep(0.5)
+        return {"packages": ["requests", "Django", "numpy"]}
+
+    with patch.object(TopPyPiReference, "_download", _slow_download):
+        packages = TopPyPiReference(source="pypi", cache_handler=CacheHandler(cache_dir)).get_packages()
+    return sorted(packages)
+
+
 class TestAbstractPackageReference:
     class DummyPackageReference(AbstractPackageReference):
         """Returns always the same packages, used for testing the interface."""
@@ -39,14 +55,14 @@ class TestAbstractPackageReference:
         packages = ["requests", "flask", "django", "fastapi"]
 
         cache_handler = CacheHandler(str(tmp_path / "cache"))
-        cache_entry = CacheEntry(saved_date="2025-08-18", packages=packages)
+        cache_entry = TopPyPiReference.normalize_packages(set(packages)).to_cache_entry(saved_date="2025-08-18")
         cache_handler.write_entry(source="pypi", data=cache_entry)
 
         # Verify the cache entry was saved and can be retrieved
         retrieved_cache_entry = cache_handler.get_cache_entry("pypi")
         assert retrieved_cache_entry is not None
         assert retrieved_cache_entry.saved_date == "2025-08-18"
-        assert retrieved_cache_entry.packages == set(packages)
+        assert retrieved_cache_entry.packages == {"r": {"requests"}, "f": {"flask", "fastapi"}, "d": {"django"}}
 
         with patch_pypi_packages_download(packages) as m_pypi:
             result = TopPyPiReference("pypi", cache_handler=cache_handler).get_packages()
@@ -54,6 +70,23 @@ class TestAbstractPackageReference:
         assert m_pypi.call_count == 0
         assert set(result) == {"flask", "fastapi", "requests", "django"}
 
+    def test_concurrent_processes_download_packages_once(self, tmp_path: Path) -> None:
+        """Test that concurrent processes sharing a cache directory wait for a single download and reuse it."""
+        cache_dir = tmp_path / "cache"
+        downloads_dir = tmp_path / "downloads"
+        downloads_dir.mkdir()
+        workers = 4
+
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+            futures = [
+                executor.submit(_get_packages_in_subprocess, str(cache_dir), str(downloads_dir)) for _ in range(workers)
+            ]
+            results = [future.result() for future in futures]
+
+        assert len(list(downloads_dir.iterdir())) == 1
+        assert all(result == ["django", "numpy", "requests"] for result in results)
+        assert list(cache_dir.glob("*.tmp")) == []
+
     def test_get_packages_no_cache(self) -> None:
         """Test that when use_cache is False, cache is not read or written, and packages are retrieved."""
         test_packages = ["numpy", "requests", "django"]
@@ -79,7 +112,9 @@ class TestAbstractPackageReference:
         saved_date = (now - timedelta(days=29, hours=16, minutes=48)).isoformat()  # 29.7 days ago
 
         cache_handler = CacheHandler(str(tmp_path / "cache"))
-        cache_handler.write_entry(source="pypi", data=CacheEntry(saved_date=saved_date, packages=packages))
+        cache_handler.write_entry(
+            source="pypi", data=CacheEntry(saved_date=saved_date, packages={"n": {"numpy"}, "r": {"requests"}})
+        )
 
         with freeze_time(now), patch_pypi_packages_download(["should_not_be_used"]) as mock_download:
             ref = TopPyPiReference(source="pypi", cache_handler=cache_handler)
@@ -126,14 +161,12 @@ class TestAbstractPackageReference:
         # The packages were saved to the cache file, with its associated metadata
         cache_content = cache_handler.get_cache_entry("pypi")
 
-        assert set(cache_content.packages) == set(cached_packages)
+        assert cache_content.packages == {"n": {"numpy"}, "r": {"requests"}, "d": {"django"}}
         assert cache_content.saved_date == "2025-08-21"
 
     @patch("requests.get")
     def test__download_json_exception(self, mock_get: Mock) -> None:
-        mock_get.return_value.json.side_effect = requests.exceptions.JSONDecodeError(
-            "This exception will be mapped and never shown", "", 1
-        )
+        mock_get.return_value.content = b"not json"
         top_pypi = TopPyPiReference(source="foo", cache_handler=CacheHandler())
 
         with pytest.raises(
@@ -142,8 +175,8 @@ class TestAbstractPackageReference:
         ):
             top_pypi._download()
 
-    def test_get_packages_no_packages_key(self) -> None:
-        top_pypi = TopPyPiReference(source="foo", cache_handler=CacheHandler())
+    def test_get_packages_no_packages_key(self, tmp_path: Path) -> None:
+        top_pypi = TopPyPiReference(source="foo", cache_handler=CacheHandler(str(tmp_path / "cache")))
 
         with patch("twyn.trusted_packages.TopPyPiReference._download") as mock_download:
             mock_download.return_value = {}
@@ -181,19 +214,23 @@ class TestTopPyPiReference:
             "My.Package",
         ],
     )
-    @patch("twyn.trusted_packages.TopPyPiReference._get_packages_from_cache_if_enabled")
-    def test_normalize_package_when_loaded_from_cache(
-        self, mock_get_packages_from_cache: Mock, package_name: Mock, tmp_path: Path
-    ) -> None:
-        mock_get_packages_from_cache.return_value = {package_name}
+    @freeze_time("2025-8-21")
+    def test_normalize_package_when_loaded_from_cache(self, package_name: str, tmp_path: Path) -> None:
+        """Test that the cache stores normalized packages, so they are not normalized again when loaded."""
+        cache_handler = CacheHandler(str(tmp_path / "cache"))
+        with patch_pypi_packages_download([package_name]) as m_pypi:
+            TopPyPiReference(cache_handler=cache_handler).get_packages()
 
-        with patch_pypi_packages_download([]) as m_pypi:
-            ref = TopPyPiReference(cache_handler=CacheHandler(str(tmp_path / "cache")))
-            packages = ref.get_packages()
+        with (
+            patch_pypi_packages_download([]) as m_pypi,
+            patch("twyn.trusted_packages.TopPyPiReference.normalize_packages") as m_normalize,
+        ):
+            packages = TopPyPiReference(cache_handler=cache_handler).get_packages()
 
         assert set(packages) == {"my-package"}
+        assert packages.packages_by_first_letter == {"m": {"my-package"}}
         assert m_pypi.call_count == 0
-        assert mock_get_packages_from_cache.call_count == 1
+        assert m_normalize.call_count == 0
 
     @pytest.mark.parametrize(
         "package_name",
@@ -208,7 +245,7 @@ class TestTopPyPiReference:
     def test_normalize_package_when_downloaded(
         self, mock_get_packages_from_cache: Mock, package_name: Mock, tmp_path: Path
     ) -> None:
-        mock_get_packages_from_cache.return_value = set()
+        mock_get_packages_from_cache.return_value = None
 
         with patch_pypi_packages_download([package_name]) as m_pypi:
             ref = TopPyPiReference()
@@ -238,10 +275,18 @@ class TestTopNpmReference:
         assert set(packages) == {"foo", "bar", "react", "express", "lodash", "@aws/sdk"}
         assert m_npm.call_count == 1
 
-        # Verify cache entry was created with all packages in their original form
+        # Verify cache entry was created with all packages in their normalized form
         cache_entry = cache_handler.get_cache_entry(ref.source)
         assert cache_entry is not None
-        assert cache_entry.packages == {"foo", "bar", "react", "express", "lodash", "@aws/sdk"}
+        assert cache_entry.packages == {"f": {"foo"}, "b": {"bar"}, "r": {"react"}, "e": {"express"}, "l": {"lodash"}}
+        assert cache_entry.namespaces == {"@aws": {"sdk"}}
+
+        # Packages loaded from the cache are the same as the downloaded ones
+        with patch_npm_packages_download([]) as m_npm:
+            cached_packages = TopNpmReference(cache_handler=cache_handler).get_packages()
+
+        assert m_npm.call_count == 0
+        assert set(cached_packages) == set(packages)
 
     def test_normalize_package_invalid_name_raises(self) -> None:
         ref = TopNpmReference()
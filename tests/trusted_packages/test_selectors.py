@@ -1,10 +1,28 @@
+import gc
+import pickle
+import random
+import weakref
+from collections.abc import Callable
+from unittest.mock import patch
+
 import pytest
+from twyn.similarity.algorithm import AbstractSimilarityAlgorithm, EditDistance, SimilarityThreshold
+from twyn.similarity.confusables import ConfusableEditDistance
+from twyn.trusted_packages.constants import ADJACENCY_MATRIX
+from twyn.trusted_packages.deletion_index import DeletionIndex
 from twyn.trusted_packages.exceptions import CharacterNotInMatrixError
+from twyn.trusted_packages.managers.trusted_pypi_packages_manager import TrustedPackages
+from twyn.trusted_packages.qgram_index import QGramIndex
 from twyn.trusted_packages.selectors import (
+    AbstractSelector,
     AllSimilar,
+    DeletionNeighbourhood,
     FirstLetterExact,
     FirstLetterNearbyInKeyboard,
+    QGramNeighbourhood,
+    TrieNeighbourhood,
 )
+from twyn.trusted_packages.trie import NameTrie
 
 NAMES = {"f": {"foo", "ffoo"}, "b": {"bar"}, "z": {"zoo"}, "d": {"dellows"}}
 
@@ -54,3 +72,141 @@ class TestAllSimilar:
             "bar",
             "zoo",
         }
+
+
+class TestDeletionNeighbourhood:
+    def test_select_similar_names(self):
+        selector = DeletionNeighbourhood()
+        assert set(selector.select_similar_names(NAMES, "fellows")) == {"dellows"}
+        assert set(selector.select_similar_names(NAMES, "fo")) == {"foo", "ffoo", "zoo"}
+
+    def test_index_is_built_once_per_names(self):
+        selector = DeletionNeighbourhood()
+        with patch.object(DeletionIndex, "from_names", wraps=DeletionIndex.from_names) as mock_from_names:
+            selector.select_similar_names(NAMES, "fellows")
+            selector.select_similar_names(NAMES, "zoo")
+            selector.select_similar_names({"b": {"bar"}}, "baz")
+
+        assert mock_from_names.call_count == 2
+
+    def test_can_be_pickled(self):
+        selector = DeletionNeighbourhood()
+        selector.select_similar_names(NAMES, "fellows")
+
+        unpickled_selector = pickle.loads(pickle.dumps(selector))
+
+        assert set(unpickled_selector.select_similar_names(NAMES, "fellows")) == {"dellows"}
+
+
+class TestTrieNeighbourhood:
+    def test_select_similar_names(self):
+        selector = TrieNeighbourhood()
+        assert list(selector.select_similar_names(NAMES, "fellows")) == ["dellows"]
+        assert list(selector.select_similar_names(NAMES, "fo")) == ["foo"]
+
+    def test_index_is_built_once_per_names(self):
+        selector = TrieNeighbourhood()
+        with patch.object(NameTrie, "from_names", wraps=NameTrie.from_names) as mock_from_names:
+            selector.select_similar_names(NAMES, "fellows")
+            selector.select_similar_names(NAMES, "zoo")
+            selector.select_similar_names({"b": {"bar"}}, "baz")
+
+        assert mock_from_names.call_count == 2
+
+    def test_can_be_pickled(self):
+        selector = TrieNeighbourhood()
+        selector.select_similar_names(NAMES, "fellows")
+
+        unpickled_selector = pickle.loads(pickle.dumps(selector))
+
+        assert list(unpickled_selector.select_similar_names(NAMES, "fellows")) == ["dellows"]
+
+
+class TestQGramNeighbourhood:
+    def test_select_similar_names(self):
+        selector = QGramNeighbourhood()
+        assert list(selector.select_similar_names(NAMES, "fellows")) == ["dellows"]
+        # Names this short may not share any q-gram within the threshold, so only their length is filtered.
+        assert list(selector.select_similar_names(NAMES, "fo")) == ["bar", "foo", "zoo"]
+
+    def test_index_is_built_once_per_names(self):
+        selector = QGramNeighbourhood()
+        with patch.object(QGramIndex, "from_names", wraps=QGramIndex.from_names) as mock_from_names:
+            selector.select_similar_names(NAMES, "fellows")
+            selector.select_similar_names(NAMES, "zoo")
+            selector.select_similar_names({"b": {"bar"}}, "baz")
+
+        assert mock_from_names.call_count == 2
+
+    def test_can_be_pickled(self):
+        selector = QGramNeighbourhood()
+        selector.select_similar_names(NAMES, "fellows")
+
+        unpickled_selector = pickle.loads(pickle.dumps(selector))
+
+        assert list(unpickled_selector.select_similar_names(NAMES, "fellows")) == ["dellows"]
+
+    def test_only_keeps_the_index_of_the_last_names(self):
+        selector = QGramNeighbourhood()
+        names = {"b": {"bar"}}
+        selector.select_similar_names(names, "baz")
+        index = weakref.ref(selector._get_index(names))
+
+        selector.select_similar_names(NAMES, "fellows")
+        gc.collect()
+
+        assert index() is None
+
+    def test_copy_does_not_share_the_index(self):
+        selector = QGramNeighbourhood()
+        selector.select_similar_names(NAMES, "fellows")
+
+        copied_selector = selector.copy()
+
+        assert isinstance(copied_selector, QGramNeighbourhood)
+        assert copied_selector._indexed_names is None
+
+
+def _get_keyboard_edit_distance() -> AbstractSimilarityAlgorithm:
+    pytest.importorskip("numpy")
+    from twyn.similarity.keyboard_distance import KeyboardEditDistance  # noqa: PLC0415
+
+    return KeyboardEditDistance()
+
+
+class TestIndexedSelectors:
+    @pytest.mark.parametrize(
+        "get_algorithm",
+        [EditDistance, ConfusableEditDistance, _get_keyboard_edit_distance],
+        ids=["edit", "confusable", "keyboard"],
+    )
+    @pytest.mark.parametrize("selector_class", [DeletionNeighbourhood, TrieNeighbourhood, QGramNeighbourhood])
+    def test_find_the_same_typosquats_as_all(
+        self, selector_class: type[AbstractSelector], get_algorithm: Callable[[], AbstractSimilarityAlgorithm]
+    ) -> None:
+        """Check that the candidates left out by the index are never within the threshold of the algorithm.
+
+        Typos made of several adjacent keys are cheaper than other edits for the keyboard distance, so they can be
+        within its threshold while having more edits than the other algorithms allow.
+        """
+        rng = random.Random(1234)
+        alphabet = "qwertasdfg1"
+        names = {"".join(rng.choices(alphabet, k=rng.randint(3, 10))) for _ in range(300)}
+        dependencies = set()
+        for name in sorted(names)[:100]:
+            typo = list(name)
+            for position in rng.sample(range(len(typo)), k=min(len(typo), rng.randint(1, 4))):
+                typo[position] = rng.choice(ADJACENCY_MATRIX[typo[position]])
+            dependencies.add("".join(typo))
+        algorithm = get_algorithm()
+
+        def get_typosquats(selector: AbstractSelector) -> dict[str, set[str]]:
+            trusted_packages = TrustedPackages(
+                names=names, algorithm=algorithm, selector=selector, threshold_class=SimilarityThreshold
+            )
+            return {dependency: set(trusted_packages.get_typosquat(dependency).similars) for dependency in dependencies}
+
+        typosquats = get_typosquats(AllSimilar())
+
+        assert any(typosquats.values())
+        assert get_typosquats(selector_class()) == typosquats
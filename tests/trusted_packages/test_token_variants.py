@@ -0,0 +1,41 @@
+import pytest
+from twyn.trusted_packages.token_variants import get_token_keys, get_token_variants, group_by_token_keys
+
+
+class TestTokenVariants:
+    @pytest.mark.parametrize(
+        ("name", "expected_keys"),
+        [
+            ("requests", {"requests"}),
+            ("python-dateutil", {"dateutil-python", "pythondateutil"}),
+            ("dateutil_python", {"dateutil-python", "dateutilpython"}),
+            ("zope.interface", {"interface-zope", "zopeinterface"}),
+            ("@types/react-dom", {"@types/dom-react", "@types/reactdom"}),
+            ("bitnami/redis_exporter", {"bitnami/exporter-redis", "bitnami/redisexporter"}),
+        ],
+    )
+    def test_get_token_keys(self, name: str, expected_keys: set[str]) -> None:
+        assert get_token_keys(name) == expected_keys
+
+    def test_group_by_token_keys(self) -> None:
+        assert group_by_token_keys(["python-dateutil", "pythondateutil", "numpy"]) == {
+            "dateutil-python": {"python-dateutil"},
+            "pythondateutil": {"python-dateutil", "pythondateutil"},
+            "numpy": {"numpy"},
+        }
+
+    @pytest.mark.parametrize(
+        ("name", "variants"),
+        [
+            ("dateutil-python", {"python-dateutil"}),
+            ("pythondateutil", {"python-dateutil"}),
+            ("python-dateutil", set()),  # the name itself
+            ("dateutilpython", set()),  # reordered and without separators
+            ("node/@types", set()),  # namespaces are not tokens
+            ("@types/nod-e", {"@types/node"}),
+        ],
+    )
+    def test_get_token_variants(self, name: str, variants: set[str]) -> None:
+        names_by_token_key = group_by_token_keys(["python-dateutil", "numpy", "@types/node"])
+
+        assert get_token_variants(names_by_token_key, name) == variants
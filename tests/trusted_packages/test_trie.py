@@ -0,0 +1,71 @@
+import random
+import string
+
+import pytest
+from rapidfuzz.distance import DamerauLevenshtein
+from twyn.similarity.algorithm import EditDistance, SimilarityThreshold
+from twyn.trusted_packages.managers.trusted_pypi_packages_manager import TrustedPackages
+from twyn.trusted_packages.selectors import AllSimilar, TrieNeighbourhood
+from twyn.trusted_packages.trie import NameTrie
+
+NAMES = [
+    "requests",
+    "requests-oauthlib",
+    "urllib3",
+    "numpy",
+    "django",
+    "mypy-boto3-s3",
+    "mypy-boto3-ec2",
+    "mypy-boto3-sqs",
+    "google-cloud-storage",
+    "google-cloud-core",
+]
+
+
+class TestNameTrie:
+    @pytest.mark.parametrize(
+        "name",
+        ["reqeusts", "requets", "requestss", "nunpy", "dajngo", "mypy-boto3-s4", "google-cloud-stroage", "x", ""],
+    )
+    @pytest.mark.parametrize("max_distance", [0, 1, 2, 3])
+    def test_lookup_finds_names_within_max_distance(self, name: str, max_distance: int) -> None:
+        trie = NameTrie.from_names(NAMES)
+
+        assert trie.lookup(name, max_distance) == sorted(
+            trusted for trusted in NAMES if DamerauLevenshtein.distance(name, trusted) <= max_distance
+        )
+
+    def test_lookup_handles_transpositions_with_edits_in_between(self) -> None:
+        """Check that distances are not restricted to adjacent transpositions (optimal string alignment)."""
+        trie = NameTrie.from_names(["abc"])
+
+        assert DamerauLevenshtein.distance("ca", "abc") == 2
+        assert trie.lookup("ca", 2) == ["abc"]
+        assert trie.lookup("ca", 1) == []
+
+    def test_lookup_matches_damerau_levenshtein_on_random_names(self) -> None:
+        rng = random.Random(1234)
+        alphabet = string.ascii_lowercase[:5] + "-"
+        names = {"".join(rng.choices(alphabet, k=rng.randint(1, 9))) for _ in range(500)}
+        trie = NameTrie.from_names(names)
+
+        for _ in range(200):
+            name = "".join(rng.choices(alphabet, k=rng.randint(1, 10)))
+            for max_distance in (1, 2):
+                assert trie.lookup(name, max_distance) == sorted(
+                    trusted for trusted in names if DamerauLevenshtein.distance(name, trusted) <= max_distance
+                )
+
+
+class TestTrieNeighbourhood:
+    @pytest.mark.parametrize(
+        "name", ["reqeusts", "requets", "nunpy", "numpy", "dajngo", "mypy-boto3-s4", "google-cloud-stroage", "xyz"]
+    )
+    def test_finds_the_same_typosquats_as_all(self, name: str) -> None:
+        def get_typosquat(selector: AllSimilar | TrieNeighbourhood) -> set[str]:
+            trusted_packages = TrustedPackages(
+                names=NAMES, algorithm=EditDistance(), selector=selector, threshold_class=SimilarityThreshold
+            )
+            return set(trusted_packages.get_typosquat(name).similars)
+
+        assert get_typosquat(TrieNeighbourhood()) == get_typosquat(AllSimilar())
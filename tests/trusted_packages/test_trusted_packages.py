@@ -5,11 +5,14 @@ from twyn.similarity.algorithm import (
     EditDistance,
     SimilarityThreshold,
 )
-from twyn.trusted_packages.managers.trusted_pypi_packages_manager import (
-    TrustedPackages,
-    TyposquatCheckResultEntry,
-)
+from twyn.similarity.confusables import ConfusableEditDistance
+from twyn.trusted_packages.managers.trusted_dockerhub_packages_manager import TrustedDockerHubPackageManager
+from twyn.trusted_packages.managers.trusted_npm_packages_manager import TrustedNpmPackageManager
+from twyn.trusted_packages.managers.trusted_pypi_packages_manager import TrustedPackages
+from twyn.trusted_packages.models import TyposquatFinding
+from twyn.trusted_packages.references.base import NormalizedPackages
 from twyn.trusted_packages.selectors import (
+    AllSimilar,
     FirstLetterExact,
     FirstLetterNearbyInKeyboard,
 )
@@ -42,6 +45,22 @@ class TestTrustedPackages:
             "z": {"zoo"},
         }
 
+    def test_tree_representation_from_normalized_packages(self):
+        """Test that the grouping already computed by the normalized packages is reused."""
+        normalized_packages = NormalizedPackages(packages={"foo", "ffoo", "bar", "zoo"})
+        trusted_packages = TrustedPackages(
+            names=normalized_packages,
+            algorithm=Mock(),
+            selector=Mock(),
+            threshold_class=Mock(),
+        )
+        assert trusted_packages.names == {
+            "f": {"foo", "ffoo"},
+            "b": {"bar"},
+            "z": {"zoo"},
+        }
+        assert trusted_packages.names == normalized_packages.packages_by_first_letter
+
     @pytest.mark.parametrize(
         ("package_name", "trusted_packages", "selector", "matches"),
         [
@@ -117,6 +136,288 @@ class TestTrustedPackages:
             threshold_class=SimilarityThreshold,
         )
 
-        assert trusted_packages.get_typosquat(package_name=package_name) == TyposquatCheckResultEntry(
+        assert trusted_packages.get_typosquat(package_name=package_name) == TyposquatFinding(
             dependency=package_name, similars=matches
         )
+
+    @pytest.mark.parametrize(
+        "names",
+        [{"matplotlib", "numpy", "mathplot"}, NormalizedPackages(packages={"matplotlib", "numpy", "mathplot"})],
+    )
+    def test_get_typosquat_finds_lookalikes_in_skeleton_index(self, names: set[str]) -> None:
+        algorithm = Mock(wraps=ConfusableEditDistance())
+        algorithm.DETECTS_LOOKALIKES = True
+        trusted_packages = TrustedPackages(
+            names=names, algorithm=algorithm, selector=FirstLetterExact(), threshold_class=SimilarityThreshold
+        )
+
+        # `rn` in place of `m` starts with another letter, so the lookalike is only found through the index.
+        assert trusted_packages.get_typosquat("rnatplotlib") == TyposquatFinding(
+            dependency="rnatplotlib", similars=["matplotlib"]
+        )
+        assert trusted_packages.get_typosquat("matp1otlib") == TyposquatFinding(
+            dependency="matp1otlib", similars=["matplotlib"]
+        )
+        # Lookalikes are not compared again.
+        algorithm.get_distances.assert_called_with("matp1otlib", ["mathplot"], max_distance=2.0)
+
+    def test_get_typosquat_does_not_look_up_lookalikes_without_confusable_algorithm(self) -> None:
+        trusted_packages = TrustedPackages(
+            names={"matplotlib"}, algorithm=EditDistance(), selector=AllSimilar(), threshold_class=SimilarityThreshold
+        )
+
+        assert not trusted_packages.get_typosquat("rnatp1otlib")
+        assert "names_by_skeleton" not in vars(trusted_packages)
+
+    def test_prepare_builds_skeleton_index_for_confusable_algorithm(self) -> None:
+        trusted_packages = TrustedPackages(
+            names={"matplotlib", "numpy"},
+            algorithm=ConfusableEditDistance(),
+            selector=AllSimilar(),
+            threshold_class=SimilarityThreshold,
+        )
+
+        trusted_packages.prepare()
+
+        assert vars(trusted_packages)["names_by_skeleton"] == {"matplotlib": {"matplotlib"}, "numpy": {"numpy"}}
+
+    @pytest.mark.parametrize(
+        "names",
+        [{"python-dateutil", "numpy"}, NormalizedPackages(packages={"python-dateutil", "numpy"})],
+    )
+    @pytest.mark.parametrize("package_name", ["dateutil-python", "pythondateutil"])
+    def test_get_typosquat_finds_token_variants(self, names: set[str], package_name: str) -> None:
+        algorithm = Mock(wraps=EditDistance())
+        trusted_packages = TrustedPackages(
+            names=names,
+            algorithm=algorithm,
+            selector=AllSimilar(),
+            threshold_class=SimilarityThreshold,
+            detect_token_variants=True,
+        )
+
+        # Both are more than two edits away, but made of the same tokens.
+        assert trusted_packages.get_typosquat(package_name) == TyposquatFinding(
+            dependency=package_name, similars=["python-dateutil"]
+        )
+        # Variants are not compared again.
+        algorithm.get_distances.assert_called_once_with(package_name, ["numpy"], max_distance=2.0)
+
+    def test_get_typosquat_does_not_find_token_variants_by_default(self) -> None:
+        trusted_packages = TrustedPackages(
+            names={"python-dateutil"},
+            algorithm=EditDistance(),
+            selector=AllSimilar(),
+            threshold_class=SimilarityThreshold,
+        )
+
+        assert not trusted_packages.get_typosquat("dateutil-python")
+        assert "names_by_token_key" not in vars(trusted_packages)
+
+    def test_get_typosquat_finds_combosquats(self) -> None:
+        trusted_packages = TrustedPackages(
+            names={"requests", "numpy", "six"},
+            algorithm=EditDistance(),
+            selector=AllSimilar(),
+            threshold_class=SimilarityThreshold,
+            detect_combosquats=True,
+        )
+
+        assert trusted_packages.get_typosquat("requests-toolkit") == TyposquatFinding(
+            dependency="requests-toolkit", combosquats=["requests"]
+        )
+        assert trusted_packages.get_typosquat("reqests") == TyposquatFinding(
+            dependency="reqests", similars=["requests"]
+        )
+        # `six` is too short to be looked for.
+        assert not trusted_packages.get_typosquat("six-helper")
+
+    def test_get_typosquat_does_not_find_combosquats_by_default(self) -> None:
+        trusted_packages = TrustedPackages(
+            names={"requests"}, algorithm=EditDistance(), selector=AllSimilar(), threshold_class=SimilarityThreshold
+        )
+
+        assert trusted_packages.combosquat_detector is None
+        assert not trusted_packages.get_typosquat("requests-toolkit")
+
+
+class TestTrustedDockerHubPackageManager:
+    def test_image_index(self) -> None:
+        trusted_packages = TrustedDockerHubPackageManager(
+            names={"bitnami/redis", "bitnami/nginx", "grafana/grafana", "nginx", "redis"},
+            algorithm=Mock(),
+            selector=Mock(),
+            threshold_class=Mock(),
+        )
+
+        assert {image: set(namespaces) for image, namespaces in trusted_packages.namespaces_by_image.items()} == {
+            "redis": {"bitnami", ""},
+            "nginx": {"bitnami", ""},
+            "grafana": {"grafana"},
+        }
+
+    @pytest.mark.parametrize(
+        ("package_name", "matches"),
+        [
+            ("bitnamii/redis", ["bitnami/redis"]),  # namespace typo, the image is published by the namespace
+            ("grafanna/redis", []),  # namespace typo, but the namespace does not publish the image
+            ("bitnami/redis", []),  # trusted image, distance is 0
+            ("bitnamii/unknown", []),  # no trusted namespace publishes the image
+        ],
+    )
+    def test_get_typosquat(self, package_name: str, matches: list[str]) -> None:
+        trusted_packages = TrustedDockerHubPackageManager(
+            names={"bitnami/redis", "grafana/grafana", "grafana/loki"},
+            algorithm=EditDistance(),
+            selector=AllSimilar(),
+            threshold_class=SimilarityThreshold,
+        )
+
+        assert trusted_packages.get_typosquat(package_name=package_name) == TyposquatFinding(
+            dependency=package_name, similars=matches
+        )
+
+    def test_get_typosquat_only_compares_namespaces_publishing_the_image(self) -> None:
+        algorithm = Mock(wraps=EditDistance())
+        trusted_packages = TrustedDockerHubPackageManager(
+            names={"bitnami/redis", "grafana/grafana", "grafana/loki", "prom/prometheus"},
+            algorithm=algorithm,
+            selector=AllSimilar(),
+            threshold_class=SimilarityThreshold,
+        )
+
+        trusted_packages.get_typosquat("grafanaa/loki")
+
+        algorithm.get_distances.assert_called_once_with("grafanaa", ["grafana"], max_distance=2.0)
+
+    @pytest.mark.parametrize(
+        "names",
+        [
+            {"bitnami/redis-exporter", "bitnami/redis", "nginx"},
+            NormalizedPackages(packages={"nginx"}, namespaces={"bitnami": {"redis-exporter", "redis"}}),
+        ],
+    )
+    def test_get_typosquat_finds_token_variants(self, names: set[str]) -> None:
+        trusted_packages = TrustedDockerHubPackageManager(
+            names=names,
+            algorithm=EditDistance(),
+            selector=AllSimilar(),
+            threshold_class=SimilarityThreshold,
+            detect_token_variants=True,
+        )
+
+        assert trusted_packages.get_typosquat("bitnami/exporter-redis") == TyposquatFinding(
+            dependency="bitnami/exporter-redis", similars=["bitnami/redis-exporter"]
+        )
+
+
+class TestTrustedNpmPackageManager:
+    @pytest.mark.parametrize(
+        "names",
+        [
+            {"@types/node", "@types/react", "@testing-library/react", "react"},
+            NormalizedPackages(
+                packages={"react"}, namespaces={"@types": {"node", "react"}, "@testing-library": {"react"}}
+            ),
+        ],
+    )
+    def test_package_index(self, names: set[str]) -> None:
+        trusted_packages = TrustedNpmPackageManager(
+            names=names, algorithm=Mock(), selector=Mock(), threshold_class=Mock()
+        )
+
+        assert {name: set(scopes) for name, scopes in trusted_packages.namespaces_by_package.items()} == {
+            "node": {"@types"},
+            "react": {"@types", "@testing-library"},
+        }
+
+    @pytest.mark.parametrize(
+        ("package_name", "matches"),
+        [
+            ("@typess/node", ["@types/node"]),  # scope typo, the scope contains the package
+            ("@typess/lodash", []),  # scope typo, but the scope does not contain the package
+            ("@types/node", []),  # trusted package, distance is 0
+            ("@typess/unknown", []),  # no trusted scope contains the package
+        ],
+    )
+    def test_get_typosquat_from_scoped_package(self, package_name: str, matches: list[str]) -> None:
+        trusted_packages = TrustedNpmPackageManager(
+            names={"@types/node", "@babel/core", "react"},
+            algorithm=EditDistance(),
+            selector=AllSimilar(),
+            threshold_class=SimilarityThreshold,
+        )
+
+        assert trusted_packages.get_typosquat(package_name=package_name) == TyposquatFinding(
+            dependency=package_name, similars=matches
+        )
+
+    def test_get_typosquat_only_compares_scopes_containing_the_package(self) -> None:
+        algorithm = Mock(wraps=EditDistance())
+        trusted_packages = TrustedNpmPackageManager(
+            names={"@types/node", "@types/react", "@babel/core", "@angular/core"},
+            algorithm=algorithm,
+            selector=AllSimilar(),
+            threshold_class=SimilarityThreshold,
+        )
+
+        trusted_packages.get_typosquat("@typess/node")
+
+        algorithm.get_distances.assert_called_once_with("@typess", ["@types"], max_distance=2.0)
+
+    def test_get_typosquat_finds_unscoped_lookalikes(self) -> None:
+        trusted_packages = TrustedNpmPackageManager(
+            names={"lodash", "@types/node", "react"},
+            algorithm=ConfusableEditDistance(),
+            selector=FirstLetterExact(),
+            threshold_class=SimilarityThreshold,
+        )
+
+        assert trusted_packages.get_typosquat("1odash") == TyposquatFinding(dependency="1odash", similars=["lodash"])
+        assert trusted_packages.get_typosquat("@types/n0de") == TyposquatFinding(dependency="@types/n0de", similars=[])
+        assert trusted_packages.get_typosquat("@type5/node") == TyposquatFinding(
+            dependency="@type5/node", similars=["@types/node"]
+        )
+
+    @pytest.mark.parametrize(
+        "names",
+        [
+            {"react-dom", "@types/react-dom", "@types/node"},
+            NormalizedPackages(packages={"react-dom"}, namespaces={"@types": {"react-dom", "node"}}),
+        ],
+    )
+    def test_get_typosquat_finds_token_variants(self, names: set[str]) -> None:
+        algorithm = Mock(wraps=EditDistance())
+        trusted_packages = TrustedNpmPackageManager(
+            names=names,
+            algorithm=algorithm,
+            selector=AllSimilar(),
+            threshold_class=SimilarityThreshold,
+            detect_token_variants=True,
+        )
+
+        assert trusted_packages.get_typosquat("dom-react") == TyposquatFinding(
+            dependency="dom-react", similars=["react-dom"]
+        )
+        assert trusted_packages.get_typosquat("@types/reactdom") == TyposquatFinding(
+            dependency="@types/reactdom", similars=["@types/react-dom"]
+        )
+        # The scope is a variant as well, so it is not compared again.
+        assert trusted_packages.get_typosquat("@type-s/node") == TyposquatFinding(
+            dependency="@type-s/node", similars=["@types/node"]
+        )
+        algorithm.get_distances.assert_called_with("@type-s", [], max_distance=2.0)
+
+    def test_get_typosquat_finds_unscoped_combosquats(self) -> None:
+        trusted_packages = TrustedNpmPackageManager(
+            names={"lodash", "express", "@types/express"},
+            algorithm=EditDistance(),
+            selector=AllSimilar(),
+            threshold_class=SimilarityThreshold,
+            detect_combosquats=True,
+        )
+
+        assert trusted_packages.get_typosquat("express-lodash-utils") == TyposquatFinding(
+            dependency="express-lodash-utils", combosquats=["express", "lodash"]
+        )
+        assert not trusted_packages.get_typosquat("@acme/express")